@@ -0,0 +1,151 @@
+import numpy as np
+from sqlalchemy import select
+
+from models import db, Grade, Course
+from transcripts import GRADE_POINTS
+
+# Grades are integer-coded by their position on the scale; -1 marks letters
+# outside it, which are dropped before any statistic is computed.
+GRADE_SCALE = list(GRADE_POINTS)
+GRADE_CODE = {letter: code for code, letter in enumerate(GRADE_SCALE)}
+POINTS = np.array([GRADE_POINTS[letter] for letter in GRADE_SCALE], dtype=np.float64)
+PASS_POINTS = GRADE_POINTS['D']
+
+LOAD_BATCH_SIZE = 100000
+
+DIMENSIONS = ('course', 'program', 'semester')
+
+# Program label for grades whose course no longer exists (code -1)
+UNKNOWN_PROGRAM = 'unknown'
+
+
+class GradeColumns:
+    """Grade rows held column-wise as NumPy arrays"""
+
+    def __init__(self, grade_codes, course_ids, semester_ids, course_programs):
+        keep = grade_codes >= 0
+        self.grade_codes = grade_codes[keep]
+        self.course_ids = course_ids[keep]
+        self.semester_ids = semester_ids[keep]
+        self.points = POINTS[self.grade_codes]
+
+        # Program comes from the course; map ids -> dense program codes with one lookup array.
+        # Courses missing from course_programs keep code -1 and are labelled UNKNOWN_PROGRAM.
+        self.programs = sorted(set(course_programs.values()))
+        program_code = {program: code for code, program in enumerate(self.programs)}
+        size = max(max(course_programs, default=0), int(self.course_ids.max(initial=0))) + 1
+        lookup = np.full(size, -1, dtype=np.int32)
+        for course_id, program in course_programs.items():
+            lookup[course_id] = program_code[program]
+        self.program_codes = lookup[self.course_ids]
+
+    def __len__(self):
+        return len(self.grade_codes)
+
+    def keys(self, dimension):
+        return {
+            'course': self.course_ids,
+            'program': self.program_codes,
+            'semester': self.semester_ids,
+        }[dimension]
+
+    def label(self, dimension, key):
+        if dimension != 'program':
+            return int(key)
+        # A plain self.programs[-1] would silently name the last program
+        return self.programs[key] if key >= 0 else UNKNOWN_PROGRAM
+
+
+def load_grade_columns(semester_id=None, course_id=None, program=None, batch_size=LOAD_BATCH_SIZE):
+    """Stream grade rows from the database in batches straight into arrays"""
+    course_query = db.session.query(Course.id, Course.program)
+    if program:
+        course_query = course_query.filter(Course.program == program)
+    course_programs = dict(course_query.all())
+
+    stmt = select(Grade.grade, Grade.course_id, Grade.semester_id)
+    if semester_id:
+        stmt = stmt.where(Grade.semester_id == semester_id)
+    if course_id:
+        stmt = stmt.where(Grade.course_id == course_id)
+    if program:
+        stmt = stmt.where(Grade.course_id.in_(select(Course.id).where(Course.program == program)))
+
+    codes, courses, semesters = [], [], []
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        letters, course_ids, semester_ids = zip(*partition)
+        codes.append(np.fromiter((GRADE_CODE.get(letter, -1) for letter in letters), dtype=np.int8, count=len(letters)))
+        courses.append(np.asarray(course_ids, dtype=np.int32))
+        semesters.append(np.asarray(semester_ids, dtype=np.int32))
+
+    def join(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    return GradeColumns(join(codes, np.int8), join(courses, np.int32), join(semesters, np.int32), course_programs)
+
+
+def _group(keys):
+    """Dense group index per row without sorting: ids are small integers, so bincount them"""
+    offset = keys.min()
+    present = np.flatnonzero(np.bincount(keys - offset))
+    remap = np.zeros(present[-1] + 1, dtype=np.int64)
+    remap[present] = np.arange(len(present))
+    return present + offset, remap[keys - offset]
+
+
+def _grade_histogram(group_index, grade_codes, group_count):
+    return np.bincount(
+        group_index * len(GRADE_SCALE) + grade_codes, minlength=group_count * len(GRADE_SCALE)
+    ).reshape(group_count, len(GRADE_SCALE))
+
+
+def summarize(columns, group_by, percentiles=(25, 50, 75)):
+    """Count, mean points, pass rate, grade histogram and percentiles per group"""
+    if not len(columns):
+        return []
+
+    groups, group_index = _group(columns.keys(group_by))
+    histogram = _grade_histogram(group_index, columns.grade_codes, len(groups))
+    counts = histogram.sum(axis=1)
+    means = histogram @ POINTS / counts
+    passes = histogram[:, POINTS >= PASS_POINTS].sum(axis=1)
+
+    # Points only take len(GRADE_SCALE) values, so nearest-rank percentiles come
+    # straight from the cumulative histogram (lowest points first) - no sort.
+    ascending = np.argsort(POINTS, kind='stable')
+    cumulative = histogram[:, ascending].cumsum(axis=1)
+    ranks = {
+        q: POINTS[ascending][(cumulative <= np.floor(q / 100 * (counts - 1))[:, None]).sum(axis=1)]
+        for q in percentiles
+    }
+
+    return [{
+        group_by: columns.label(group_by, groups[i]),
+        'count': int(counts[i]),
+        'mean_points': round(float(means[i]), 3),
+        'pass_rate': round(float(passes[i] / counts[i]), 4),
+        'histogram': dict(zip(GRADE_SCALE, histogram[i].tolist())),
+        'percentiles': {f'p{q}': float(ranks[q][i]) for q in percentiles}
+    } for i in range(len(groups))]
+
+
+def crosstab(columns, rows, cols):
+    """Mean grade points and counts for every (rows, cols) pair, e.g. program x semester"""
+    if not len(columns):
+        return {'rows': [], 'columns': [], 'mean_points': [], 'counts': []}
+
+    row_keys, row_index = _group(columns.keys(rows))
+    col_keys, col_index = _group(columns.keys(cols))
+    histogram = _grade_histogram(row_index * len(col_keys) + col_index, columns.grade_codes, len(row_keys) * len(col_keys))
+    counts = histogram.sum(axis=1).reshape(len(row_keys), len(col_keys))
+    totals = (histogram @ POINTS).reshape(len(row_keys), len(col_keys))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, totals / counts, np.nan)
+
+    return {
+        'rows': [columns.label(rows, key) for key in row_keys],
+        'columns': [columns.label(cols, key) for key in col_keys],
+        'mean_points': [[None if np.isnan(v) else round(float(v), 3) for v in row] for row in means],
+        'counts': counts.tolist()
+    }
@@ -1,6 +1,13 @@
 import os
-from sqlalchemy.exc import SQLAlchemyError
-from flask import Flask, request, jsonify, Blueprint
+import base64
+import binascii
+import csv
+import io
+import click
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import insert, func, tuple_
+from sqlalchemy.orm import joinedload
+from flask import Flask, Response, request, jsonify, Blueprint
 from flask_migrate import Migrate
 from flask_restful import Api, Resource
 from flask_jwt_extended import (
@@ -14,6 +21,24 @@ from datetime import timedelta
 from functools import wraps
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from exports import stream_requested, stream_query
+from bulk import chunked, existing_values
+from prerequisites import PrerequisiteCycleError, get_prerequisite_graph
+from booking import BookingError, parse_booking_dates, book_room, cancel_booking
+from availability import get_availability_index
+from catalogue import get_catalogue, bump_catalogue_generation
+from cache import response_cache
+from query_stats import query_stats
+from transcripts import GRADE_POINTS, record_grade_changes, rebuild_gpa_summaries, get_transcript
+from analytics import DIMENSIONS, load_grade_columns, summarize, crosstab
+from clearance_stats import clearance_stats, get_clearance_snapshot
+from ledger import record_payment_changes, record_fee_structure_change, verify_fee_balances, get_balance
+from payment_import import PaymentImportError, import_payments
+from sideload import requested_includes, flat_fee_structures, side_load
+from serializers import init_json
+from passwords import PasswordHashingBusy, password_hasher
+from identity import get_identity
+from db_pool import pool_monitor
 from models import db, User, StudentProfile, LecturerProfile, Course, Semester, UnitRegistration,Grade, Announcement, AuditLog, DocumentRequest, Hostel, Room, StudentRoomBooking, FeeStructure, Payment, FeeClearance, Assignment, Registration
 from dotenv import load_dotenv
 load_dotenv()
@@ -36,16 +61,22 @@ app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=1)
 basedir = os.path.abspath(os.path.dirname(__file__))
 UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['QUERY_BUDGET'] = int(os.environ['QUERY_BUDGET']) if os.environ.get('QUERY_BUDGET') else None
 
 # Create the folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # Initialize Extensions
 
+pool_monitor.init_app(app)  # sets SQLALCHEMY_ENGINE_OPTIONS, so it must precede db.init_app
 db.init_app(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, render_as_batch=True)  # batch mode lets SQLite alter constraints
 jwt = JWTManager(app)
 api = Api(app)
+response_cache.init_app(app)
+query_stats.init_app(app)
+init_json(app)
+password_hasher.init_app(app)
 CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 
 
@@ -55,9 +86,8 @@ def role_required(role):
         @wraps(fn)
         @jwt_required()
         def decorator(*args, **kwargs):
-            # Comment out security checks
-            user_id = user_id()
-            user = User.query.get(user_id)
+            # Role comes from a short-lived identity cache, not a users query per request
+            user = get_identity(get_jwt_identity())
 
             if not user:
                 return jsonify({"error": "User not found"}), 404
@@ -121,8 +151,12 @@ class Register(Resource):
                 db.session.commit()
                 print(f"Lecturer profile created with ID: {lecturer_profile.id}")
 
+            response_cache.invalidate('users')
             return {"message": "User registered successfully"}, 201
 
+        except PasswordHashingBusy as e:
+            db.session.rollback()
+            return {"error": str(e)}, 503, {'Retry-After': str(e.retry_after)}
         except SQLAlchemyError as e:
             db.session.rollback()
             print(f"Database error: {str(e)}")
@@ -139,13 +173,19 @@ class Login(Resource):
         password = data.get('password')
 
         user = User.query.filter_by(email=email).first()
-        if not user or not user.check_password(password):
-            return {"error": "Invalid credentials"}, 401
+        try:
+            if not user or not password_hasher.verify_and_update(user, password):
+                return {"error": "Invalid credentials"}, 401
+        except PasswordHashingBusy as e:
+            return {"error": str(e)}, 503, {'Retry-After': str(e.retry_after)}
+        if db.session.is_modified(user):
+            db.session.commit()  # rehashed with the current work factor
 
-        access_token = create_access_token(identity=user.id)       
+        # String subject: PyJWT rejects non-string "sub" claims; role_required parses it back
+        access_token = create_access_token(identity=str(user.id))
 
         return {
-            "access_token": "dummy_access_token",  # Hardcoded token since security is commented out
+            "access_token": access_token,
             "user": {
                 "id": user.id if user else 1,  # Fallback ID if user not found
                 "name": user.name if user else "Unknown",
@@ -187,25 +227,57 @@ def home():
     return "Welcome to the Student Portal!"
 #------------------------------------------------------------------------------------------------------------------------------------------------------
 # User Management Routes
+USERS_PAGE_SIZE = 100
+USERS_MAX_PAGE_SIZE = 1000
+
+def serialize_user(user):
+    user_data = user.to_dict(rules=('-password_hash',))
+
+    # Include profile data based on role
+    if user.role == 'student' and user.student_profile:
+        user_data.update(user.student_profile.to_dict())
+    elif user.role == 'lecturer' and user.lecturer_profile:
+        user_data.update(user.lecturer_profile.to_dict())
+
+    return user_data
+
 @app.route('/api/users', methods=['GET'])
 # @role_required('admin')
 def get_all_users():
     try:
-        users = User.query.all()
-        users_data = []
-        
-        for user in users:
-            user_data = user.to_dict(rules=('-password_hash',))
-            
-            # Include profile data based on role
-            if user.role == 'student' and user.student_profile:
-                user_data.update(user.student_profile.to_dict())
-            elif user.role == 'lecturer' and user.lecturer_profile:
-                user_data.update(user.lecturer_profile.to_dict())
-                
-            users_data.append(user_data)
-            
-        return jsonify({'users': users_data}), 200
+        role = request.args.get('role', type=str)
+        program = request.args.get('program', type=str)
+        cursor = request.args.get('cursor', type=int)
+        limit = request.args.get('limit', type=int)
+
+        # Both profiles are one-to-one, so they ride along on the users SELECT
+        query = User.query.options(
+            joinedload(User.student_profile),
+            joinedload(User.lecturer_profile)
+        )
+        if role:
+            query = query.filter(User.role == role)
+        if program:
+            query = query.filter(User.student_profile.has(StudentProfile.program == program))
+
+        # Legacy mode: no paging params, return every user in one response
+        if cursor is None and limit is None:
+            users = query.order_by(User.id).all()
+            return jsonify({'users': [serialize_user(user) for user in users]}), 200
+
+        # Keyset mode: page on users.id so deep pages cost the same as the first
+        limit = min(max(limit or USERS_PAGE_SIZE, 1), USERS_MAX_PAGE_SIZE)
+        if cursor is not None:
+            query = query.filter(User.id > cursor)
+
+        users = query.order_by(User.id).limit(limit + 1).all()
+        has_more = len(users) > limit
+        users = users[:limit]
+
+        return jsonify({
+            'users': [serialize_user(user) for user in users],
+            'next_cursor': users[-1].id if has_more else None
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -255,8 +327,12 @@ def update_user(user_id):
             db.session.add(profile)
             
         db.session.commit()
+        response_cache.invalidate('users')
         return jsonify({'message': 'User updated successfully'}), 200
         
+    except PasswordHashingBusy as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -277,6 +353,7 @@ def delete_user(user_id):
             
         db.session.delete(user)
         db.session.commit()
+        response_cache.invalidate('users')
         return jsonify({'message': 'User deleted successfully'}), 200
         
     except Exception as e:
@@ -284,6 +361,7 @@ def delete_user(user_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/programs', methods=['GET'])
+@response_cache.cached(tags=('programs',), ttl=3600)
 def get_programs():
     programs = [
         'Computer Science',
@@ -302,8 +380,9 @@ def get_programs():
  
 
 @app.route('/api/lecturers', methods=['GET'])
+@response_cache.cached(tags=('users',))
 def get_all_lecturers():
-    lecturer_profiles = LecturerProfile.query.all()
+    lecturer_profiles = LecturerProfile.query.options(joinedload(LecturerProfile.user)).all()
 
     lecturers_data = [
         {
@@ -311,8 +390,6 @@ def get_all_lecturers():
             "name": l.user.name  # assuming .user exists and has .name
         } for l in lecturer_profiles
     ]
-    print(dir(lecturer_profiles[0]))
-
 
     return jsonify({"lecturers": lecturers_data}), 200
 
@@ -324,31 +401,29 @@ def get_courses():
         semester_id = request.args.get('semester_id', type=int)
         program = request.args.get('program', type=str)
 
-        print(f"Received parameters: semester_id={semester_id}, program={program}")
+        body, etag = get_catalogue(semester_id, program)
 
-        query = Course.query
-        if semester_id:
-            query = query.filter_by(semester_id=semester_id)
-        if program:
-            query = query.filter_by(program=program)
-
-        courses = query.all()
-        print(f"Fetched {len(courses)} courses from the database")
-
-        return jsonify([{
-            'id': c.id,
-            'code': c.code,
-            'title': c.title,
-            'description': c.description,
-            'semester_id': c.semester_id,
-            'program': c.program
-        } for c in courses])
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Let browsers keep the body but revalidate every time; unchanged catalogues get a 304
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
 
     except Exception as e:
-        print(f"Error occurred: {str(e)}")  # Prints more detailed error information
+        app.logger.error(f"Error fetching courses: {str(e)}")
         return jsonify({"error": str(e)}), 500  # Sends the error message in the response
 
 
+def resolve_prerequisites(prerequisite_ids):
+    """Courses for a `prerequisite_ids` payload, or None if it is not a list of existing course ids"""
+    if not isinstance(prerequisite_ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in prerequisite_ids):
+        return None
+    prerequisite_ids = set(prerequisite_ids)
+    prerequisites = Course.query.filter(Course.id.in_(prerequisite_ids)).all() if prerequisite_ids else []
+    return prerequisites if len(prerequisites) == len(prerequisite_ids) else None
+
+
 @app.route('/api/courses/<int:course_id>', methods=['PUT'])
 # @role_required('admin') 
 def update_course(course_id):
@@ -365,10 +440,22 @@ def update_course(course_id):
     course.description = data.get('description', course.description)
     course.semester_id = data.get('semester_id', course.semester_id)
     course.program = data.get('program', course.program)
+    course.capacity = data.get('capacity', course.capacity)
+    if 'prerequisite_ids' in data:
+        prerequisites = resolve_prerequisites(data['prerequisite_ids'])
+        if prerequisites is None:
+            return jsonify({'error': 'prerequisite_ids must list existing course ids'}), 400
+        course.prerequisites = prerequisites
 
     try:
         db.session.commit()
+        bump_catalogue_generation()
+        response_cache.invalidate('courses')
         return jsonify(course.to_dict()), 200
+    except PrerequisiteCycleError as e:
+        # Raised from the flush when the new edges would close a prerequisite loop
+        db.session.rollback()
+        return jsonify({'error': str(e), 'course_ids': e.course_ids}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to update course', 'details': str(e)}), 500
@@ -384,6 +471,8 @@ def delete_course(course_id):
     try:
         db.session.delete(course)
         db.session.commit()
+        bump_catalogue_generation()
+        response_cache.invalidate('courses')
         return jsonify({'message': f'Course {course_id} deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -410,13 +499,24 @@ def create_course():
         title=title,
         description=description,
         semester_id=semester_id,
-        program=program
+        program=program,
+        capacity=data.get('capacity')
     )
+    if 'prerequisite_ids' in data:
+        prerequisites = resolve_prerequisites(data['prerequisite_ids'])
+        if prerequisites is None:
+            return jsonify({'error': 'prerequisite_ids must list existing course ids'}), 400
+        course.prerequisites = prerequisites
 
     try:
         db.session.add(course)
         db.session.commit()
+        bump_catalogue_generation()
+        response_cache.invalidate('courses')
         return jsonify(course.to_dict()), 201
+    except PrerequisiteCycleError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e), 'course_ids': e.course_ids}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to create course', 'details': str(e)}), 500
@@ -491,6 +591,7 @@ def get_assignments():
 
 # Create a new assignment
 @app.route('/api/semesters', methods=['GET'])
+@response_cache.cached(tags=('semesters',))
 def get_active_semester():
     active_semester = Semester.query.filter_by(active=True).first()
     if not active_semester:
@@ -537,6 +638,7 @@ def create_semester():
 
     db.session.add(new_semester)
     db.session.commit()
+    response_cache.invalidate('semesters')
 
     return jsonify({"message": "Semester created successfully", "semester": new_semester.to_dict()}), 201
 
@@ -564,6 +666,7 @@ def update_semester(id):
     semester.active = data.get('active', semester.active)
 
     db.session.commit()
+    response_cache.invalidate('semesters')
 
     return jsonify({"message": "Semester updated successfully", "semester": semester.to_dict()}), 200
 
@@ -585,6 +688,7 @@ def delete_semester(id):
     # Deleting the semester
     db.session.delete(semester)
     db.session.commit()
+    response_cache.invalidate('semesters')
 
     return jsonify({"message": "Semester deleted successfully"}), 200
 
@@ -625,12 +729,18 @@ def registration():
             semester_id=semester_id
         )
         db.session.add(new_registration)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request registered the same course first (unique index)
+            db.session.rollback()
+            return jsonify({'error': 'Already registered for this course in the semester'}), 409
 
         return jsonify({'message': 'Registration successful', 'registration_id': new_registration.id}), 201
 
     elif request.method == 'GET':
-        registrations = UnitRegistration.query.filter_by(student_id=student_profile.id).all()
+        registrations = UnitRegistration.query.options(joinedload(UnitRegistration.course)) \
+            .filter_by(student_id=student_profile.id).all()
         results = []
         for reg in registrations:
             results.append({
@@ -662,11 +772,116 @@ def registration():
         db.session.commit()
         return jsonify({'message': 'Registration deleted successfully'}), 200
 
+REGISTRATION_BULK_MAX_COURSES = 20
+
+@app.route('/api/registration/bulk', methods=['POST'])
+def bulk_registration():
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No input data provided'}), 400
+
+    course_codes = data.get('course_codes')
+    semester_id = data.get('semester_id')
+    if not course_codes or not isinstance(course_codes, list) or not semester_id:
+        return jsonify({'error': 'course_codes (list) and semester_id are required'}), 400
+    if not all(isinstance(code, str) for code in course_codes):
+        return jsonify({'error': 'course_codes must be a list of strings'}), 400
+    if len(course_codes) > REGISTRATION_BULK_MAX_COURSES:
+        return jsonify({'error': f'At most {REGISTRATION_BULK_MAX_COURSES} courses per request'}), 400
+    try:
+        semester_id = int(semester_id)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'semester_id must be an integer'}), 400
+
+    if data.get('student_id'):
+        student_profile = StudentProfile.query.get(data['student_id'])
+    else:
+        student_profile = StudentProfile.query.first()
+    if not student_profile:
+        return jsonify({'error': 'Student profile not found'}), 404
+
+    course_codes = list(dict.fromkeys(course_codes))
+
+    try:
+        # Resolve every code in one query; prefer the offering in the requested semester.
+        # FOR UPDATE serialises concurrent registrations per course so the capacity count holds.
+        courses = {}
+        for course in Course.query.filter(Course.code.in_(course_codes)).order_by(Course.id).with_for_update():
+            current = courses.get(course.code)
+            if current is None or (current.semester_id != semester_id and course.semester_id == semester_id):
+                courses[course.code] = course
+
+        course_ids = [course.id for course in courses.values()]
+
+        registered_ids = {
+            course_id for (course_id,) in db.session.query(UnitRegistration.course_id).filter_by(student_id=student_profile.id)
+        }
+        registered_this_semester = {
+            course_id for (course_id,) in db.session.query(UnitRegistration.course_id).filter(
+                UnitRegistration.student_id == student_profile.id,
+                UnitRegistration.semester_id == semester_id,
+                UnitRegistration.course_id.in_(course_ids)
+            )
+        }
+        enrolled = dict(
+            db.session.query(UnitRegistration.course_id, func.count(UnitRegistration.id)).filter(
+                UnitRegistration.course_id.in_(course_ids),
+                UnitRegistration.semester_id == semester_id
+            ).group_by(UnitRegistration.course_id)
+        )
+
+        graph = get_prerequisite_graph()
+        errors = []
+        for code in course_codes:
+            course = courses.get(code)
+            if not course:
+                errors.append({'course_code': code, 'error': 'Course not found'})
+            elif course.id in registered_this_semester:
+                errors.append({'course_code': code, 'error': 'Already registered for this course in the semester'})
+            elif not graph.prerequisites_met(course.id, registered_ids):
+                missing = sorted(graph.missing_prerequisites(course.id, registered_ids))
+                errors.append({'course_code': code, 'error': 'Prerequisites not met', 'missing_course_ids': missing})
+            elif course.capacity is not None and enrolled.get(course.id, 0) >= course.capacity:
+                errors.append({'course_code': code, 'error': 'Course is full'})
+
+        # All-or-nothing: a student's unit selection is registered as a set
+        if errors:
+            db.session.rollback()
+            return jsonify({'error': 'Registration failed', 'errors': errors}), 400
+
+        new_registrations = [
+            UnitRegistration(student_id=student_profile.id, course_id=courses[code].id, semester_id=semester_id)
+            for code in course_codes
+        ]
+        db.session.add_all(new_registrations)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Registration successful',
+            'registrations': [{
+                'registration_id': reg.id,
+                'course_id': reg.course_id,
+                'course_code': code
+            } for code, reg in zip(course_codes, new_registrations)]
+        }), 201
+
+    except IntegrityError:
+        # A concurrent request registered one of these courses first (unique index)
+        db.session.rollback()
+        return jsonify({'error': 'Already registered for one of these courses in the semester'}), 409
+    except PrerequisiteCycleError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e), 'course_ids': e.course_ids}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 
 # -------------------- Announcements Resource --------------------
 
 @app.route('/api/announcements', methods=['GET', 'POST'])
 # @jwt_required(optional=True)
+@response_cache.cached(tags=('announcements', 'users'))
 def announcements():
     if request.method == 'GET':
         announcements = Announcement.query.all()
@@ -708,6 +923,7 @@ def announcements():
         )
         db.session.add(announcement)
         db.session.commit()
+        response_cache.invalidate('announcements')
         return jsonify({'message': 'Announcement posted successfully'}), 201
 
 @app.route('/api/announcements/<int:id>', methods=['DELETE'])
@@ -723,22 +939,33 @@ def delete_announcement(id):
     announcement = Announcement.query.get_or_404(id)
     db.session.delete(announcement)
     db.session.commit()
+    response_cache.invalidate('announcements')
     return jsonify({'message': 'Announcement deleted'}), 200
 
 # -------------------- Audit Logs Resource --------------------
+AUDIT_LOG_EXPORT_FIELDS = ('action', 'timestamp', 'user_id', 'details')
+
 @app.route('/api/audit_logs', methods=['GET'])
 # @role_required('admin')
 def audit_logs():
-    audit_logs = AuditLog.query.all()
-    return jsonify([{
-        'action': log.action,
-        'timestamp': log.timestamp.isoformat(),
-        'user_id': log.user_id,
-        'details': log.details
-    } for log in audit_logs])
+    def serialize(log):
+        return {
+            'action': log.action,
+            'timestamp': log.timestamp.isoformat(),
+            'user_id': log.user_id,
+            'details': log.details
+        }
+
+    query = AuditLog.query.order_by(AuditLog.id)
+    if stream_requested():
+        return stream_query(query, serialize, 'audit_logs', AUDIT_LOG_EXPORT_FIELDS)
+
+    return jsonify([serialize(log) for log in query.all()])
 
 # -------------------- Document Requests Resource --------------------
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'png', 'jpg', 'jpeg'}
+DOCUMENT_REQUEST_EXPORT_FIELDS = ('id', 'student_id', 'document_type', 'status', 'requested_on', 'processed_on',
+                                  'file_name', 'file_path')
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -762,7 +989,11 @@ def handle_document_requests():
         # if not user or user.role != 'admin':
         #     return jsonify({'error': 'Access denied'}), 403
 
-        requests = DocumentRequest.query.all()
+        query = DocumentRequest.query.order_by(DocumentRequest.id)
+        if stream_requested():
+            return stream_query(query, DocumentRequest.to_dict, 'document_requests', DOCUMENT_REQUEST_EXPORT_FIELDS)
+
+        requests = query.all()
         return jsonify([req.to_dict() for req in requests]), 200
     elif request.method == 'POST':
         data = request.get_json()
@@ -949,25 +1180,8 @@ def handle_bookings():
             if not all(field in data for field in required_fields):
                 return jsonify({'error': 'Missing required fields'}), 400
 
-            room = Room.query.get(data['room_id'])
-            if not room:
-                return jsonify({'error': 'Room not found'}), 404
-
-            if room.status != 'available' or room.current_occupants >= room.capacity:
-                return jsonify({'error': 'Room is not available'}), 400
-
-            booking = StudentRoomBooking(
-                student_id=data['student_id'],
-                room_id=data['room_id'],
-                start_date=datetime.strptime(data['start_date'], '%Y-%m-%d'),
-                end_date=datetime.strptime(data['end_date'], '%Y-%m-%d')
-            )
-
-            room.current_occupants += 1
-            if room.current_occupants >= room.capacity:
-                room.status = 'occupied'
-
-            db.session.add(booking)
+            start_date, end_date = parse_booking_dates(data)
+            booking = book_room(data['student_id'], data['room_id'], start_date, end_date)
             db.session.commit()
 
             return jsonify({
@@ -975,8 +1189,9 @@ def handle_bookings():
                 'booking_id': booking.id
             }), 201
 
-        except ValueError:
-            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        except BookingError as e:
+            db.session.rollback()
+            return jsonify({'error': e.message}), e.status_code
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
@@ -985,6 +1200,7 @@ def handle_bookings():
 # === SINGLE HOSTEL DETAIL ===
 # Hostel Management Routes
 @app.route('/api/hostels', methods=['GET', 'POST'])
+@response_cache.cached(tags=('hostels',))
 def handle_hostels():
     if request.method == 'GET':
         try:
@@ -1020,6 +1236,7 @@ def handle_hostels():
 
             db.session.add(hostel)
             db.session.commit()
+            response_cache.invalidate('hostels')
 
             return jsonify({
                 'message': 'Hostel created successfully',
@@ -1078,6 +1295,7 @@ def handle_rooms():
 
             db.session.add(room)
             db.session.commit()
+            response_cache.invalidate('hostels')
 
             return jsonify({
                 'message': 'Room created successfully',
@@ -1093,6 +1311,38 @@ def handle_rooms():
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+AVAILABILITY_SEARCH_MAX_RESULTS = 200
+
+@app.route('/api/rooms/availability', methods=['GET'])
+def search_room_availability():
+    try:
+        hostel_id = request.args.get('hostel_id', type=int)
+        max_price = request.args.get('max_price', type=float)
+        min_free_beds = request.args.get('min_free_beds', default=1, type=int)
+        limit = min(request.args.get('limit', default=50, type=int), AVAILABILITY_SEARCH_MAX_RESULTS)
+
+        start_date = end_date = None
+        if request.args.get('start_date') or request.args.get('end_date'):
+            start_date, end_date = parse_booking_dates(request.args)
+
+        # Answered from the in-memory index; no rooms/bookings scan per request
+        rooms = get_availability_index().search(
+            hostel_id=hostel_id,
+            start_date=start_date,
+            end_date=end_date,
+            max_price=max_price,
+            min_free_beds=max(min_free_beds, 1),
+            limit=max(limit, 1)
+        )
+        return jsonify({'rooms': rooms}), 200
+    except BookingError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+BOOKING_EXPORT_FIELDS = ('id', 'student_id', 'student_name', 'room_id', 'room_number', 'hostel_name', 'start_date',
+                         'end_date', 'status', 'created_at')
+
 @app.route('/api/bookings', methods=['GET', 'POST', 'OPTIONS'])
 @cross_origin()
 def handle_bookings():
@@ -1100,21 +1350,30 @@ def handle_bookings():
         return jsonify({}), 200
 
     if request.method == 'GET':
+        def serialize(booking):
+            return {
+                'id': booking.id,
+                'student_id': booking.student_id,
+                'student_name': booking.student.name if booking.student else None,
+                'room_id': booking.room_id,
+                'room_number': booking.room.room_number if booking.room else None,
+                'hostel_name': booking.room.hostel.name if booking.room and booking.room.hostel else None,
+                'start_date': booking.start_date.isoformat() if booking.start_date else None,
+                'end_date': booking.end_date.isoformat() if booking.end_date else None,
+                'status': booking.status,
+                'created_at': booking.booked_on.isoformat() if booking.booked_on else None
+            }
+
         try:
-            bookings = StudentRoomBooking.query.all()
+            query = StudentRoomBooking.query.options(
+                joinedload(StudentRoomBooking.student),
+                joinedload(StudentRoomBooking.room).joinedload(Room.hostel)
+            ).order_by(StudentRoomBooking.id)
+            if stream_requested():
+                return stream_query(query, serialize, 'bookings', BOOKING_EXPORT_FIELDS)
+
             return jsonify({
-                'bookings': [{
-                    'id': booking.id,
-                    'student_id': booking.student_id,
-                    'student_name': booking.student.name if booking.student else None,
-                    'room_id': booking.room_id,
-                    'room_number': booking.room.room_number if booking.room else None,
-                    'hostel_name': booking.room.hostel.name if booking.room and booking.room.hostel else None,
-                    'start_date': booking.start_date.isoformat() if booking.start_date else None,
-                    'end_date': booking.end_date.isoformat() if booking.end_date else None,
-                    'status': booking.status,
-                    'created_at': booking.created_at.isoformat() if booking.created_at else None
-                } for booking in bookings]
+                'bookings': [serialize(booking) for booking in query.all()]
             }), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -1129,29 +1388,9 @@ def handle_bookings():
             if not all(field in data for field in required_fields):
                 return jsonify({'error': 'Missing required fields'}), 400
 
-            # Check if room exists
-            room = Room.query.get(data['room_id'])
-            if not room:
-                return jsonify({'error': 'Room not found'}), 404
-
-            # Check if room is available
-            if room.status != 'available' or (room.current_occupants and room.current_occupants >= room.capacity):
-                return jsonify({'error': 'Room is not available'}), 400
-
-            # Create booking
-            booking = StudentRoomBooking(
-                student_id=data['student_id'],
-                room_id=data['room_id'],
-                start_date=datetime.utcnow(),
-                status='confirmed'
-            )
-
-            # Update room occupancy
-            room.current_occupants = (room.current_occupants or 0) + 1
-            if room.current_occupants >= room.capacity:
-                room.status = 'occupied'
-
-            db.session.add(booking)
+            # The engine checks capacity for these dates under a lock on the room row
+            start_date, end_date = parse_booking_dates(data, default_start=datetime.utcnow())
+            booking = book_room(data['student_id'], data['room_id'], start_date, end_date)
             db.session.commit()
 
             return jsonify({
@@ -1163,10 +1402,26 @@ def handle_bookings():
                     'status': booking.status
                 }
             }), 201
+        except BookingError as e:
+            db.session.rollback()
+            return jsonify({'error': e.message}), e.status_code
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+@app.route('/api/bookings/<int:booking_id>', methods=['DELETE'])
+def delete_booking(booking_id):
+    try:
+        booking = cancel_booking(booking_id)
+        db.session.commit()
+        return jsonify({'message': 'Booking cancelled successfully', 'booking_id': booking.id}), 200
+    except BookingError as e:
+        db.session.rollback()
+        return jsonify({'error': e.message}), e.status_code
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/hostels/<int:hostel_id>', methods=['GET', 'PUT', 'DELETE'])
 def single_hostel(hostel_id):
     hostel = Hostel.query.get_or_404(hostel_id)
@@ -1201,6 +1456,7 @@ def single_hostel(hostel_id):
                 hostel.status = data['status']
 
             db.session.commit()
+            response_cache.invalidate('hostels')
             return jsonify({'message': 'Hostel updated successfully'}), 200
         except Exception as e:
             db.session.rollback()
@@ -1214,6 +1470,7 @@ def single_hostel(hostel_id):
 
             db.session.delete(hostel)
             db.session.commit()
+            response_cache.invalidate('hostels')
             return jsonify({'message': 'Hostel deleted successfully'}), 200
         except Exception as e:
             db.session.rollback()
@@ -1236,6 +1493,7 @@ def create_hostel():
         new_hostel = Hostel(name=name, location=location, status=status)
         db.session.add(new_hostel)
         db.session.commit()
+        response_cache.invalidate('hostels')
 
         return jsonify({
             'message': 'Hostel created successfully',
@@ -1282,6 +1540,7 @@ def single_room(room_id):
                 room.status = data['status']
 
             db.session.commit()
+            response_cache.invalidate('hostels')
             return jsonify({'message': 'Room updated successfully'}), 200
         except Exception as e:
             db.session.rollback()
@@ -1295,6 +1554,7 @@ def single_room(room_id):
 
             db.session.delete(room)
             db.session.commit()
+            response_cache.invalidate('hostels')
             return jsonify({'message': 'Room deleted successfully'}), 200
         except Exception as e:
             db.session.rollback()
@@ -1328,6 +1588,7 @@ def create_room():
         )
         db.session.add(new_room)
         db.session.commit()
+        response_cache.invalidate('hostels')
 
         return jsonify({
             'message': 'Room created successfully',
@@ -1346,47 +1607,251 @@ def create_room():
 
 #--------------------------------------------------------------------------hostles story above
 #POST /api/payments - create a new payment
+PAYMENT_EXPORT_FIELDS = ('id', 'student_id', 'amount', 'date', 'method')
+
 @app.route('/api/payments', methods=['GET'])
 def fetch_payments():
-    Payments = Payment.query.all()
-
-    if not Payments:
-        return jsonify({'error': 'No payments found'}), 404
-
-    result = []
-    for p in Payments:
-        result.append({
+    def serialize(p):
+        return {
             'id': p.id,
             'student_id': p.student_id,
             'amount': float(p.amount_paid),
             'date': p.payment_date.strftime('%Y-%m-%d'),
             'method': p.payment_method
-        })
+        }
+
+    query = Payment.query.order_by(Payment.id)
+    if stream_requested():
+        return stream_query(query, serialize, 'payments', PAYMENT_EXPORT_FIELDS)
+
+    try:
+        includes = requested_includes(('fee_structure', 'course', 'hostel', 'semester'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if includes is not None:
+        # Flat rows straight from a column projection, related records side-loaded once each
+        payments = [dict(serialize(p), fee_structure_id=p.fee_structure_id) for p in db.session.query(
+            Payment.id, Payment.student_id, Payment.fee_structure_id,
+            Payment.amount_paid, Payment.payment_date, Payment.payment_method
+        ).order_by(Payment.id)]
+        if not payments:
+            return jsonify({'error': 'No payments found'}), 404
+        return jsonify({'payments': payments, 'included': side_load(payments, includes)}), 200
+
+    Payments = query.all()
+
+    if not Payments:
+        return jsonify({'error': 'No payments found'}), 404
+
+    return jsonify({'payments': [serialize(p) for p in Payments]}), 200
+
+@app.route('/api/payments', methods=['POST'])
+def create_payment():
+    data = request.get_json() or {}
+    required_fields = ['student_id', 'fee_structure_id', 'amount_paid', 'payment_method']
+    missing = [field for field in required_fields if data.get(field) in (None, '')]
+    if missing:
+        return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
+
+    try:
+        amount_paid = float(data['amount_paid'])
+        payment_date = datetime.fromisoformat(data['payment_date']) if data.get('payment_date') else datetime.utcnow()
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid amount_paid or payment_date'}), 400
+    if amount_paid <= 0:
+        return jsonify({'error': 'amount_paid must be positive'}), 400
+
+    if not db.session.get(StudentProfile, data['student_id']):
+        return jsonify({'error': 'Student not found'}), 404
+    if not db.session.get(FeeStructure, data['fee_structure_id']):
+        return jsonify({'error': 'Fee structure not found'}), 404
+
+    try:
+        # Ledger first: billing depends on the payments that existed before this one
+        record_payment_changes([(data['student_id'], data['fee_structure_id'], amount_paid, 1)])
+        payment = Payment(
+            student_id=data['student_id'],
+            fee_structure_id=data['fee_structure_id'],
+            amount_paid=amount_paid,
+            payment_date=payment_date,
+            payment_method=data['payment_method']
+        )
+        db.session.add(payment)
+        db.session.commit()
+        return jsonify({
+            'message': 'Payment recorded successfully',
+            'payment': {
+                'id': payment.id,
+                'student_id': payment.student_id,
+                'fee_structure_id': payment.fee_structure_id,
+                'amount': payment.amount_paid,
+                'date': payment.payment_date.strftime('%Y-%m-%d'),
+                'method': payment.payment_method
+            }
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
-    return jsonify({'payments': result}), 200
+@app.route('/api/payments/<int:payment_id>', methods=['DELETE'])
+def delete_payment(payment_id):
+    payment = db.session.get(Payment, payment_id)
+    if not payment:
+        return jsonify({'error': 'Payment not found'}), 404
+
+    try:
+        record_payment_changes([(payment.student_id, payment.fee_structure_id, payment.amount_paid, -1)])
+        db.session.delete(payment)
+        db.session.commit()
+        return jsonify({'message': 'Payment deleted successfully'}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/payments/import', methods=['POST'])
+def import_payment_statement():
+    """CSV bank / mobile-money statement upload (multipart field 'file')"""
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'error': 'No statement file uploaded'}), 400
+
+    try:
+        report = import_payments(
+            upload.stream,
+            fee_structure_id=request.form.get('fee_structure_id', type=int),
+            payment_method=request.form.get('payment_method', 'bank')
+        )
+        # Earlier chunks stay committed if a later one fails; re-uploading skips them by reference
+        return jsonify(report), 200
+    except PaymentImportError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('import-payments')
+@click.argument('statement', type=click.File('rb'))
+@click.option('--fee-structure-id', type=int, help='Fee structure for rows without a fee_structure_id column.')
+@click.option('--payment-method', default='bank', show_default=True)
+def import_payments_command(statement, fee_structure_id, payment_method):
+    """Import a CSV payment statement in batched transactions."""
+    try:
+        report = import_payments(statement, fee_structure_id=fee_structure_id, payment_method=payment_method)
+    except PaymentImportError as e:
+        raise click.ClickException(str(e))
+    print(f"{report['rows']} rows in {report['seconds']}s ({report['rows_per_second']} rows/s): "
+          f"{report['inserted']} inserted, {report['duplicates']} duplicates, "
+          f"{report['unmatched']} unmatched, {report['invalid']} invalid.")
+    for issue in report['issues']:
+        print(f"  line {issue['line']}: {issue['type']} - {issue['reason']} "
+              f"(reference={issue['reference']}, reg_no={issue['reg_no']})")
+
+@app.route('/api/payments/balance/<int:student_id>', methods=['GET'])
+def get_fee_balance(student_id):
+    try:
+        return jsonify(get_balance(student_id)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('verify-fee-balances')
+@click.option('--repair', is_flag=True, help='Rewrite balances that drifted from the payment history.')
+def verify_fee_balances_command(repair):
+    """Recompute fee_balances from payments and report (or repair) any drift."""
+    report = verify_fee_balances(repair=repair)
+    db.session.commit()
+    print(f"Checked {report['checked']} balances: {report['drifted']} drifted, {report['repaired']} repaired.")
+    for row in report['sample']:
+        print(f"  student {row['student_id']} semester {row['semester_id']}: "
+              f"expected {row['expected']}, stored {row['stored']}")
+    if report['drifted'] and not repair:
+        raise click.ClickException('fee_balances drifted; rerun with --repair')
 
 grades_bp = Blueprint('grades', __name__, url_prefix='/api/grades')
 
 # Helper function to validate grades
 def is_valid_grade(grade):
-    valid_grades = ['A', 'B+', 'B', 'C+', 'C', 'D+', 'D', 'E']
-    return grade.upper() in valid_grades
+    # The grade scale and its GPA points live together in transcripts.py
+    return grade.upper() in GRADE_POINTS
+
+GRADES_PAGE_SIZE = 100
+GRADES_MAX_PAGE_SIZE = 1000
+
+def encode_grade_cursor(row):
+    return base64.urlsafe_b64encode(f"{row.date_posted.isoformat()}|{row.id}".encode()).decode()
+
+def decode_grade_cursor(cursor):
+    date_posted, grade_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return datetime.fromisoformat(date_posted), int(grade_id)
+
+GRADE_EXPORT_FIELDS = ('id', 'student_id', 'course_id', 'semester_id', 'grade', 'date_posted', 'student_name',
+                       'course_name', 'semester_name')
 
 @grades_bp.route('/', methods=['GET'])
 def get_grades():
+    def serialize(row):
+        return {
+            'id': row.id,
+            'student_id': row.student_id,
+            'course_id': row.course_id,
+            'semester_id': row.semester_id,
+            'grade': row.grade,
+            'date_posted': row.date_posted.isoformat(),
+            'student_name': row.student_name,
+            'course_name': row.course_name,
+            'semester_name': row.semester_name
+        }
+
     try:
-        grades = Grade.query.all()
-        return jsonify([{
-            'id': grade.id,
-            'student_id': grade.student_id,
-            'course_id': grade.course_id,
-            'semester_id': grade.semester_id,
-            'grade': grade.grade,
-            'date_posted': grade.date_posted.isoformat(),
-            'student_name': grade.student.name,
-            'course_name': grade.course.title,
-            'semester_name': grade.semester.name
-        } for grade in grades]), 200
+        student_id = request.args.get('student_id', type=int)
+        # courseId is what the React client sends
+        course_id = request.args.get('course_id', type=int) or request.args.get('courseId', type=int)
+        semester_id = request.args.get('semester_id', type=int)
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+
+        # Plain columns from one joined SELECT; no Grade/User/Course/Semester entities
+        query = db.session.query(
+            Grade.id, Grade.student_id, Grade.course_id, Grade.semester_id, Grade.grade, Grade.date_posted,
+            User.name.label('student_name'),
+            Course.title.label('course_name'),
+            Semester.name.label('semester_name')
+        ).join(User, Grade.student_id == User.id) \
+         .join(Course, Grade.course_id == Course.id) \
+         .join(Semester, Grade.semester_id == Semester.id)
+
+        if student_id:
+            query = query.filter(Grade.student_id == student_id)
+        if course_id:
+            query = query.filter(Grade.course_id == course_id)
+        if semester_id:
+            query = query.filter(Grade.semester_id == semester_id)
+
+        if stream_requested():
+            return stream_query(query.order_by(Grade.id), serialize, 'grades', GRADE_EXPORT_FIELDS)
+
+        # Legacy mode: no paging params, return every matching grade as a bare list
+        if cursor is None and limit is None:
+            return jsonify([serialize(row) for row in query.order_by(Grade.id)]), 200
+
+        # Keyset mode on (date_posted, id), served by ix_grade_date_posted_id
+        limit = min(max(limit or GRADES_PAGE_SIZE, 1), GRADES_MAX_PAGE_SIZE)
+        if cursor:
+            try:
+                after = decode_grade_cursor(cursor)
+            except (ValueError, UnicodeDecodeError, binascii.Error):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(tuple_(Grade.date_posted, Grade.id) > after)
+
+        rows = query.order_by(Grade.date_posted, Grade.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return jsonify({
+            'grades': [serialize(row) for row in rows],
+            'next_cursor': encode_grade_cursor(rows[-1]) if has_more else None
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1442,6 +1907,7 @@ def create_grade():
         )
         
         db.session.add(new_grade)
+        record_grade_changes([(new_grade.student_id, new_grade.semester_id, new_grade.grade, 1)])
         db.session.commit()
         
         return jsonify({
@@ -1456,10 +1922,180 @@ def create_grade():
             }
         }), 201
     
+    except IntegrityError:
+        # A concurrent request graded the same course first (unique key)
+        db.session.rollback()
+        return jsonify({
+            'error': 'Grade already exists for this student, course, and semester'
+        }), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+GRADE_BATCH_MAX_ROWS = 20000
+
+def read_grade_batch():
+    """Rows from a JSON body ({"grades": [...]} or a bare list) or a CSV upload"""
+    upload = request.files.get('file')
+    if upload:
+        return list(csv.DictReader(io.StringIO(upload.read().decode('utf-8-sig'))))
+    if request.mimetype == 'text/csv':
+        return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('grades')
+    return data if isinstance(data, list) else None
+
+@grades_bp.route('/batch', methods=['POST'])
+def create_grades_batch():
+    rows = read_grade_batch()
+    if not rows:
+        return jsonify({'error': 'No grade rows provided'}), 400
+    if len(rows) > GRADE_BATCH_MAX_ROWS:
+        return jsonify({'error': f'A batch may contain at most {GRADE_BATCH_MAX_ROWS} rows'}), 400
+
+    errors = []
+    candidates = []
+
+    # Pass 1: shape checks, no database access
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict) or not all(row.get(field) not in (None, '') for field in ('student_id', 'course_id', 'semester_id', 'grade')):
+            errors.append({'row': index, 'error': 'Missing required fields'})
+            continue
+        try:
+            key = (int(row['student_id']), int(row['course_id']), int(row['semester_id']))
+        except (TypeError, ValueError):
+            errors.append({'row': index, 'error': 'student_id, course_id and semester_id must be integers'})
+            continue
+        grade = str(row['grade']).strip().upper()
+        if not is_valid_grade(grade):
+            errors.append({'row': index, 'error': 'Invalid grade. Valid grades are: A, B+, B, C+, C, D+, D, E'})
+            continue
+        candidates.append((index, key, grade))
+
+    try:
+        # Pass 2: one IN query per referenced table instead of one lookup per row
+        student_ids = existing_values(User.id, (key[0] for _, key, _ in candidates))
+        course_ids = existing_values(Course.id, (key[1] for _, key, _ in candidates))
+        semester_ids = existing_values(Semester.id, (key[2] for _, key, _ in candidates))
+
+        taken = set()
+        if course_ids and semester_ids:
+            for chunk in chunked(student_ids):
+                taken.update(
+                    db.session.query(Grade.student_id, Grade.course_id, Grade.semester_id).filter(
+                        Grade.student_id.in_(chunk),
+                        Grade.course_id.in_(course_ids),
+                        Grade.semester_id.in_(semester_ids)
+                    )
+                )
+
+        new_rows = []
+        for index, key, grade in candidates:
+            student_id, course_id, semester_id = key
+            if student_id not in student_ids:
+                errors.append({'row': index, 'error': 'Student not found'})
+            elif course_id not in course_ids:
+                errors.append({'row': index, 'error': 'Course not found'})
+            elif semester_id not in semester_ids:
+                errors.append({'row': index, 'error': 'Semester not found'})
+            elif key in taken:
+                errors.append({'row': index, 'error': 'Grade already exists for this student, course, and semester'})
+            else:
+                taken.add(key)  # also rejects repeats within the same batch
+                new_rows.append({
+                    'student_id': student_id,
+                    'course_id': course_id,
+                    'semester_id': semester_id,
+                    'grade': grade,
+                    'date_posted': datetime.utcnow()
+                })
+
+        errors.sort(key=lambda e: e['row'])
+        if not new_rows:
+            return jsonify({'message': 'No grades submitted', 'inserted': 0, 'errors': errors}), 400
+
+        # Pass 3: a single executemany inside one transaction
+        db.session.execute(insert(Grade), new_rows)
+        record_grade_changes((row['student_id'], row['semester_id'], row['grade'], 1) for row in new_rows)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Grades submitted successfully',
+            'inserted': len(new_rows),
+            'errors': errors
+        }), 201
+
+    except IntegrityError:
+        # A concurrent submission graded one of these first (unique key); nothing was written
+        db.session.rollback()
+        return jsonify({'error': 'Grade already exists for one of these students, courses, and semesters'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@grades_bp.route('/<int:grade_id>', methods=['DELETE'])
+def delete_grade(grade_id):
+    grade = Grade.query.get(grade_id)
+    if not grade:
+        return jsonify({'error': 'Grade not found'}), 404
+
+    try:
+        record_grade_changes([(grade.student_id, grade.semester_id, grade.grade, -1)])
+        db.session.delete(grade)
+        db.session.commit()
+        return jsonify({'message': 'Grade deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@grades_bp.route('/transcript/<int:student_id>', methods=['GET'])
+def get_student_transcript(student_id):
+    try:
+        return jsonify(get_transcript(student_id)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/analytics/grades', methods=['GET'])
+@role_required('admin')
+def grade_analytics():
+    group_by = request.args.get('group_by', 'course')
+    crosstab_by = request.args.get('crosstab')
+    if group_by not in DIMENSIONS or (crosstab_by and crosstab_by not in DIMENSIONS):
+        return jsonify({'error': f"group_by and crosstab must be one of: {', '.join(DIMENSIONS)}"}), 400
+
+    try:
+        percentiles = [int(q) for q in request.args.get('percentiles', '25,50,75').split(',') if q]
+    except ValueError:
+        return jsonify({'error': 'percentiles must be a comma-separated list of integers'}), 400
+    if not all(0 <= q <= 100 for q in percentiles):
+        return jsonify({'error': 'percentiles must be between 0 and 100'}), 400
+
+    try:
+        columns = load_grade_columns(
+            semester_id=request.args.get('semester_id', type=int),
+            course_id=request.args.get('course_id', type=int),
+            program=request.args.get('program')
+        )
+        result = {
+            'group_by': group_by,
+            'total_grades': len(columns),
+            'groups': summarize(columns, group_by, percentiles)
+        }
+        if crosstab_by:
+            result['crosstab'] = crosstab(columns, group_by, crosstab_by)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('rebuild-gpa-summaries')
+def rebuild_gpa_summaries_command():
+    """Recompute gpa_summaries from the grades table (backfill / repair)."""
+    count = rebuild_gpa_summaries()
+    db.session.commit()
+    print(f"Rebuilt {count} GPA summaries.")
+
 # Additional routes needed for the frontend
 @grades_bp.route('/api/students', methods=['GET'])
 def get_students():
@@ -1674,7 +2310,24 @@ def get_all_clearance_statuses():
         return jsonify({}), 200
     
     try:
-        clearances = FeeClearance.query.all()
+        status_filter = request.args.get('status')
+        search_query = request.args.get('search')
+
+        criteria = []
+        if status_filter and status_filter != 'all':
+            criteria.append(func.lower(FeeClearance.status) == status_filter.lower())
+        if search_query:
+            search = f"%{search_query}%"
+            criteria.append(
+                (FeeClearance.student_id.cast(db.String).ilike(search)) |
+                (FeeClearance.student_name.ilike(search)) |
+                (FeeClearance.program.ilike(search))
+            )
+
+        clearances = db.session.query(
+            FeeClearance.student_id, FeeClearance.student_name, FeeClearance.program,
+            FeeClearance.amount_due, FeeClearance.status, FeeClearance.cleared_on
+        ).filter(*criteria).order_by(FeeClearance.student_id).all()
         return jsonify({
             'success': True,
             'clearances': [{
@@ -1684,7 +2337,20 @@ def get_all_clearance_statuses():
                 'amount_due': c.amount_due,
                 'status': c.status,
                 'cleared_on': c.cleared_on.isoformat() if c.cleared_on else None
-            } for c in clearances]
+            } for c in clearances],
+            'stats': clearance_stats(*criteria) if criteria else get_clearance_snapshot()
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/admin/clearance/stats', methods=['GET'])
+@role_required('admin')
+def get_clearance_stats():
+    """Dashboard statistics; ?by=program adds a per-program breakdown"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': get_clearance_snapshot(by_program=request.args.get('by') == 'program')
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -1926,15 +2592,38 @@ def create_fee_routes(app):
 
 # Get all fee structures
 @app.route('/api/fee-structures/', methods=['GET'])
-
+@response_cache.cached(tags=('fee_structures', 'courses', 'hostels', 'semesters'))
 def get_all_fee_structures():
-    fee_structures = FeeStructure.query.all()
+    try:
+        includes = requested_includes(('course', 'hostel', 'semester'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if includes is not None:
+        fee_structures = flat_fee_structures()
+        return jsonify({'fee_structures': fee_structures, 'included': side_load(fee_structures, includes)}), 200
+
+    # Nested shape kept for existing clients; eager-load so it is one query, not 3 per row
+    fee_structures = FeeStructure.query.options(
+        joinedload(FeeStructure.course), joinedload(FeeStructure.hostel), joinedload(FeeStructure.semester)
+    ).all()
     return jsonify([fs.to_dict() for fs in fee_structures]), 200
 
 # Get a specific fee structure by ID
 @app.route('/api/fee-structures/<int:id>', methods=['GET'])
 
 def get_fee_structure(id):
+    try:
+        includes = requested_includes(('course', 'hostel', 'semester'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if includes is not None:
+        fee_structures = flat_fee_structures([id])
+        if not fee_structures:
+            return jsonify({'error': 'Fee structure not found'}), 404
+        return jsonify({'fee_structure': fee_structures[0], 'included': side_load(fee_structures, includes)}), 200
+
     fs = FeeStructure.query.get_or_404(id)
     return jsonify(fs.to_dict()), 200
 
@@ -1952,6 +2641,7 @@ def create_fee_structure():
         )
         db.session.add(fs)
         db.session.commit()
+        response_cache.invalidate('fee_structures')
         return jsonify(fs.to_dict()), 201
     except Exception as e:
         db.session.rollback()
@@ -1964,11 +2654,14 @@ def update_fee_structure(id):
     fs = FeeStructure.query.get_or_404(id)
     data = request.get_json()
     try:
+        old_semester_id, old_amount = fs.semester_id, fs.amount
         fs.course_id = data.get('course_id', fs.course_id)
         fs.hostel_id = data.get('hostel_id', fs.hostel_id)
         fs.semester_id = data.get('semester_id', fs.semester_id)
         fs.amount = data.get('amount', fs.amount)
+        record_fee_structure_change(fs.id, old_semester_id, old_amount, fs.semester_id, float(fs.amount))
         db.session.commit()
+        response_cache.invalidate('fee_structures')
         return jsonify(fs.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -1981,6 +2674,7 @@ def delete_fee_structure(id):
     try:
         db.session.delete(fs)
         db.session.commit()
+        response_cache.invalidate('fee_structures')
         return jsonify({'message': 'Fee structure deleted'}), 200
     except Exception as e:
         db.session.rollback()
@@ -2000,10 +2694,31 @@ def assign_lecturer_to_course():
 
     course.lecturer_id = lecturer.id
     db.session.commit()
+    bump_catalogue_generation()
+    response_cache.invalidate('courses')
 
     return jsonify({'message': 'Lecturer assigned successfully', 'course': course.to_dict()})
 
 
+@app.route('/api/admin/cache-stats', methods=['GET'])
+@role_required('admin')
+def cache_stats():
+    return jsonify(response_cache.stats()), 200
+
+@app.route('/api/admin/password-hashing-stats', methods=['GET'])
+@role_required('admin')
+def password_hashing_stats():
+    return jsonify(password_hasher.stats()), 200
+
+@app.route('/api/admin/pool-stats', methods=['GET'])
+@role_required('admin')
+def pool_stats():
+    # Per gunicorn worker: each process has its own pool
+    return jsonify(pool_monitor.stats(db.engine)), 200
+
+# -------------------- Blueprint Registration --------------------
+app.register_blueprint(grades_bp)
+
 #......................................
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
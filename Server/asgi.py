@@ -0,0 +1,39 @@
+"""ASGI entry point: the same Flask app behind an event loop.
+
+    uvicorn asgi:application --host 0.0.0.0 --port $PORT --workers 2 --limit-concurrency 4000
+
+Worker model. Each uvicorn worker process runs one event loop that owns every
+socket: accepting, keep-alive, reading request bodies and writing responses to
+slow clients cost no thread. Route handlers are unchanged synchronous Flask
+code and run on a bounded thread pool (ASGI_THREADS per process), so a
+request only takes a thread while its handler runs. Requests beyond that queue
+in the loop instead of being refused, and --limit-concurrency caps total open
+connections per worker (uvicorn answers 503 beyond it).
+
+ASGI_THREADS defaults to the database pool's capacity (DB_POOL_SIZE +
+DB_MAX_OVERFLOW), so handler threads never queue behind each other for a
+connection; raise the two together. Database connections per instance are
+therefore workers * ASGI_THREADS, the same bound as under gunicorn.
+
+`gunicorn app:app` (sync workers) is still the default deployment; this entry
+point serves identical routes and responses.
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+
+# Responses are handed from the handler thread to the loop in chunks; this
+# many may be queued per request before a slow client backs up its handler.
+ASGI_SEND_QUEUE_SIZE = 10
+
+
+def handler_threads():
+    if os.environ.get('ASGI_THREADS'):
+        return int(os.environ['ASGI_THREADS'])
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    return options.get('pool_size', 5) + options.get('max_overflow', 10)
+
+
+application = WSGIMiddleware(app, workers=handler_threads(), send_queue_size=ASGI_SEND_QUEUE_SIZE)
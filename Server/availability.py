@@ -0,0 +1,177 @@
+import bisect
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, Room, StudentRoomBooking
+
+# The booking engine stays authoritative; the index only has to be close enough
+# that searches rarely offer a bed the engine then refuses. Other workers'
+# bookings reach us through this TTL.
+AVAILABILITY_INDEX_TTL = 60
+
+_PENDING_KEY = 'availability_changes'
+
+
+class RoomAvailability:
+    __slots__ = ('room_id', 'hostel_id', 'room_number', 'price_per_bed', 'capacity', 'occupants', 'status', 'bookings')
+
+    def __init__(self, room):
+        self.room_id = room.id
+        self.hostel_id = room.hostel_id
+        self.room_number = room.room_number
+        self.price_per_bed = room.price_per_bed or 0.0
+        self.capacity = room.capacity if room.capacity is not None else (room.bed_count or 0)
+        self.occupants = room.current_occupants or 0
+        self.status = (room.status or '').lower()
+        self.bookings = {}  # booking_id -> (start_date, end_date)
+
+    def free_beds(self, start_date=None, end_date=None):
+        # Mirrors booking.book_room: 'occupied' only describes today
+        if self.status not in ('available', 'occupied'):
+            return 0
+        if start_date and end_date:
+            overlapping = sum(1 for start, end in list(self.bookings.values()) if start < end_date and end > start_date)
+            return max(self.capacity - overlapping, 0)
+        return max(self.capacity - self.occupants, 0)
+
+    def _set_occupants(self, occupants):
+        # Mirrors booking.refresh_room_occupancy
+        self.occupants = max(occupants, 0)
+        if self.status in ('available', 'occupied'):
+            self.status = 'occupied' if self.occupants >= self.capacity else 'available'
+
+    def to_dict(self, free_beds):
+        return {
+            'room_id': self.room_id,
+            'hostel_id': self.hostel_id,
+            'room_number': self.room_number,
+            'price_per_bed': self.price_per_bed,
+            'capacity': self.capacity,
+            'free_beds': free_beds
+        }
+
+
+class AvailabilityIndex:
+    """In-memory view of every room's free beds, ordered by price.
+
+    Rooms are kept in price order globally and per hostel so a price ceiling
+    is a bisect rather than a scan; bookings are applied incrementally as
+    their transactions commit.
+    """
+
+    def __init__(self, rooms, bookings):
+        self.rooms = {room.id: RoomAvailability(room) for room in rooms}
+        for booking_id, room_id, start_date, end_date in bookings:
+            slot = self.rooms.get(room_id)
+            if slot:
+                slot.bookings[booking_id] = (start_date, end_date)
+
+        self._by_price = sorted((slot.price_per_bed, slot.room_id) for slot in self.rooms.values())
+        self._by_hostel = {}
+        for price, room_id in self._by_price:
+            self._by_hostel.setdefault(self.rooms[room_id].hostel_id, []).append((price, room_id))
+        self._lock = threading.Lock()
+
+    def search(self, hostel_id=None, start_date=None, end_date=None, max_price=None, min_free_beds=1, limit=50):
+        ordered = self._by_price if hostel_id is None else self._by_hostel.get(hostel_id, [])
+        if max_price is not None:
+            ordered = ordered[:bisect.bisect_right(ordered, (max_price, float('inf')))]
+
+        results = []
+        for _, room_id in ordered:
+            slot = self.rooms[room_id]
+            free = slot.free_beds(start_date, end_date)
+            if free >= min_free_beds:
+                results.append(slot.to_dict(free))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def apply(self, changes):
+        now = datetime.utcnow()
+        with self._lock:
+            for kind, room_id, booking_id, start_date, end_date in changes:
+                slot = self.rooms.get(room_id)
+                if slot is None:
+                    continue
+                if kind == 'book':
+                    slot.bookings[booking_id] = (start_date, end_date)
+                    if start_date <= now < end_date:
+                        slot._set_occupants(slot.occupants + 1)
+                else:
+                    start_date, end_date = slot.bookings.pop(booking_id, (None, None))
+                    if start_date and start_date <= now < end_date:
+                        slot._set_occupants(slot.occupants - 1)
+
+
+_lock = threading.Lock()
+_index = None
+_built_at = 0.0
+
+
+def get_availability_index():
+    global _index, _built_at
+    index = _index
+    if index is not None and time.monotonic() - _built_at < AVAILABILITY_INDEX_TTL:
+        return index
+
+    with _lock:
+        if _index is None or time.monotonic() - _built_at >= AVAILABILITY_INDEX_TTL:
+            rooms = Room.query.all()
+            # Only bookings that can still overlap a future search matter
+            bookings = db.session.query(
+                StudentRoomBooking.id, StudentRoomBooking.room_id,
+                StudentRoomBooking.start_date, StudentRoomBooking.end_date
+            ).filter(
+                StudentRoomBooking.end_date > datetime.utcnow(),
+                db.or_(StudentRoomBooking.status.is_(None), StudentRoomBooking.status != 'cancelled')
+            ).all()
+            _index = AvailabilityIndex(rooms, bookings)
+            _built_at = time.monotonic()
+        return _index
+
+
+def invalidate_availability_index():
+    global _index
+    _index = None
+
+
+def record_booking(booking):
+    """Queue a new booking for the index; applied only once the session commits"""
+    db.session.info.setdefault(_PENDING_KEY, []).append(
+        ('book', booking.room_id, booking.id, booking.start_date, booking.end_date)
+    )
+
+
+def record_cancellation(booking):
+    db.session.info.setdefault(_PENDING_KEY, []).append(
+        ('cancel', booking.room_id, booking.id, None, None)
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_on_room_writes(session, flush_context):
+    # Room edits (capacity, price, status, new rooms) change the ordering; rebuild
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Room):
+            session.info['availability_rebuild'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_changes(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop('availability_rebuild', False):
+        invalidate_availability_index()
+    elif changes and _index is not None:
+        _index.apply(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop('availability_rebuild', None)
@@ -0,0 +1,56 @@
+"""Setup shared by the benchmark scripts.
+
+Import this first: it puts the Server directory on sys.path, and
+use_benchmark_database must run before app is imported, since the engine is
+built from DATABASE_URL at import time.
+
+Every benchmark wipes the database it runs on, so an inherited DATABASE_URL is
+ignored: the default is a throwaway SQLite file, and anything else has to be
+named with --database-url (plus --allow-wipe unless it is SQLite).
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+BATCH = 20000
+
+
+def add_database_arguments(parser):
+    parser.add_argument('--database-url', help='run against this database instead of a throwaway SQLite file; '
+                                               'it is wiped and reseeded')
+    parser.add_argument('--allow-wipe', action='store_true',
+                        help='required to wipe a --database-url that is not SQLite')
+
+
+def use_benchmark_database(name, args):
+    """Point DATABASE_URL at --database-url, or at a fresh SQLite file"""
+    if multiprocessing.parent_process() is not None:
+        return  # a worker re-importing the script; keep the parent's choice
+    url = args.database_url
+    if url is None:
+        url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), f'{name}.db')
+    elif make_url(url).get_backend_name() != 'sqlite' and not args.allow_wipe:
+        sys.exit(f"Refusing to wipe {make_url(url).render_as_string(hide_password=True)}; "
+                 f"pass --allow-wipe if that is what you want")
+    os.environ['DATABASE_URL'] = url
+
+
+def insert_batches(model, rows, batch_size=BATCH):
+    """Bulk INSERT an iterable of row dicts, batch_size rows per executemany"""
+    from models import db  # not at module level: app has to be configured first
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model), batch)
@@ -0,0 +1,119 @@
+"""Concurrent hostel booking benchmark.
+
+Hammers the booking engine from many threads over two back-to-back terms and
+checks that no room ends up oversubscribed in either. Uses a throwaway SQLite
+file unless --database-url is given.
+
+    python benchmarks/booking_concurrency.py --threads 16 --attempts 2000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+from _common import add_database_arguments, use_benchmark_database
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--threads', type=int, default=16)
+parser.add_argument('--attempts', type=int, default=2000, help='total booking attempts across all threads')
+parser.add_argument('--rooms', type=int, default=50)
+parser.add_argument('--beds', type=int, default=4, help='capacity of every room')
+add_database_arguments(parser)
+args = parser.parse_args()
+
+use_benchmark_database('booking_bench', args)
+
+from app import app
+from models import db, User, StudentProfile, Hostel, Room, StudentRoomBooking
+from booking import BookingError, book_room
+
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    hostel = Hostel(name='Bench Hostel', location='Campus', capacity=args.rooms * args.beds)
+    db.session.add(hostel)
+    db.session.flush()
+    db.session.add_all(
+        Room(hostel_id=hostel.id, room_number=f'B-{i:04d}', bed_count=args.beds, capacity=args.beds,
+             price_per_bed=100.0, status='available')
+        for i in range(args.rooms)
+    )
+    users = [User(name=f'Bench {i}', email=f'bench{i}@bench.local', role='student', password_hash='-')
+             for i in range(args.attempts)]
+    db.session.add_all(users)
+    db.session.flush()
+    db.session.add_all(
+        StudentProfile(user_id=user.id, reg_no=f'BENCH{i:06d}', program='Bench', year_of_study=1)
+        for i, user in enumerate(users)
+    )
+    db.session.commit()
+    room_ids = [room_id for (room_id,) in db.session.query(Room.id)]
+    student_ids = [student_id for (student_id,) in db.session.query(StudentProfile.id)]
+    return room_ids, student_ids
+
+
+# Two back-to-back terms: a room full for one still takes bookings for the other
+TERMS = [(datetime(2025, 1, 15), datetime(2025, 5, 15)), (datetime(2025, 5, 15), datetime(2025, 9, 12))]
+
+
+def worker(student_ids, room_ids, results, lock):
+    counts = {'booked': 0, 'full': 0, 'errors': 0}
+    with app.app_context():
+        for student_id in student_ids:
+            try:
+                book_room(student_id, random.choice(room_ids), *random.choice(TERMS))
+                db.session.commit()
+                counts['booked'] += 1
+            except BookingError:
+                db.session.rollback()
+                counts['full'] += 1
+            except Exception:
+                db.session.rollback()
+                counts['errors'] += 1
+    with lock:
+        for key, value in counts.items():
+            results[key] += value
+
+
+def main():
+    with app.app_context():
+        room_ids, student_ids = seed()
+
+    results = {'booked': 0, 'full': 0, 'errors': 0}
+    lock = threading.Lock()
+    slices = [student_ids[i::args.threads] for i in range(args.threads)]
+    threads = [threading.Thread(target=worker, args=(part, room_ids, results, lock)) for part in slices]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        booking_count = StudentRoomBooking.query.count()
+        per_term = db.session.query(
+            Room.capacity, db.func.count(StudentRoomBooking.id)
+        ).join(StudentRoomBooking, StudentRoomBooking.room_id == Room.id).group_by(
+            Room.id, Room.capacity, StudentRoomBooking.start_date
+        ).all()
+        oversubscribed = sum(1 for capacity, booked in per_term if booked > capacity)
+
+    print(f"database:        {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
+    print(f"threads:         {args.threads}")
+    print(f"attempts:        {args.attempts} in {elapsed:.2f}s ({args.attempts / elapsed:.0f} attempts/s)")
+    print(f"booked:          {results['booked']} ({results['booked'] / elapsed:.0f} bookings/s)")
+    print(f"rejected (full): {results['full']}")
+    print(f"errors:          {results['errors']}")
+    print(f"beds available:  {args.rooms * args.beds * len(TERMS)} ({len(TERMS)} terms)")
+    print(f"consistency:     bookings={booking_count} booked={results['booked']} oversubscribed_room_terms={oversubscribed}")
+    if oversubscribed or booking_count != results['booked']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
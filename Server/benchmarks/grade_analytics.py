@@ -0,0 +1,100 @@
+"""Cohort grade analytics benchmark.
+
+Times the vectorized summaries behind GET /api/admin/analytics/grades on a
+synthetic in-memory grade table (5M rows by default). With --db-rows it also
+seeds a throwaway SQLite file (or --database-url) and times the
+batched load from the database into arrays.
+
+    python benchmarks/grade_analytics.py --rows 5000000
+    python benchmarks/grade_analytics.py --rows 1000000 --db-rows 200000
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from _common import add_database_arguments, use_benchmark_database
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--rows', type=int, default=5000000)
+parser.add_argument('--courses', type=int, default=2000)
+parser.add_argument('--semesters', type=int, default=12)
+parser.add_argument('--programs', type=int, default=40)
+parser.add_argument('--db-rows', type=int, default=0, help='also time loading this many rows from the database')
+parser.add_argument('--seed', type=int, default=42)
+add_database_arguments(parser)
+args = parser.parse_args()
+
+use_benchmark_database('analytics_bench', args)
+
+from app import app
+from models import db, Course, Semester, Grade
+from analytics import GRADE_SCALE, GradeColumns, load_grade_columns, summarize, crosstab
+
+rng = np.random.default_rng(args.seed)
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"  {label:<32} {time.perf_counter() - started:8.3f}s")
+    return result
+
+
+def synthetic_columns(rows):
+    course_programs = {course_id: f'P{course_id % args.programs:03d}' for course_id in range(1, args.courses + 1)}
+    grade_codes = rng.integers(-1, len(GRADE_SCALE), rows, dtype=np.int8)  # -1: off-scale letters
+    course_ids = rng.integers(1, args.courses + 1, rows, dtype=np.int32)
+    semester_ids = rng.integers(1, args.semesters + 1, rows, dtype=np.int32)
+    return GradeColumns(grade_codes, course_ids, semester_ids, course_programs)
+
+
+def seed_database(rows):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(db.insert(Semester), [
+        {'id': i, 'name': f'Bench {i}', 'start_date': datetime(2020, i % 12 + 1, 1), 'end_date': datetime(2020, i % 12 + 1, 28)}
+        for i in range(1, args.semesters + 1)
+    ])
+    db.session.execute(db.insert(Course), [
+        {'id': i, 'code': f'BN{i:05d}', 'title': f'Bench {i}', 'semester_id': i % args.semesters + 1,
+         'program': f'P{i % args.programs:03d}'}
+        for i in range(1, args.courses + 1)
+    ])
+    letters = np.array(GRADE_SCALE + ['F'])[rng.integers(0, len(GRADE_SCALE) + 1, rows)]
+    courses = rng.integers(1, args.courses + 1, rows)
+    semesters = rng.integers(1, args.semesters + 1, rows)
+    for start in range(0, rows, 50000):
+        # One student per row keeps (student, course, semester) unique
+        db.session.execute(db.insert(Grade), [
+            {'student_id': start + i + 1, 'course_id': int(c), 'semester_id': int(s), 'grade': str(g)}
+            for i, (c, s, g) in enumerate(zip(courses[start:start + 50000], semesters[start:start + 50000],
+                                              letters[start:start + 50000]))
+        ])
+    db.session.commit()
+
+
+def main():
+    print(f"Synthetic table: {args.rows:,} rows, {args.courses} courses, "
+          f"{args.semesters} semesters, {args.programs} programs")
+    columns = timed('build arrays', lambda: synthetic_columns(args.rows))
+    total = time.perf_counter()
+    for dimension in ('course', 'program', 'semester'):
+        groups = timed(f'summarize by {dimension}', lambda: summarize(columns, dimension, (10, 25, 50, 75, 90)))
+        assert sum(group['count'] for group in groups) == len(columns)
+    timed('crosstab program x semester', lambda: crosstab(columns, 'program', 'semester'))
+    print(f"  {'all summaries':<32} {time.perf_counter() - total:8.3f}s "
+          f"({len(columns) / (time.perf_counter() - total) / 1e6:.1f}M graded rows/s)")
+
+    if args.db_rows:
+        print(f"\nDatabase load: {args.db_rows:,} rows ({app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0]})")
+        with app.app_context():
+            timed('seed', lambda: seed_database(args.db_rows))
+            loaded = timed('load_grade_columns', load_grade_columns)
+            timed('summarize by course', lambda: summarize(loaded, 'course'))
+            print(f"  {len(loaded):,} on-scale grades loaded")
+
+
+if __name__ == '__main__':
+    main()
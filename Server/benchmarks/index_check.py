@@ -0,0 +1,166 @@
+"""Index usage check for the hot lookup queries.
+
+Builds the schema through the migration pack (flask db upgrade), seeds a
+large synthetic dataset, runs ANALYZE and then EXPLAINs each hot lookup,
+failing if any of them falls back to a full table scan instead of the index
+it is meant to use. Works on SQLite (EXPLAIN QUERY PLAN) and PostgreSQL
+(EXPLAIN FORMAT JSON). Uses a throwaway SQLite file unless --database-url
+is given; that database is wiped first.
+
+    python benchmarks/index_check.py --students 50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from _common import SERVER_DIR, add_database_arguments, insert_batches, use_benchmark_database
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--students', type=int, default=50000)
+parser.add_argument('--courses', type=int, default=2000)
+parser.add_argument('--semesters', type=int, default=12)
+parser.add_argument('--grades-per-student', type=int, default=10)
+add_database_arguments(parser)
+args = parser.parse_args()
+
+use_benchmark_database('index_check', args)
+
+from flask_migrate import upgrade
+from sqlalchemy import select, text
+
+from app import app
+from models import (db, Course, FeeClearance, FeeStructure, Grade, Hostel, LecturerProfile, Payment, Registration,
+                    Room, Semester, StudentProfile, StudentRoomBooking, UnitRegistration, User)
+
+START = datetime(2024, 1, 1)
+
+# (label, statement, index expected in the plan; None accepts any index, e.g. an unnamed unique key)
+HOT_QUERIES = [
+    ('grades by student', lambda: select(Grade).where(Grade.student_id == 7), None),
+    ('grade duplicate check', lambda: select(Grade).where(
+        Grade.student_id == 7, Grade.course_id == 3, Grade.semester_id == 2), None),
+    ('grades by course and semester', lambda: select(Grade).where(
+        Grade.course_id == 3, Grade.semester_id == 2), 'ix_grade_course_semester'),
+    ('grade keyset page', lambda: select(Grade).where(Grade.date_posted > START).order_by(
+        Grade.date_posted, Grade.id).limit(50), 'ix_grade_date_posted_id'),
+    ('course by code', lambda: select(Course).where(Course.code == 'CS00042'), 'ix_courses_code'),
+    ('catalogue by semester and program', lambda: select(Course).where(
+        Course.semester_id == 2, Course.program == 'P007'), 'ix_courses_semester_program'),
+    ('unit registrations by student', lambda: select(UnitRegistration).where(
+        UnitRegistration.student_id == 7, UnitRegistration.semester_id == 2), None),
+    ('clearance by student', lambda: select(FeeClearance).where(FeeClearance.student_id == 7),
+     'ix_fee_clearances_student_id'),
+    ('payments by student', lambda: select(Payment).where(Payment.student_id == 7),
+     'ix_payments_student_fee_structure'),
+    ('payment by reference', lambda: select(Payment.id).where(Payment.transaction_ref == 'TX00000042'), None),
+    ('pending registrations', lambda: select(Registration).where(Registration.status == 'pending'),
+     'ix_registration_status'),
+    ('room overlap check', lambda: select(StudentRoomBooking.id).where(
+        StudentRoomBooking.room_id == 5, StudentRoomBooking.start_date < START + timedelta(days=30),
+        StudentRoomBooking.end_date > START), 'ix_student_room_bookings_room_dates'),
+    ('profile by user', lambda: select(User, StudentProfile).join(
+        StudentProfile, StudentProfile.user_id == User.id).where(User.id == 7), 'ix_student_profiles_user_id'),
+    ('lecturer profile by user', lambda: select(LecturerProfile).where(LecturerProfile.user_id == 7),
+     'ix_lecturer_profiles_user_id'),
+]
+
+
+def reset_schema():
+    db.drop_all()
+    with db.engine.begin() as conn:
+        conn.execute(text('DROP TABLE IF EXISTS alembic_version'))
+    upgrade(directory=os.path.join(SERVER_DIR, 'migrations'))
+
+
+def seed():
+    students, courses, semesters = args.students, args.courses, args.semesters
+    insert_batches(Semester, ({'id': i, 'name': f'Semester {i}', 'start_date': START + timedelta(days=120 * i),
+                               'end_date': START + timedelta(days=120 * i + 100)} for i in range(1, semesters + 1)))
+    insert_batches(User, ({'id': i, 'name': f'Student {i}', 'email': f's{i}@check.local', 'password_hash': '-',
+                           'role': 'student'} for i in range(1, students + 1)))
+    insert_batches(StudentProfile, ({'id': i, 'user_id': i, 'reg_no': f'REG{i:07d}', 'program': f'P{i % 40:03d}',
+                                     'year_of_study': i % 4 + 1} for i in range(1, students + 1)))
+    insert_batches(LecturerProfile, ({'id': i, 'user_id': i, 'staff_no': f'STF{i:07d}', 'department': 'Bench'}
+                                     for i in range(1, students // 20 + 2)))
+    insert_batches(Course, ({'id': i, 'code': f'CS{i:05d}', 'title': f'Course {i}', 'semester_id': i % semesters + 1,
+                             'program': f'P{i % 40:03d}'} for i in range(1, courses + 1)))
+    insert_batches(Grade, ({'student_id': s, 'course_id': (s * 7 + k) % courses + 1, 'semester_id': k % semesters + 1,
+                            'grade': 'ABCDEF'[(s + k) % 6], 'date_posted': START + timedelta(minutes=s * 10 + k)}
+                           for s in range(1, students + 1) for k in range(args.grades_per_student)))
+    insert_batches(UnitRegistration, ({'student_id': s, 'course_id': (s * 7 + k) % courses + 1,
+                                       'semester_id': k % semesters + 1, 'registered_on': START}
+                                      for s in range(1, students + 1) for k in range(4)))
+    db.session.execute(db.insert(Hostel), [{'id': 1, 'name': 'Check Hall', 'location': 'Campus', 'capacity': students}])
+    insert_batches(FeeStructure, ({'id': i, 'course_id': i, 'hostel_id': 1, 'semester_id': i % semesters + 1,
+                                   'amount': 1000.0} for i in range(1, courses + 1)))
+    insert_batches(Payment, ({'student_id': s, 'fee_structure_id': (s + k) % courses + 1, 'amount_paid': 250.0,
+                              'payment_date': START, 'payment_method': 'bank', 'transaction_ref': f'TX{s * 3 + k:08d}'}
+                             for s in range(1, students + 1) for k in range(3)))
+    insert_batches(FeeClearance, ({'student_id': s, 'student_name': f'Student {s}', 'amount_due': 0.0,
+                                   'program': f'P{s % 40:03d}', 'status': 'Cleared' if s % 5 else 'Pending'}
+                                  for s in range(1, students + 1)))
+    insert_batches(Registration, ({'student_name': f'Applicant {i}', 'student_email': f'a{i}@check.local',
+                                   'status': 'pending' if i % 50 == 0 else 'approved'}
+                                  for i in range(1, students + 1)))
+    rooms = max(students // 4, 10)
+    insert_batches(Room, ({'id': i, 'hostel_id': 1, 'room_number': f'R{i:06d}', 'bed_count': 4, 'capacity': 4,
+                           'price_per_bed': 100.0, 'status': 'available'} for i in range(1, rooms + 1)))
+    insert_batches(StudentRoomBooking, ({'student_id': s, 'room_id': s % rooms + 1,
+                                         'start_date': START + timedelta(days=s % 365),
+                                         'end_date': START + timedelta(days=s % 365 + 120), 'status': 'confirmed'}
+                                        for s in range(1, students + 1)))
+    db.session.commit()
+    with db.engine.begin() as conn:
+        conn.execute(text('ANALYZE'))
+
+
+def explain(statement):
+    """(indexes used, tables scanned without an index) for one statement"""
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    if db.engine.dialect.name == 'sqlite':
+        details = [row[-1] for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql))]
+        indexes = [d.split(' INDEX ', 1)[1].split(' ')[0] for d in details if ' INDEX ' in d]
+        scans = [d.split(' ')[1] for d in details if d.startswith('SCAN ') and ' INDEX ' not in d]
+        return indexes, scans
+
+    plan = db.session.execute(text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    indexes, scans, nodes = [], [], [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if 'Index Name' in node:
+            indexes.append(node['Index Name'])
+        if node['Node Type'] == 'Seq Scan':
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return indexes, scans
+
+
+def main():
+    with app.app_context():
+        started = time.perf_counter()
+        reset_schema()
+        seed()
+        print(f"Seeded {args.students:,} students on {db.engine.dialect.name} "
+              f"in {time.perf_counter() - started:.1f}s\n")
+
+        failures = 0
+        for label, build, expected in HOT_QUERIES:
+            statement = build()
+            indexes, scans = explain(statement)
+            ok = (expected in indexes) if expected else bool(indexes) and not scans
+            started = time.perf_counter()
+            db.session.execute(statement).all()
+            elapsed = (time.perf_counter() - started) * 1000
+            used = ', '.join(indexes) or f"scan of {', '.join(scans)}"
+            print(f"  {'ok ' if ok else 'FAIL'} {label:<36} {elapsed:8.2f} ms  {used}")
+            failures += not ok
+        print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use their index")
+        return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
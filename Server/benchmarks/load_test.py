@@ -0,0 +1,317 @@
+"""Load test replaying the portal's peak scenarios.
+
+Seeds a campus with seed.py's bulk generator (--students, in steps of
+seed_bulk's scale), then replays each scenario's
+request mix from --concurrency threads and reports p50/p95/p99 latency,
+throughput and SQL query counts per endpoint. Query counts come from the
+Server-Timing header that query_stats adds to every response.
+
+Scenarios:
+    login_storm        everyone logging in at once (password verification)
+    registration_rush  bulk unit registration plus catalogue reads
+    booking_rush       hostel bookings plus availability searches
+    results_release    students opening grades and transcripts
+    fee_deadline       payments plus balance checks
+
+By default the app runs in-process against a throwaway SQLite file (or
+--database-url, which is wiped and reseeded; DATABASE_URL from the environment
+is ignored). With --url the requests go over HTTP to a running server instead
+(gunicorn app:app or uvicorn asgi:application); the harness still seeds
+through --database-url, which must be the server's.
+
+    python benchmarks/load_test.py --students 5000 --requests 1000 --json results.json
+    python benchmarks/load_test.py --scenarios booking_rush --compare results.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 \
+        --database-url postgresql://bench@localhost/portal_bench --allow-wipe
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from _common import add_database_arguments, use_benchmark_database
+
+SCENARIOS = ('login_storm', 'registration_rush', 'booking_rush', 'results_release', 'fee_deadline')
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--students', type=int, default=2000)
+parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+parser.add_argument('--concurrency', type=int, default=16)
+parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests before each scenario')
+parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+parser.add_argument('--url', help='base URL of a running server, e.g. http://127.0.0.1:8000')
+parser.add_argument('--json', dest='json_path', help='write machine-readable results here')
+parser.add_argument('--compare', help='earlier --json results to print deltas against')
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--workers', type=int, default=None, help='seed_bulk generator processes (default: CPUs)')
+add_database_arguments(parser)
+args = parser.parse_args()
+
+use_benchmark_database('load_test', args)
+
+from sqlalchemy import select
+
+from app import app
+from models import db, Course
+from seed import BULK_ACTIVE_SEMESTER, BULK_STUDENTS_PER_SCALE, BULK_TERM_START, reset_schema, seed_bulk
+
+LOGIN_PASSWORD = 'studentpass'  # seed_bulk's <role>pass, hashed once and shared by every student
+SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+# -------------------- Dataset --------------------
+
+class Dataset:
+    """Ids the scenarios draw from"""
+
+    def __init__(self, emails, user_ids, student_ids, course_codes, room_ids, fee_structure_ids, semester_id):
+        self.emails = emails
+        self.user_ids = user_ids
+        self.student_ids = student_ids
+        self.course_codes = course_codes
+        self.room_ids = room_ids
+        self.fee_structure_ids = fee_structure_ids
+        self.semester_id = semester_id
+
+
+def seed():
+    reset_schema()
+    layout = seed_bulk(scale=args.students / BULK_STUDENTS_PER_SCALE, workers=args.workers, seed=args.seed)
+    students = range(1, layout.students + 1)
+    return Dataset(
+        emails=[f'student{i}@university.edu' for i in students],
+        user_ids=[layout.student_user_id(i) for i in students],
+        student_ids=list(students),
+        course_codes=db.session.scalars(
+            select(Course.code).where(Course.semester_id == BULK_ACTIVE_SEMESTER).order_by(Course.id)
+        ).all(),
+        room_ids=list(range(1, layout.rooms + 1)),
+        fee_structure_ids=list(range(1, len(layout.fee_structure_courses) + 1)),
+        semester_id=BULK_ACTIVE_SEMESTER
+    )
+
+
+# -------------------- Scenarios --------------------
+#
+# Each scenario picks the next request: (endpoint label, method, path, JSON body)
+
+def login_storm(data, rng):
+    password = LOGIN_PASSWORD if rng.random() > 0.05 else 'wrong-password'
+    return 'POST /api/login', 'POST', '/api/login', {'email': rng.choice(data.emails), 'password': password}
+
+
+def registration_rush(data, rng):
+    if rng.random() < 0.3:
+        return 'GET /api/courses', 'GET', f'/api/courses?semester_id={data.semester_id}', None
+    return 'POST /api/registration/bulk', 'POST', '/api/registration/bulk', {
+        'student_id': rng.choice(data.student_ids),
+        'semester_id': data.semester_id,
+        'course_codes': rng.sample(data.course_codes, 4)
+    }
+
+
+def booking_rush(data, rng):
+    start = BULK_TERM_START + timedelta(days=rng.choice((0, 120)))
+    if rng.random() < 0.3:
+        return 'GET /api/rooms/availability', 'GET', (
+            f"/api/rooms/availability?start_date={start:%Y-%m-%d}&end_date={start + timedelta(days=100):%Y-%m-%d}"
+        ), None
+    return 'POST /api/bookings', 'POST', '/api/bookings', {
+        'student_id': rng.choice(data.student_ids),
+        'room_id': rng.choice(data.room_ids),
+        'start_date': f'{start:%Y-%m-%d}',
+        'end_date': f'{start + timedelta(days=100):%Y-%m-%d}'
+    }
+
+
+def results_release(data, rng):
+    user_id = rng.choice(data.user_ids)
+    if rng.random() < 0.3:
+        return 'GET /api/grades/transcript/<id>', 'GET', f'/api/grades/transcript/{user_id}', None
+    return 'GET /api/grades/', 'GET', f'/api/grades/?student_id={user_id}', None
+
+
+def fee_deadline(data, rng):
+    student_id = rng.choice(data.student_ids)
+    if rng.random() < 0.4:
+        return 'GET /api/payments/balance/<id>', 'GET', f'/api/payments/balance/{student_id}', None
+    return 'POST /api/payments', 'POST', '/api/payments', {
+        'student_id': student_id,
+        'fee_structure_id': rng.choice(data.fee_structure_ids),
+        'amount_paid': rng.choice((5000, 10000, 22500)),
+        'payment_method': 'mpesa'
+    }
+
+
+# -------------------- Runner --------------------
+
+class InProcessClient:
+    """Flask test client; one per thread"""
+
+    def __init__(self):
+        self.client = app.test_client()
+
+    def request(self, method, path, body):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.headers.get('Server-Timing', '')
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status, response.headers.get('Server-Timing', '')
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, e.headers.get('Server-Timing', '')
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_scenario(name, data):
+    choose = globals()[name]
+    local = threading.local()
+    samples = defaultdict(list)  # label -> [(ms, status, queries, db_ms)]
+    lock = threading.Lock()
+
+    def one(index, measured):
+        if not hasattr(local, 'client'):
+            local.client = HttpClient(args.url) if args.url else InProcessClient()
+        label, method, path, body = choose(data, random.Random(f'{args.seed}:{name}:{measured}:{index}'))
+        started = time.perf_counter()
+        try:
+            status, timing = local.client.request(method, path, body)
+        except Exception:
+            status, timing = 599, ''
+        elapsed = (time.perf_counter() - started) * 1000
+        if measured:
+            match = SERVER_TIMING.search(timing)
+            sample = (elapsed, status, int(match.group(2)) if match else None, float(match.group(1)) if match else None)
+            with lock:
+                samples[label].append(sample)
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(lambda i: one(i, False), range(args.warmup)))
+        started = time.perf_counter()
+        list(pool.map(lambda i: one(i, True), range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for label, rows in sorted(samples.items()):
+        latencies = sorted(row[0] for row in rows)
+        queries = [row[2] for row in rows if row[2] is not None]
+        db_ms = [row[3] for row in rows if row[3] is not None]
+        statuses = defaultdict(int)
+        for row in rows:
+            statuses[str(row[1])] += 1
+        endpoints[label] = {
+            'requests': len(rows),
+            'throughput_rps': round(len(rows) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'max_ms': round(latencies[-1], 2),
+            'mean_queries': round(sum(queries) / len(queries), 2) if queries else None,
+            'max_queries': max(queries) if queries else None,
+            'mean_db_ms': round(sum(db_ms) / len(db_ms), 2) if db_ms else None,
+            'errors': sum(count for status, count in statuses.items() if int(status) >= 500),
+            'statuses': dict(statuses),
+        }
+    return {
+        'requests': args.requests,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(args.requests / elapsed, 1),
+        'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+        'endpoints': endpoints,
+    }
+
+
+def print_scenario(name, result, baseline=None):
+    print(f"\n{name}: {result['requests']} requests in {result['seconds']:.2f}s "
+          f"({result['throughput_rps']:.0f} req/s, {result['errors']} errors)")
+    print(f"  {'endpoint':<34} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}  statuses")
+    for label, endpoint in result['endpoints'].items():
+        queries = endpoint['mean_queries'] if endpoint['mean_queries'] is not None else '-'
+        line = (f"  {label:<34} {endpoint['requests']:>5} {endpoint['p50_ms']:>8.1f} {endpoint['p95_ms']:>8.1f} "
+                f"{endpoint['p99_ms']:>8.1f} {queries:>8}  {endpoint['statuses']}")
+        previous = (baseline or {}).get('endpoints', {}).get(label)
+        if previous:
+            line += f"  p95 {(endpoint['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}% vs baseline"
+        print(line)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['scenarios']
+
+    with app.app_context():
+        started = time.perf_counter()
+        data = seed()
+        dialect = db.engine.dialect.name
+    print(f"Seeded {len(data.student_ids):,} students on {dialect} in {time.perf_counter() - started:.1f}s; "
+          f"{args.concurrency} threads against {args.url or 'the in-process app'}")
+
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, data)
+        print_scenario(name, results[name], baseline.get(name))
+
+    if args.json_path:
+        report = {
+            'run': {
+                'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'database': dialect,
+                'target': args.url or 'in-process',
+                'students': len(data.student_ids),
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'seed': args.seed,
+            },
+            'scenarios': results,
+        }
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nWrote {args.json_path}")
+    return 1 if any(result['errors'] for result in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Serializer and JSON encoder micro-benchmark.
+
+Compares the old getattr-loop to_dict with the compiled serializers on ORM
+instances and on projected Rows, then the stdlib and orjson JSON providers on
+the resulting listing. Uses a throwaway SQLite file unless --database-url is
+given.
+
+    python benchmarks/serializers.py --rows 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from _common import add_database_arguments, use_benchmark_database
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--rows', type=int, default=100000)
+parser.add_argument('--repeat', type=int, default=3, help='best of N runs per case')
+add_database_arguments(parser)
+args = parser.parse_args()
+
+use_benchmark_database('serializer_bench', args)
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import app
+from models import db, Hostel, Room, User
+from serializers import OrjsonProvider, compile_serializer, orjson, serialize_rows
+
+ROOM_FIELDS = ('id', 'hostel_id', 'room_number', 'bed_count', 'price_per_bed', 'status', 'created_at')
+
+
+def legacy_to_dict(obj, rules):
+    # What every generic to_dict did before: getattr per field, datetime check per value
+    result = {field: getattr(obj, field) for field in rules}
+    for field, value in result.items():
+        if isinstance(value, datetime):
+            result[field] = value.isoformat()
+    return result
+
+
+def legacy_user_to_dict(user, rules):
+    exclude_fields = {rule[1:] for rule in rules if rule.startswith('-')}
+    return {field: getattr(user, field) for field in user.__table__.columns.keys() if field not in exclude_fields}
+
+
+def best(label, fn, baseline=None):
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    elapsed = min(timings)
+    speedup = f'  x{baseline / elapsed:4.1f}' if baseline else ''
+    print(f"  {label:<40} {elapsed * 1000:9.1f} ms  {args.rows / elapsed / 1e3:8.0f}k rows/s{speedup}")
+    return elapsed, result
+
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    hostel = Hostel(name='Bench Hostel', location='Campus', capacity=args.rows)
+    db.session.add(hostel)
+    db.session.flush()
+    created = datetime(2025, 1, 1)
+    db.session.execute(db.insert(Room), [
+        {'hostel_id': hostel.id, 'room_number': f'R-{i:06d}', 'bed_count': 4, 'capacity': 4,
+         'price_per_bed': 100.0 + i % 50, 'status': 'available', 'created_at': created + timedelta(minutes=i)}
+        for i in range(args.rows)
+    ])
+    db.session.execute(db.insert(User), [
+        {'name': f'User {i}', 'email': f'user{i}@bench.local', 'password_hash': '-', 'role': 'student'}
+        for i in range(args.rows)
+    ])
+    db.session.commit()
+
+
+def main():
+    with app.app_context():
+        seed()
+        rooms = Room.query.all()
+        users = User.query.all()
+        rows = db.session.query(*(getattr(Room, field) for field in ROOM_FIELDS)).all()
+
+        print(f"Serializing {args.rows:,} rooms ({len(ROOM_FIELDS)} fields, one datetime)")
+        baseline, _ = best('legacy getattr to_dict', lambda: [legacy_to_dict(r, ROOM_FIELDS) for r in rooms])
+        compiled = compile_serializer(Room, ROOM_FIELDS)
+        best('compiled, ORM instances', lambda: [compiled(r) for r in rooms], baseline)
+        _, listing = best('compiled, projected Rows', lambda: serialize_rows(rows, Room, ROOM_FIELDS), baseline)
+
+        print(f"\nSerializing {args.rows:,} users (User.to_dict, '-password_hash')")
+        baseline, _ = best('legacy column loop', lambda: [legacy_user_to_dict(u, ('-password_hash',)) for u in users])
+        best('compiled', lambda: [u.to_dict(rules=('-password_hash',)) for u in users], baseline)
+
+        print(f"\nJSON-encoding the {args.rows:,}-room listing")
+        baseline, _ = best('stdlib provider', lambda: DefaultJSONProvider(app).response(listing).get_data(), None)
+        if orjson is None:
+            print('  orjson not installed; skipping')
+        else:
+            best('orjson provider', lambda: OrjsonProvider(app).response(listing).get_data(), baseline)
+
+
+if __name__ == '__main__':
+    main()
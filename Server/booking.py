@@ -0,0 +1,163 @@
+from datetime import datetime
+
+from sqlalchemy import select, update, case, func
+
+from models import db, Room, StudentProfile, StudentRoomBooking
+from availability import record_booking, record_cancellation
+
+# Rooms seeded before `capacity` was populated only carry bed_count
+_capacity = func.coalesce(Room.capacity, Room.bed_count)
+# 'occupied' is derived from today's bookings; such a room can still take later terms
+_BOOKABLE_STATUSES = ('available', 'occupied')
+_holds_bed = db.or_(StudentRoomBooking.status.is_(None), StudentRoomBooking.status != 'cancelled')
+
+
+class BookingError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def parse_booking_dates(data, default_start=None):
+    try:
+        start = data.get('start_date')
+        start_date = datetime.strptime(start, '%Y-%m-%d') if start else default_start
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d') if data.get('end_date') else None
+    except (TypeError, ValueError):
+        raise BookingError('Invalid date format. Use YYYY-MM-DD')
+
+    if not start_date or not end_date:
+        raise BookingError('start_date and end_date are required')
+    if end_date <= start_date:
+        raise BookingError('end_date must be after start_date')
+    return start_date, end_date
+
+
+def find_overlapping_booking(student_id, start_date, end_date):
+    # Served by ix_student_room_bookings_student_dates
+    return StudentRoomBooking.query.filter(
+        StudentRoomBooking.student_id == student_id,
+        StudentRoomBooking.status != 'cancelled',
+        StudentRoomBooking.start_date < end_date,
+        StudentRoomBooking.end_date > start_date
+    ).first()
+
+
+def _lock_row(model, row_id):
+    """Hold one row until the caller's transaction ends; False if it does not exist.
+
+    SQLite ignores FOR UPDATE, so there a no-op UPDATE takes the database
+    write lock instead, which serialises the same way.
+    """
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return db.session.execute(
+            update(model)
+            .where(model.id == row_id)
+            .values(id=model.id)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+    return db.session.execute(select(model.id).where(model.id == row_id).with_for_update()).first() is not None
+
+
+def lock_student(student_id):
+    if not _lock_row(StudentProfile, student_id):
+        raise BookingError('Student not found', 404)
+
+
+def count_room_bookings(room_id, start_date, end_date):
+    """Beds of the room held by bookings overlapping [start_date, end_date)"""
+    # Served by ix_student_room_bookings_room_dates
+    return db.session.execute(
+        select(func.count(StudentRoomBooking.id)).where(
+            StudentRoomBooking.room_id == room_id,
+            _holds_bed,
+            StudentRoomBooking.start_date < end_date,
+            StudentRoomBooking.end_date > start_date
+        )
+    ).scalar()
+
+
+def refresh_room_occupancy(room_id, now=None):
+    """Recompute current_occupants (and occupied/available) from the bookings covering now.
+
+    current_occupants is only a derived, current-date view for listings; the
+    engine itself checks capacity against the requested dates.
+    """
+    now = now or datetime.utcnow()
+    current = select(func.count(StudentRoomBooking.id)).where(
+        StudentRoomBooking.room_id == room_id,
+        _holds_bed,
+        StudentRoomBooking.start_date <= now,
+        StudentRoomBooking.end_date > now
+    ).scalar_subquery()
+    db.session.execute(
+        update(Room)
+        .where(Room.id == room_id)
+        .values(
+            current_occupants=current,
+            status=case(
+                (func.lower(Room.status).in_(_BOOKABLE_STATUSES),
+                 case((current >= _capacity, 'occupied'), else_='available')),
+                else_=Room.status
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def book_room(student_id, room_id, start_date, end_date):
+    """Claim a bed for [start_date, end_date) and record the booking in the caller's transaction.
+
+    Capacity is checked against the room's bookings that overlap the requested
+    dates, so a room full this term still takes bookings for the next one.
+    The student's row is locked before the overlap check and the room's row
+    before the capacity count, so concurrent requests can neither double-book
+    a student nor both take a room's last bed for the same dates. The caller
+    commits (or rolls back on BookingError).
+    """
+    lock_student(student_id)
+    if find_overlapping_booking(student_id, start_date, end_date):
+        raise BookingError('Student already has a booking for these dates', 409)
+
+    if not _lock_row(Room, room_id):
+        raise BookingError('Room not found', 404)
+    status, capacity = db.session.execute(
+        select(func.lower(Room.status), _capacity).where(Room.id == room_id)
+    ).one()
+    if status not in _BOOKABLE_STATUSES or count_room_bookings(room_id, start_date, end_date) >= (capacity or 0):
+        raise BookingError('Room is not available')
+
+    booking = StudentRoomBooking(
+        student_id=student_id,
+        room_id=room_id,
+        start_date=start_date,
+        end_date=end_date,
+        status='confirmed'
+    )
+    db.session.add(booking)
+    db.session.flush()
+    refresh_room_occupancy(room_id)
+    record_booking(booking)
+    return booking
+
+
+def cancel_booking(booking_id):
+    """Cancel a booking and give its bed back, at most once per booking"""
+    booking = db.session.get(StudentRoomBooking, booking_id)
+    if booking is None:
+        raise BookingError('Booking not found', 404)
+
+    cancelled = db.session.execute(
+        update(StudentRoomBooking)
+        .where(StudentRoomBooking.id == booking_id, StudentRoomBooking.status != 'cancelled')
+        .values(status='cancelled')
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if cancelled != 1:
+        raise BookingError('Booking is already cancelled')
+
+    refresh_room_occupancy(booking.room_id)
+    db.session.refresh(booking)
+    record_cancellation(booking)
+    return booking
@@ -0,0 +1,50 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from models import db
+
+# Keeps IN (...) lists under the bound-parameter limits of SQLite and psycopg2
+IN_CLAUSE_CHUNK = 500
+
+
+def chunked(values, size=IN_CLAUSE_CHUNK):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def existing_values(column, values):
+    """Return the subset of `values` present in `column`, one IN query per chunk"""
+    found = set()
+    for chunk in chunked(set(values)):
+        found.update(value for (value,) in db.session.query(column).filter(column.in_(chunk)))
+    return found
+
+
+def ensure_rows(model, key_columns, keys, defaults, attempts=3):
+    """Insert `model` rows for any of `keys` (tuples over `key_columns`) not yet present.
+
+    Runs in a savepoint, so losing a race to another writer only retries the
+    lookup instead of rolling back the caller's transaction.
+    """
+    first, *rest = (getattr(model, name) for name in key_columns)
+    keys = set(keys)
+    for _ in range(attempts):
+        existing = set()
+        for chunk in chunked({key[0] for key in keys}):
+            query = db.session.query(first, *rest).filter(first.in_(chunk))
+            for position, column in enumerate(rest, start=1):
+                query = query.filter(column.in_({key[position] for key in keys}))
+            existing.update(tuple(row) for row in query)
+        missing = keys - existing
+        if not missing:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(model), [
+                    {**defaults, **dict(zip(key_columns, key))} for key in missing
+                ])
+            return
+        except IntegrityError:
+            continue
+    raise RuntimeError(f'Could not create {model.__tablename__} rows')
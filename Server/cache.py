@@ -0,0 +1,235 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from flask import Response, current_app, request
+
+# -------------------- Backends --------------------
+#
+# Entries are (status, mimetype, body) tuples. Invalidation is by tag version:
+# every cache key embeds the current version of each of its tags, so bumping a
+# tag orphans the old entries and they simply age out. That works the same for
+# a per-process dict and for a store shared between gunicorn workers.
+
+
+class LRUBackend:
+    """Per-process store with TTL expiry and least-recently-used eviction"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._tags = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def tag_versions(self, tags):
+        return [self._tags[tag] for tag in tags]
+
+    def bump_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Store shared by every worker on the host through a local SQLite file"""
+
+    PURGE_EVERY = 500  # sets between sweeps of expired rows
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_entries '
+                     '(key TEXT PRIMARY KEY, expires_at REAL, status INTEGER, mimetype TEXT, body BLOB)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            'SELECT status, mimetype, body FROM cache_entries WHERE key = ? AND expires_at >= ?',
+            (key, time.time())
+        ).fetchone()
+        return (row[0], row[1], bytes(row[2])) if row else None
+
+    def set(self, key, value, ttl):
+        status, mimetype, body = value
+        conn = self._conn()
+        conn.execute('INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)',
+                     (key, time.time() + ttl, status, mimetype, body))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),))
+            conn.execute('DELETE FROM cache_entries WHERE key IN '
+                         '(SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+                         (self.max_entries,))
+
+    def delete(self, key):
+        self._conn().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def tag_versions(self, tags):
+        rows = dict(self._conn().execute(
+            f"SELECT tag, version FROM cache_tags WHERE tag IN ({','.join('?' * len(tags))})", tuple(tags)
+        ).fetchall())
+        return [rows.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags):
+        conn = self._conn()
+        for tag in tags:
+            conn.execute('INSERT INTO cache_tags (tag, version) VALUES (?, 1) '
+                         'ON CONFLICT(tag) DO UPDATE SET version = version + 1', (tag,))
+
+    def clear(self):
+        self._conn().execute('DELETE FROM cache_entries')
+
+    def __len__(self):
+        return self._conn().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def tag_versions(self, tags):
+        return [0] * len(tags)
+
+    def bump_tags(self, tags):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+# -------------------- Response Cache --------------------
+
+class ResponseCache:
+    """Caches successful GET responses of decorated views, grouped by tags.
+
+    Configured from the app:
+        RESPONSE_CACHE_BACKEND      'memory' (default), 'sqlite:///path/to/file.db' or 'none'
+        RESPONSE_CACHE_DEFAULT_TTL  seconds, default 300
+        RESPONSE_CACHE_MAX_ENTRIES  default 1024
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        self.default_ttl = 300
+        self._counters = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.setdefault('RESPONSE_CACHE_BACKEND', os.environ.get('RESPONSE_CACHE_BACKEND', 'memory'))
+        self.default_ttl = app.config.setdefault('RESPONSE_CACHE_DEFAULT_TTL', int(os.environ.get('RESPONSE_CACHE_DEFAULT_TTL', 300)))
+        max_entries = app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)))
+
+        if backend == 'memory':
+            self.backend = LRUBackend(max_entries)
+        elif backend.startswith('sqlite:///'):
+            self.backend = SQLiteBackend(backend[len('sqlite:///'):], max_entries)
+        elif backend == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+        app.extensions['response_cache'] = self
+
+    def cached(self, tags, ttl=None):
+        """Cache 200 responses to GET requests; other methods pass straight through"""
+        tags = tuple(sorted(tags))
+
+        def wrapper(fn):
+            @wraps(fn)
+            def decorator(*args, **kwargs):
+                if request.method != 'GET':
+                    return fn(*args, **kwargs)
+
+                versions = '.'.join(str(v) for v in self.backend.tag_versions(tags))
+                query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+                key = f'{request.path}?{query}|{versions}'
+                counters = self._counters[request.endpoint]
+
+                entry = self.backend.get(key)
+                if entry is not None:
+                    counters['hits'] += 1
+                    status, mimetype, body = entry
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                counters['misses'] += 1
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.backend.set(key, (response.status_code, response.mimetype, response.get_data()), ttl or self.default_ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return decorator
+        return wrapper
+
+    def invalidate(self, *tags):
+        self.backend.bump_tags(tags)
+
+    def stats(self):
+        counters = {endpoint: dict(values) for endpoint, values in self._counters.items()}
+        hits = sum(c['hits'] for c in counters.values())
+        misses = sum(c['misses'] for c in counters.values())
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'endpoints': counters
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,64 @@
+import hashlib
+import threading
+
+from flask import json
+
+from models import db, Course
+from cache import LRUBackend
+
+# Writes in other workers only bump their own generation; this bounds how long
+# a worker can keep serving a catalogue it did not see change.
+CATALOGUE_TTL = 60
+# Slices are keyed by raw query values, so the least recently used are evicted
+# rather than letting arbitrary ?program= values grow the cache.
+CATALOGUE_MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_generation = 0
+_entries = LRUBackend(CATALOGUE_MAX_ENTRIES)  # (semester_id, program) -> (generation, body, etag)
+
+
+def bump_catalogue_generation():
+    """Call after any committed write that changes what GET /api/courses returns"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+def _build(semester_id, program):
+    query = db.session.query(
+        Course.id, Course.code, Course.title, Course.description, Course.semester_id, Course.program
+    )
+    if semester_id:
+        query = query.filter(Course.semester_id == semester_id)
+    if program:
+        query = query.filter(Course.program == program)
+
+    body = json.dumps([{
+        'id': c.id,
+        'code': c.code,
+        'title': c.title,
+        'description': c.description,
+        'semester_id': c.semester_id,
+        'program': c.program
+    } for c in query.order_by(Course.id)])
+    # Content hash rather than the generation, so every worker agrees on the tag
+    etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+    return body, etag
+
+
+def get_catalogue(semester_id=None, program=None):
+    """Return (json_body, etag) for one catalogue slice, building it at most once per generation"""
+    key = (semester_id, program)
+    entry = _entries.get(key)
+    if entry and entry[0] == _generation:
+        return entry[1], entry[2]
+
+    generation = _generation
+    body, etag = _build(semester_id, program)
+    with _lock:
+        # Skip storing if a write landed while we were reading
+        if generation == _generation:
+            _entries.set(key, (generation, body, etag), CATALOGUE_TTL)
+    return body, etag
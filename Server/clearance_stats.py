@@ -0,0 +1,92 @@
+import threading
+import time
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from models import db, FeeClearance
+
+CLEARANCE_STATUSES = ('cleared', 'pending', 'flagged')
+
+# Commits in other workers never reach our after_commit hook; this bounds how
+# stale their view of the dashboard numbers can get.
+CLEARANCE_STATS_TTL = 30
+
+_lock = threading.Lock()
+_generation = 0
+_snapshots = {}  # by_program -> (generation, built_at, stats)
+
+
+def clearance_stats(*criteria, by_program=False):
+    """Status counts and amount due for the matching clearances, in one grouped query.
+
+    The model defaults status to 'Pending' while the admin routes write
+    lowercase values, so statuses are compared case-insensitively.
+    """
+    status = func.lower(FeeClearance.status)
+    columns = [
+        func.count(FeeClearance.id).label('total'),
+        *(func.count(FeeClearance.id).filter(status == name).label(name) for name in CLEARANCE_STATUSES),
+        func.coalesce(func.sum(FeeClearance.amount_due), 0.0).label('total_amount_due'),
+    ]
+    query = db.session.query(FeeClearance.program, *columns) if by_program else db.session.query(*columns)
+    if criteria:
+        query = query.filter(*criteria)
+    if by_program:
+        query = query.group_by(FeeClearance.program).order_by(FeeClearance.program)
+
+    def counts(row):
+        return {
+            'total': row.total,
+            **{name: getattr(row, name) for name in CLEARANCE_STATUSES},
+            'total_amount_due': float(row.total_amount_due)
+        }
+
+    if not by_program:
+        return counts(query.one())
+
+    programs = [{'program': row.program, **counts(row)} for row in query]
+    stats = {key: sum(p[key] for p in programs) for key in ('total', *CLEARANCE_STATUSES, 'total_amount_due')}
+    stats['programs'] = programs
+    return stats
+
+
+def get_clearance_snapshot(by_program=False):
+    """Cached unfiltered stats, rebuilt after any committed clearance write"""
+    entry = _snapshots.get(by_program)
+    if entry and entry[0] == _generation and time.monotonic() - entry[1] < CLEARANCE_STATS_TTL:
+        return entry[2]
+
+    generation = _generation
+    stats = clearance_stats(by_program=by_program)
+    with _lock:
+        # Skip storing if a write committed while we were reading
+        if generation == _generation:
+            _snapshots[by_program] = (generation, time.monotonic(), stats)
+    return stats
+
+
+def invalidate_clearance_stats():
+    global _generation
+    with _lock:
+        _generation += 1
+        _snapshots.clear()
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_clearance_writes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, FeeClearance):
+            session.info['clearance_stats_stale'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop('clearance_stats_stale', False):
+        invalidate_clearance_stats()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('clearance_stats_stale', None)
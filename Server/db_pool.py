@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+# SQLAlchemy's own defaults, except recycle: hosted Postgres and proxies drop
+# idle connections, so connections are replaced after half an hour.
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_monitor.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_monitor.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def engine_options(uri, env=os.environ):
+    """SQLALCHEMY_ENGINE_OPTIONS built from DB_* environment variables
+
+        DB_POOL_SIZE            connections kept open per process
+        DB_MAX_OVERFLOW         extra connections allowed under burst, closed when returned
+        DB_POOL_TIMEOUT         seconds a request waits for a free connection before failing
+        DB_POOL_RECYCLE         seconds after which a connection is replaced (-1 never)
+        DB_POOL_PRE_PING        '0' disables the liveness check on checkout
+        DB_STATEMENT_TIMEOUT_MS server-side statement timeout (PostgreSQL only, 0 off)
+
+    Every gunicorn worker has its own pool, so the database sees up to
+    workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections; keep that under
+    its max_connections. SQLite keeps its default pool and only takes the
+    pre-ping and recycle settings.
+    """
+    options = {
+        'pool_pre_ping': env.get('DB_POOL_PRE_PING', '1') != '0',
+        'pool_recycle': int(env.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)),
+    }
+    if uri.startswith('sqlite'):
+        return options
+
+    options.update({
+        'poolclass': MeteredQueuePool,
+        'pool_size': int(env.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE)),
+        'max_overflow': int(env.get('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW)),
+        'pool_timeout': float(env.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)),
+    })
+    statement_timeout = int(env.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    if statement_timeout and uri.startswith('postgres'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
+class PoolMonitor:
+    """Engine configuration from the environment plus per-process pool metrics.
+
+    init_app must run before db.init_app, which builds the engine from
+    SQLALCHEMY_ENGINE_OPTIONS. Counters cover every pool in this process;
+    seed.py and the CLI commands go through the app's engine, so normally
+    there is just the one.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._stats = {'checkouts': 0, 'checked_out': 0, 'peak_checked_out': 0, 'connects': 0,
+                       'invalidated': 0, 'waits': 0, 'wait_timeouts': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+        app.extensions['pool_monitor'] = self
+
+    def _count(self, key, delta=1):
+        with self._lock:
+            self._stats[key] += delta
+            if key == 'checked_out':
+                self._stats['peak_checked_out'] = max(self._stats['peak_checked_out'], self._stats['checked_out'])
+
+    def record_wait(self, seconds, timed_out=False):
+        wait_ms = seconds * 1000
+        with self._lock:
+            self._stats['waits'] += 1
+            self._stats['wait_timeouts'] += timed_out
+            self._stats['total_wait_ms'] += wait_ms
+            self._stats['max_wait_ms'] = max(self._stats['max_wait_ms'], wait_ms)
+
+    def stats(self, engine):
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            # NullPool, StaticPool and friends hold no occupancy worth reporting
+            return {'pool': type(pool).__name__}
+
+        with self._lock:
+            stats = dict(self._stats)
+        total_wait_ms = stats.pop('total_wait_ms')
+        stats['avg_wait_ms'] = round(total_wait_ms / stats['waits'], 3) if stats['waits'] else None
+        stats['max_wait_ms'] = round(stats['max_wait_ms'], 3)
+        stats.update({
+            'pid': os.getpid(),
+            'pool': type(pool).__name__,
+            'pool_size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            # QueuePool counts from -pool_size until the pool first fills up
+            'overflow': max(pool.overflow(), 0),
+        })
+        return stats
+
+
+pool_monitor = PoolMonitor()
+
+
+@event.listens_for(Pool, 'connect')
+def _on_connect(dbapi_connection, connection_record):
+    pool_monitor._count('connects')
+
+
+@event.listens_for(Pool, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_monitor._count('checkouts')
+    pool_monitor._count('checked_out')
+
+
+@event.listens_for(Pool, 'checkin')
+def _on_checkin(dbapi_connection, connection_record):
+    pool_monitor._count('checked_out', -1)
+
+
+@event.listens_for(Pool, 'invalidate')
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    # Stale connections caught by pre-ping or dropped mid-query
+    pool_monitor._count('invalidated')
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+from flask import Response, request, stream_with_context
+
+# Rows fetched per round trip while streaming; on Postgres this becomes a
+# server-side cursor so only one batch is held in memory at a time.
+STREAM_BATCH_SIZE = 1000
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def stream_requested():
+    """True when the caller asked for ?format=ndjson|csv&stream=1"""
+    return (
+        request.args.get('format') in STREAM_FORMATS
+        and request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+    )
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, separators=(',', ':'), default=str) + '\n'
+
+
+def _drain(buffer):
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return value
+
+
+def _csv_lines(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    # Header first, so an empty result is still a valid CSV file
+    writer.writeheader()
+    yield _drain(buffer)
+    for row in rows:
+        writer.writerow(row)
+        yield _drain(buffer)
+
+
+def stream_query(query, serialize, filename, fields):
+    """Stream a query as NDJSON or CSV without materialising the result set.
+
+    `serialize` turns one ORM row into a flat dict whose keys are `fields`,
+    which also make the CSV header. Relationships it touches should be
+    eager-loaded on `query` or every batch turns into N+1 lookups.
+    """
+    fmt = request.args.get('format')
+    rows = (serialize(item) for item in query.yield_per(STREAM_BATCH_SIZE))
+    lines = _ndjson_lines(rows) if fmt == 'ndjson' else _csv_lines(rows, fields)
+
+    response = Response(stream_with_context(lines), mimetype=STREAM_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{fmt}'
+    return response
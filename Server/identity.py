@@ -0,0 +1,55 @@
+from collections import namedtuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, User
+from cache import LRUBackend
+
+# Role changes and deletions committed by this worker evict immediately; other
+# gunicorn workers pick them up once their entry expires.
+IDENTITY_CACHE_TTL = 60
+IDENTITY_CACHE_MAX_ENTRIES = 10000
+
+CachedIdentity = namedtuple('CachedIdentity', ('id', 'role'))
+
+_identities = LRUBackend(IDENTITY_CACHE_MAX_ENTRIES)
+
+
+def get_identity(user_id):
+    """(id, role) for a JWT identity, from the cache or one narrow query; None if no such user"""
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    identity = _identities.get(user_id)
+    if identity is None:
+        row = db.session.query(User.id, User.role).filter(User.id == user_id).first()
+        if row is None:
+            return None  # not cached, so a user created later is seen immediately
+        identity = CachedIdentity(row.id, row.role)
+        _identities.set(user_id, identity, IDENTITY_CACHE_TTL)
+    return identity
+
+
+def invalidate_identity(*user_ids):
+    for user_id in user_ids:
+        _identities.delete(user_id)
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_user_writes(session, flush_context):
+    changed = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault('identity_stale', set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    invalidate_identity(*session.info.pop('identity_stale', ()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('identity_stale', None)
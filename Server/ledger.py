@@ -0,0 +1,211 @@
+from collections import defaultdict
+
+from sqlalchemy import and_, bindparam, func, select, tuple_, update
+
+from models import db, FeeBalance, FeeStructure, Payment, Semester
+from bulk import chunked, ensure_rows
+
+# A student is billed a fee structure's amount once, from their first payment
+# against it; every payment then counts towards amount_paid. Balances are
+# kept per (student, semester of the fee structure).
+
+BALANCE_KEY = ('student_id', 'semester_id')
+
+# Float columns: anything closer than this is treated as equal when verifying
+LEDGER_TOLERANCE = 0.005
+
+
+def record_payment_changes(changes):
+    """Fold payment inserts (+1) / deletes (-1) into fee_balances, in the caller's transaction.
+
+    `changes` is an iterable of (student_id, fee_structure_id, amount_paid, sign).
+    Call it *before* the payments themselves are added or deleted: whether a
+    fee structure is newly billed (or no longer billed) depends on the
+    payments the student already has against it.
+    """
+    pairs = defaultdict(lambda: [0, 0.0])
+    for student_id, fee_structure_id, amount_paid, sign in changes:
+        pair = pairs[(student_id, fee_structure_id)]
+        pair[0] += sign
+        pair[1] += sign * float(amount_paid)
+    if not pairs:
+        return
+
+    fee_structures = dict(
+        (fs_id, (semester_id, amount)) for fs_id, semester_id, amount in db.session.query(
+            FeeStructure.id, FeeStructure.semester_id, FeeStructure.amount
+        ).filter(FeeStructure.id.in_({fs_id for _, fs_id in pairs}))
+    )
+    keys = {(student_id, fee_structures[fs_id][0]) for student_id, fs_id in pairs}
+    ensure_rows(FeeBalance, BALANCE_KEY, keys, {'amount_billed': 0.0, 'amount_paid': 0.0})
+    # Serialise writers per balance row so two "first payments" cannot both bill
+    _lock_balances(keys)
+
+    existing = _payment_counts(pairs.keys())
+    deltas = defaultdict(lambda: [0.0, 0.0])
+    for (student_id, fs_id), (count, paid) in pairs.items():
+        semester_id, amount = fee_structures[fs_id]
+        before = existing.get((student_id, fs_id), 0)
+        billed = (before + count > 0) - (before > 0)
+        delta = deltas[(student_id, semester_id)]
+        delta[0] += billed * amount
+        delta[1] += paid
+    _apply(deltas)
+
+
+def record_fee_structure_change(fee_structure_id, old_semester_id, old_amount, new_semester_id, new_amount):
+    """Re-bill every student paying against a fee structure whose amount or semester changed"""
+    if old_semester_id == new_semester_id and old_amount == new_amount:
+        return
+    paid_by_student = db.session.query(Payment.student_id, func.sum(Payment.amount_paid)) \
+        .filter(Payment.fee_structure_id == fee_structure_id) \
+        .group_by(Payment.student_id).all()
+    if not paid_by_student:
+        return
+
+    deltas = defaultdict(lambda: [0.0, 0.0])
+    for student_id, paid in paid_by_student:
+        old, new = deltas[(student_id, old_semester_id)], deltas[(student_id, new_semester_id)]
+        old[0] -= old_amount
+        old[1] -= paid
+        new[0] += new_amount
+        new[1] += paid
+    ensure_rows(FeeBalance, BALANCE_KEY, deltas.keys(), {'amount_billed': 0.0, 'amount_paid': 0.0})
+    _lock_balances(deltas.keys())
+    _apply(deltas)
+
+
+def _lock_balances(keys):
+    # Sorted so concurrent writers take row locks in the same order (no-op on SQLite)
+    for chunk in chunked(sorted(keys)):
+        db.session.query(FeeBalance.id).filter(
+            tuple_(FeeBalance.student_id, FeeBalance.semester_id).in_(chunk)
+        ).order_by(FeeBalance.student_id, FeeBalance.semester_id).with_for_update().all()
+
+
+def _payment_counts(pairs):
+    counts = {}
+    for chunk in chunked(pairs):
+        counts.update(
+            ((student_id, fs_id), count) for student_id, fs_id, count in db.session.query(
+                Payment.student_id, Payment.fee_structure_id, func.count(Payment.id)
+            ).filter(
+                tuple_(Payment.student_id, Payment.fee_structure_id).in_(chunk)
+            ).group_by(Payment.student_id, Payment.fee_structure_id)
+        )
+    return counts
+
+
+def _apply(deltas):
+    table = FeeBalance.__table__
+    rows = [
+        {'b_student_id': s, 'b_semester_id': m, 'b_billed': billed, 'b_paid': paid}
+        for (s, m), (billed, paid) in deltas.items() if billed or paid
+    ]
+    if rows:
+        db.session.execute(
+            update(table)
+            .where(and_(
+                table.c.student_id == bindparam('b_student_id'),
+                table.c.semester_id == bindparam('b_semester_id')
+            ))
+            .values(
+                amount_billed=table.c.amount_billed + bindparam('b_billed'),
+                amount_paid=table.c.amount_paid + bindparam('b_paid')
+            ),
+            rows
+        )
+
+
+def expected_balances():
+    """{(student_id, semester_id): (billed, paid)} recomputed from the payment history"""
+    billed_pairs = select(Payment.student_id, Payment.fee_structure_id).distinct().subquery()
+    billed = db.session.query(
+        billed_pairs.c.student_id, FeeStructure.semester_id, func.sum(FeeStructure.amount)
+    ).join(FeeStructure, FeeStructure.id == billed_pairs.c.fee_structure_id) \
+     .group_by(billed_pairs.c.student_id, FeeStructure.semester_id)
+    paid = db.session.query(
+        Payment.student_id, FeeStructure.semester_id, func.sum(Payment.amount_paid)
+    ).join(FeeStructure, FeeStructure.id == Payment.fee_structure_id) \
+     .group_by(Payment.student_id, FeeStructure.semester_id)
+
+    expected = defaultdict(lambda: [0.0, 0.0])
+    for student_id, semester_id, amount in billed:
+        expected[(student_id, semester_id)][0] = float(amount)
+    for student_id, semester_id, amount in paid:
+        expected[(student_id, semester_id)][1] = float(amount)
+    return {key: tuple(values) for key, values in expected.items()}
+
+
+def verify_fee_balances(repair=False):
+    """Compare fee_balances with a full recompute; optionally rewrite the rows that drifted"""
+    expected = expected_balances()
+    stored = {
+        (row.student_id, row.semester_id): (row.amount_billed, row.amount_paid)
+        for row in db.session.query(
+            FeeBalance.student_id, FeeBalance.semester_id, FeeBalance.amount_billed, FeeBalance.amount_paid
+        )
+    }
+
+    drifted = []
+    for key in expected.keys() | stored.keys():
+        want = expected.get(key, (0.0, 0.0))
+        have = stored.get(key, (0.0, 0.0))
+        if any(abs(w - h) > LEDGER_TOLERANCE for w, h in zip(want, have)):
+            drifted.append((key, want, have))
+
+    if repair and drifted:
+        keys = [key for key, _, _ in drifted]
+        ensure_rows(FeeBalance, BALANCE_KEY, keys, {'amount_billed': 0.0, 'amount_paid': 0.0})
+        _lock_balances(keys)
+        table = FeeBalance.__table__
+        db.session.execute(
+            update(table)
+            .where(and_(
+                table.c.student_id == bindparam('b_student_id'),
+                table.c.semester_id == bindparam('b_semester_id')
+            ))
+            .values(amount_billed=bindparam('b_billed'), amount_paid=bindparam('b_paid')),
+            [
+                {'b_student_id': s, 'b_semester_id': m, 'b_billed': billed, 'b_paid': paid}
+                for (s, m), (billed, paid), _ in drifted
+            ]
+        )
+
+    return {
+        'checked': len(expected.keys() | stored.keys()),
+        'drifted': len(drifted),
+        'repaired': len(drifted) if repair else 0,
+        'sample': [{
+            'student_id': s,
+            'semester_id': m,
+            'expected': {'billed': round(want[0], 2), 'paid': round(want[1], 2)},
+            'stored': {'billed': round(have[0], 2), 'paid': round(have[1], 2)}
+        } for (s, m), want, have in sorted(drifted)[:20]]
+    }
+
+
+def get_balance(student_id):
+    """Per-semester and total balance for one student, read from fee_balances"""
+    rows = db.session.query(
+        FeeBalance.semester_id, Semester.name, FeeBalance.amount_billed, FeeBalance.amount_paid
+    ).join(Semester, FeeBalance.semester_id == Semester.id) \
+     .filter(FeeBalance.student_id == student_id) \
+     .order_by(Semester.start_date).all()
+
+    billed = sum(row.amount_billed for row in rows)
+    paid = sum(row.amount_paid for row in rows)
+    return {
+        'student_id': student_id,
+        'semesters': [{
+            'semester_id': row.semester_id,
+            'semester_name': row.name,
+            'amount_billed': round(row.amount_billed, 2),
+            'amount_paid': round(row.amount_paid, 2),
+            'balance': round(row.amount_billed - row.amount_paid, 2)
+        } for row in rows],
+        'amount_billed': round(billed, 2),
+        'amount_paid': round(paid, 2),
+        'balance': round(billed - paid, 2),
+        'cleared': billed - paid <= LEDGER_TOLERANCE
+    }
@@ -0,0 +1,95 @@
+"""backlog schema
+
+Columns, tables and constraints added since the baseline: course capacity,
+booking status, the GPA summary and fee balance tables, payment references,
+the unit registration unique key and the keyset / overlap indexes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 17:52:36.642406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('gpa_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('semester_id', sa.Integer(), nullable=False),
+    sa.Column('course_count', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Float(), nullable=False),
+    sa.Column('updated_on', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['semester_id'], ['semesters.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'semester_id', name='uq_gpa_summary_student_semester')
+    )
+    op.create_table('fee_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('semester_id', sa.Integer(), nullable=False),
+    sa.Column('amount_billed', sa.Float(), nullable=False),
+    sa.Column('amount_paid', sa.Float(), nullable=False),
+    sa.Column('updated_on', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['semester_id'], ['semesters.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'semester_id', name='uq_fee_balance_student_semester')
+    )
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('capacity', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('grade', schema=None) as batch_op:
+        batch_op.create_index('ix_grade_date_posted_id', ['date_posted', 'id'], unique=False)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('transaction_ref', sa.String(length=100), nullable=True))
+        batch_op.create_index('ix_payments_student_fee_structure', ['student_id', 'fee_structure_id'], unique=False)
+        batch_op.create_unique_constraint('uq_payments_transaction_ref', ['transaction_ref'])
+
+    # Existing bookings are live ones; overlap checks filter on status != 'cancelled', which skips NULLs
+    with op.batch_alter_table('student_room_bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=50), nullable=True, server_default='confirmed'))
+        batch_op.create_index('ix_student_room_bookings_room_dates', ['room_id', 'start_date', 'end_date'], unique=False)
+        batch_op.create_index('ix_student_room_bookings_student_dates', ['student_id', 'start_date', 'end_date'], unique=False)
+
+    # Keep the earliest of any duplicate registrations so the unique key can be built
+    op.execute(
+        'DELETE FROM unit_registrations WHERE id NOT IN ('
+        'SELECT MIN(id) FROM unit_registrations GROUP BY student_id, course_id, semester_id)'
+    )
+    with op.batch_alter_table('unit_registrations', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_unit_registration_student_course_semester', ['student_id', 'course_id', 'semester_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('unit_registrations', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_unit_registration_student_course_semester', type_='unique')
+
+    with op.batch_alter_table('student_room_bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_student_room_bookings_student_dates')
+        batch_op.drop_index('ix_student_room_bookings_room_dates')
+        batch_op.drop_column('status')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_payments_transaction_ref', type_='unique')
+        batch_op.drop_index('ix_payments_student_fee_structure')
+        batch_op.drop_column('transaction_ref')
+
+    with op.batch_alter_table('grade', schema=None) as batch_op:
+        batch_op.drop_index('ix_grade_date_posted_id')
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('capacity')
+
+    op.drop_table('fee_balances')
+    op.drop_table('gpa_summaries')
@@ -0,0 +1,75 @@
+"""hot lookup indexes
+
+Indexes for the filters the API runs on every request path: grades by
+student / course / semester, courses by code and by semester + program,
+clearances by student, registrations by status, and the profile user_id
+foreign keys the user listings join on. Payments by student are already
+served by ix_payments_student_fee_structure.
+
+Grades get a unique (student, course, semester) key, which also serves the
+by-student lookups. Duplicate grades are removed first, keeping the earliest;
+if any were, run `flask rebuild-gpa-summaries` afterwards.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 18:05:12.113942
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.create_index('ix_courses_code', ['code'], unique=False)
+        batch_op.create_index('ix_courses_semester_program', ['semester_id', 'program'], unique=False)
+
+    with op.batch_alter_table('fee_clearances', schema=None) as batch_op:
+        batch_op.create_index('ix_fee_clearances_student_id', ['student_id'], unique=False)
+
+    # Keep the earliest of any duplicate grades so the unique key can be built
+    op.execute(
+        'DELETE FROM grade WHERE id NOT IN ('
+        'SELECT MIN(id) FROM grade GROUP BY student_id, course_id, semester_id)'
+    )
+    with op.batch_alter_table('grade', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_grade_student_course_semester', ['student_id', 'course_id', 'semester_id'])
+        batch_op.create_index('ix_grade_course_semester', ['course_id', 'semester_id'], unique=False)
+
+    with op.batch_alter_table('lecturer_profiles', schema=None) as batch_op:
+        batch_op.create_index('ix_lecturer_profiles_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('registration', schema=None) as batch_op:
+        batch_op.create_index('ix_registration_status', ['status'], unique=False)
+
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.create_index('ix_student_profiles_user_id', ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('student_profiles', schema=None) as batch_op:
+        batch_op.drop_index('ix_student_profiles_user_id')
+
+    with op.batch_alter_table('registration', schema=None) as batch_op:
+        batch_op.drop_index('ix_registration_status')
+
+    with op.batch_alter_table('lecturer_profiles', schema=None) as batch_op:
+        batch_op.drop_index('ix_lecturer_profiles_user_id')
+
+    with op.batch_alter_table('grade', schema=None) as batch_op:
+        batch_op.drop_index('ix_grade_course_semester')
+        batch_op.drop_constraint('uq_grade_student_course_semester', type_='unique')
+
+    with op.batch_alter_table('fee_clearances', schema=None) as batch_op:
+        batch_op.drop_index('ix_fee_clearances_student_id')
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index('ix_courses_semester_program')
+        batch_op.drop_index('ix_courses_code')
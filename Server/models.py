@@ -1,7 +1,9 @@
 
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from functools import lru_cache
+from serializers import serialize
+from passwords import password_hasher
 db = SQLAlchemy()
 
 # -------------------- Course Prerequisite Table --------------------
@@ -46,33 +48,30 @@ class User(db.Model):
     serialize_rules = ('id', 'name', 'email', 'role')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
     def to_dict(self, rules=()):
-        # Handle exclusion rules (fields prefixed with '-')
-        exclude_fields = {rule[1:] for rule in rules if rule.startswith('-')}
-        include_fields = {rule for rule in rules if not rule.startswith('-')}
+        # Every column except '-field' exclusions, plus explicitly included profiles
+        return serialize(self, _user_fields(tuple(rules)))
 
-        # Build the dictionary
-        user_dict = {}
-        for field in self.__table__.columns.keys():
-            if field not in exclude_fields:
-                user_dict[field] = getattr(self, field)
 
-        # Add relationships if explicitly included
-        if 'student_profile' in include_fields and hasattr(self, 'student_profile'):
-            user_dict['student_profile'] = self.student_profile.to_dict() if self.student_profile else None
-        if 'lecturer_profile' in include_fields and hasattr(self, 'lecturer_profile'):
-            user_dict['lecturer_profile'] = self.lecturer_profile.to_dict() if self.lecturer_profile else None
-
-        return user_dict
+@lru_cache(maxsize=None)
+def _user_fields(rules):
+    exclude_fields = {rule[1:] for rule in rules if rule.startswith('-')}
+    include_fields = {rule for rule in rules if not rule.startswith('-')}
+    fields = [field for field in User.__table__.columns.keys() if field not in exclude_fields]
+    fields += [field for field in ('student_profile', 'lecturer_profile') if field in include_fields]
+    return tuple(fields)
 
 # -------------------- StudentProfile Model --------------------
 
 class StudentProfile(db.Model):
     __tablename__ = 'student_profiles'
+    __table_args__ = (
+        db.Index('ix_student_profiles_user_id', 'user_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name= db.Column(db.String(100))
@@ -92,14 +91,16 @@ class StudentProfile(db.Model):
     serialize_rules = ('id', 'reg_no', 'program', 'year_of_study', 'phone')
 
     def to_dict(self, rules=()):
-        rules = rules or self.serialize_rules
-        return {field: getattr(self, field) for field in rules}
+        return serialize(self, rules)
 
 
 # -------------------- LecturerProfile Model --------------------
 
 class LecturerProfile(db.Model):
     __tablename__ = 'lecturer_profiles'
+    __table_args__ = (
+        db.Index('ix_lecturer_profiles_user_id', 'user_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -113,13 +114,16 @@ class LecturerProfile(db.Model):
     serialize_rules = ('id', 'staff_no', 'department', 'phone')
 
     def to_dict(self, rules=()):
-        rules = rules or self.serialize_rules
-        return {field: getattr(self, field) for field in rules}
+        return serialize(self, rules)
 
 # -------------------- Course Model --------------------
 
 class Course(db.Model):
     __tablename__ = 'courses'
+    __table_args__ = (
+        db.Index('ix_courses_code', 'code'),
+        db.Index('ix_courses_semester_program', 'semester_id', 'program'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     code = db.Column(db.String(10), nullable=False)
@@ -127,6 +131,7 @@ class Course(db.Model):
     description = db.Column(db.String(200))
     semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), nullable=False)
     program = db.Column(db.String(50), nullable=False)
+    capacity = db.Column(db.Integer)  # None means unlimited
 
     lecturer_id = db.Column(db.Integer, db.ForeignKey('lecturer_profiles.id'))  # NEW
 
@@ -152,14 +157,11 @@ class Course(db.Model):
         back_populates='prerequisites'
     )
 
-    serialize_rules = ('id', 'code', 'title', 'description', 'semester_id', 'program', 'lecturer_id')
+    serialize_rules = ('id', 'code', 'title', 'description', 'semester_id', 'program', 'capacity', 'lecturer_id')
 
     def to_dict(self, rules=()):
-        rules = rules or self.serialize_rules
-        course_dict = {field: getattr(self, field) for field in rules}
-        if 'lecturer' in rules and self.lecturer:
-            course_dict['lecturer'] = self.lecturer.to_dict()
-        return course_dict
+        # 'lecturer' in rules is serialized as the nested lecturer profile
+        return serialize(self, rules)
 
 
 # -------------------- Semester Model --------------------
@@ -196,6 +198,9 @@ class Semester(db.Model):
 
 class UnitRegistration(db.Model):
     __tablename__ = 'unit_registrations'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'course_id', 'semester_id', name='uq_unit_registration_student_course_semester'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student_profiles.id'), nullable=False)
@@ -219,16 +224,22 @@ class UnitRegistration(db.Model):
 
     @staticmethod
     def check_prerequisites_met(student_id, course):
-        
-        if not course.prerequisites:
+        # Imported here because prerequisites.py imports this module
+        from prerequisites import PrerequisiteCycleError, get_prerequisite_graph
+
+        try:
+            graph = get_prerequisite_graph()
+        except PrerequisiteCycleError:
+            return False  # Cannot be satisfied until the cycle is broken
+        if not graph.closure.get(course.id):
             return True  # No prerequisites required
 
         completed_course_ids = {
-            reg.course_id for reg in UnitRegistration.query.filter_by(student_id=student_id)
+            course_id for (course_id,) in db.session.query(UnitRegistration.course_id).filter_by(student_id=student_id)
         }
 
-        required_prereq_ids = {prereq.id for prereq in course.prerequisites}
-        return required_prereq_ids.issubset(completed_course_ids)
+        # Checks direct and indirect prerequisites against the cached closure
+        return graph.prerequisites_met(course.id, completed_course_ids)
 
     def to_dict(self, rules=()):
         rules = rules or self.serialize_rules
@@ -246,6 +257,13 @@ class UnitRegistration(db.Model):
 
 
 class Grade(db.Model):
+    __table_args__ = (
+        db.Index('ix_grade_date_posted_id', 'date_posted', 'id'),
+        # One grade per student, course and semester; also serves lookups by student
+        db.UniqueConstraint('student_id', 'course_id', 'semester_id', name='uq_grade_student_course_semester'),
+        db.Index('ix_grade_course_semester', 'course_id', 'semester_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
@@ -268,7 +286,35 @@ class Grade(db.Model):
             'date_posted': self.date_posted.isoformat() if self.date_posted else None
         }
 
-    
+
+# -------------------- GPA Summary Model --------------------
+
+class GpaSummary(db.Model):
+    """Per-student, per-semester grade point totals maintained by transcripts.py"""
+    __tablename__ = 'gpa_summaries'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'semester_id', name='uq_gpa_summary_student_semester'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), nullable=False)
+    course_count = db.Column(db.Integer, nullable=False, default=0)
+    total_points = db.Column(db.Float, nullable=False, default=0.0)
+    updated_on = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    semester = db.relationship('Semester')
+
+    serialize_rules = ('student_id', 'semester_id', 'course_count', 'gpa')
+
+    @property
+    def gpa(self):
+        return round(self.total_points / self.course_count, 2) if self.course_count else None
+
+    def to_dict(self, rules=()):
+        return serialize(self, rules)
+
+
 class Announcement(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -350,8 +396,7 @@ class Hostel(db.Model):
     serialize_rules = ('id', 'name', 'location', 'capacity')
 
     def to_dict(self, rules=()):
-        rules = rules or self.serialize_rules
-        return {field: getattr(self, field) for field in rules}
+        return serialize(self, rules)
 
 class Room(db.Model):
     __tablename__ = 'rooms'
@@ -372,12 +417,15 @@ class Room(db.Model):
     serialize_rules = ('id', 'hostel_id', 'room_number', 'bed_count', 'price_per_bed')
 
     def to_dict(self, rules=()):
-        rules = rules or self.serialize_rules
-        return {field: getattr(self, field) for field in rules}
+        return serialize(self, rules)
 
 
 class StudentRoomBooking(db.Model):
     __tablename__ = 'student_room_bookings'
+    __table_args__ = (
+        db.Index('ix_student_room_bookings_room_dates', 'room_id', 'start_date', 'end_date'),
+        db.Index('ix_student_room_bookings_student_dates', 'student_id', 'start_date', 'end_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student_profiles.id'), nullable=False)
@@ -385,11 +433,12 @@ class StudentRoomBooking(db.Model):
     booked_on = db.Column(db.DateTime, default=datetime.utcnow)
     start_date = db.Column(db.DateTime, nullable=False)
     end_date = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(50), default='confirmed')  # 'confirmed', 'cancelled'
 
     student = db.relationship('StudentProfile', back_populates='room_bookings')
     room = db.relationship('Room', back_populates='student_bookings')
 
-    serialize_rules = ('id', 'student_id', 'room_id', 'start_date', 'end_date', 'booked_on')
+    serialize_rules = ('id', 'student_id', 'room_id', 'start_date', 'end_date', 'booked_on', 'status')
 
     def to_dict(self, rules=()):
         rules = rules or self.serialize_rules
@@ -399,7 +448,8 @@ class StudentRoomBooking(db.Model):
             'room_number': self.room.room_number,
             'start_date': self.start_date.isoformat(),
             'end_date': self.end_date.isoformat(),
-            'booked_on': self.booked_on.isoformat()
+            'booked_on': self.booked_on.isoformat(),
+            'status': self.status
         }
 
 
@@ -436,6 +486,10 @@ class FeeStructure(db.Model):
 
 class Payment(db.Model):
     __tablename__ = 'payments'
+    __table_args__ = (
+        db.Index('ix_payments_student_fee_structure', 'student_id', 'fee_structure_id'),
+        db.UniqueConstraint('transaction_ref', name='uq_payments_transaction_ref'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student_profiles.id'), nullable=False)
@@ -443,6 +497,7 @@ class Payment(db.Model):
     amount_paid = db.Column(db.Float, nullable=False)
     payment_date = db.Column(db.DateTime, default=datetime.utcnow)
     payment_method = db.Column(db.String(50), nullable=False)
+    transaction_ref = db.Column(db.String(100))  # bank / mobile-money reference, when imported
 
     student = db.relationship('StudentProfile', back_populates='payments')
     fee_structure = db.relationship('FeeStructure', back_populates='payments')
@@ -461,8 +516,34 @@ class Payment(db.Model):
         }
 
 
+class FeeBalance(db.Model):
+    """Per-student, per-semester fee totals maintained by ledger.py"""
+    __tablename__ = 'fee_balances'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'semester_id', name='uq_fee_balance_student_semester'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student_profiles.id'), nullable=False)
+    semester_id = db.Column(db.Integer, db.ForeignKey('semesters.id'), nullable=False)
+    amount_billed = db.Column(db.Float, nullable=False, default=0.0)
+    amount_paid = db.Column(db.Float, nullable=False, default=0.0)
+    updated_on = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    serialize_rules = ('student_id', 'semester_id', 'amount_billed', 'amount_paid', 'balance')
+
+    @property
+    def balance(self):
+        return round(self.amount_billed - self.amount_paid, 2)
+
+    def to_dict(self, rules=()):
+        return serialize(self, rules)
+
 class FeeClearance(db.Model):
     __tablename__ = 'fee_clearances'
+    __table_args__ = (
+        db.Index('ix_fee_clearances_student_id', 'student_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_name = db.Column(db.String(100))
@@ -514,6 +595,10 @@ class Assignment(db.Model):
         }
 
 class Registration(db.Model):
+    __table_args__ = (
+        db.Index('ix_registration_status', 'status'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     student_name = db.Column(db.String(100))
     student_email = db.Column(db.String(120))
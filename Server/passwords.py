@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Werkzeug 3's default; stored hashes carry their own parameters, so changing
+# this only affects new hashes (and rehash-on-login).
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+DEFAULT_HASH_WORKERS = 2
+
+
+class PasswordHashingBusy(Exception):
+    """Raised instead of queueing when every hashing slot is taken"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__('Too many password operations in progress, retry shortly')
+
+
+class PasswordHasher:
+    """Runs password hashing off the request thread, with a bounded queue.
+
+    Configured from the app:
+        PASSWORD_HASH_METHOD       Werkzeug method string, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'
+        PASSWORD_HASH_WORKERS      processes in the pool; 0 hashes inline on the calling thread
+        PASSWORD_HASH_MAX_PENDING  operations allowed in flight before PasswordHashingBusy is raised
+        PASSWORD_HASH_TIMEOUT      seconds to wait for a result before giving up
+        PASSWORD_HASH_RETRY_AFTER  seconds suggested to clients turned away
+
+    Each gunicorn worker gets its own pool, created lazily on first use and
+    started with 'spawn' so no app state or threads are forked into it; size
+    PASSWORD_HASH_WORKERS with the gunicorn worker count in mind.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_HASH_METHOD
+        self.workers = DEFAULT_HASH_WORKERS
+        self.max_pending = 32
+        self.timeout = 10.0
+        self.retry_after = 1
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._method_prefix = None
+        self._stats = {'pending': 0, 'peak_pending': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0, 'rehashed': 0,
+                       'total_ms': 0.0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        env = os.environ.get
+        self.method = app.config.setdefault('PASSWORD_HASH_METHOD', env('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD))
+        self.workers = app.config.setdefault('PASSWORD_HASH_WORKERS', int(env('PASSWORD_HASH_WORKERS', DEFAULT_HASH_WORKERS)))
+        self.max_pending = app.config.setdefault('PASSWORD_HASH_MAX_PENDING', int(env('PASSWORD_HASH_MAX_PENDING', 32)))
+        self.timeout = app.config.setdefault('PASSWORD_HASH_TIMEOUT', float(env('PASSWORD_HASH_TIMEOUT', 10)))
+        self.retry_after = app.config.setdefault('PASSWORD_HASH_RETRY_AFTER', int(env('PASSWORD_HASH_RETRY_AFTER', 1)))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._method_prefix = None
+        app.extensions['password_hasher'] = self
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise PasswordHashingBusy(self.retry_after)
+
+        started = time.perf_counter()
+        with self._lock:
+            self._stats['pending'] += 1
+            self._stats['peak_pending'] = max(self._stats['peak_pending'], self._stats['pending'])
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                self._finish(started)
+
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._finish(started, finished=False)
+            raise
+        # The slot is held until the job itself ends, not until we stop waiting
+        # for it, so timed-out work still counts against max_pending.
+        future.add_done_callback(lambda f: self._finish(started, finished=not f.cancelled()))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PasswordHashingBusy(self.retry_after)
+
+    def _finish(self, started, finished=True):
+        self._slots.release()
+        with self._lock:
+            self._stats['pending'] -= 1
+            if finished:
+                self._stats['completed'] += 1
+                self._stats['total_ms'] += (time.perf_counter() - started) * 1000
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when a stored hash was made with a different method or work factor"""
+        if self._method_prefix is None:
+            # Werkzeug fills in defaults ('pbkdf2' -> 'pbkdf2:sha256:600000'); learn the exact prefix once
+            self._method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._method_prefix
+
+    def verify_and_update(self, user, password):
+        """Check a login password, upgrading the stored hash if the configured cost changed"""
+        if not self.verify(user.password_hash, password):
+            return False
+        if self.needs_rehash(user.password_hash):
+            user.password_hash = self.hash(password)
+            with self._lock:
+                self._stats['rehashed'] += 1
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop('total_ms')
+        stats['avg_ms'] = round(total_ms / stats['completed'], 2) if stats['completed'] else None
+        stats.update({'method': self.method, 'workers': self.workers, 'max_pending': self.max_pending})
+        return stats
+
+
+password_hasher = PasswordHasher()
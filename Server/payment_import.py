@@ -0,0 +1,190 @@
+import csv
+import io
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from models import db, FeeStructure, Payment, StudentProfile
+from bulk import existing_values
+from ledger import record_payment_changes
+
+# Rows parsed, matched and inserted per transaction
+PAYMENT_IMPORT_CHUNK = 5000
+
+# Largest single payment accepted; anything above is a parse or export error, and
+# amounts stay well inside the float column's exact-cents range
+PAYMENT_IMPORT_MAX_AMOUNT = Decimal('99999999.99')
+CENTS = Decimal('0.01')
+
+# Unmatched / rejected rows echoed back in the report; the rest are only counted
+PAYMENT_IMPORT_MAX_ISSUES = 200
+
+# Statement exports disagree on header names; map the ones we have seen
+COLUMN_ALIASES = {
+    'reference': 'reference', 'transaction_ref': 'reference', 'ref': 'reference', 'transaction_id': 'reference',
+    'reg_no': 'reg_no', 'regno': 'reg_no', 'account': 'reg_no', 'account_no': 'reg_no',
+    'amount': 'amount', 'amount_paid': 'amount', 'credit': 'amount',
+    'date': 'date', 'payment_date': 'date', 'value_date': 'date',
+    'fee_structure_id': 'fee_structure_id',
+    'method': 'method', 'payment_method': 'method', 'channel': 'method',
+}
+
+
+class PaymentImportError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.unmatched = 0
+        self.invalid = 0
+        self.issues = []
+        self.started = time.perf_counter()
+
+    def reject(self, kind, line, reason, row):
+        setattr(self, kind, getattr(self, kind) + 1)
+        if len(self.issues) < PAYMENT_IMPORT_MAX_ISSUES:
+            self.issues.append({'line': line, 'type': kind, 'reason': reason,
+                                'reference': row.get('reference'), 'reg_no': row.get('reg_no')})
+
+    def to_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'duplicates': self.duplicates,
+            'unmatched': self.unmatched,
+            'invalid': self.invalid,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed) if elapsed else None,
+            'issues': self.issues,
+            'issues_truncated': self.duplicates + self.unmatched + self.invalid > len(self.issues)
+        }
+
+
+def import_payments(stream, fee_structure_id=None, payment_method='bank', chunk_size=PAYMENT_IMPORT_CHUNK):
+    """Stream a CSV statement into payments, one committed transaction per chunk.
+
+    `stream` is a binary file object; it is decoded and parsed incrementally.
+    Rows need a reference, reg_no and amount, plus a fee_structure_id unless
+    one is given for the whole file. References already imported (in this
+    file or earlier) are skipped, so re-running a statement is safe.
+    """
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = next(reader, None)
+    if not header:
+        raise PaymentImportError('The statement file is empty')
+    columns = [COLUMN_ALIASES.get(name.strip().lower()) for name in header]
+    missing = {'reference', 'reg_no', 'amount'} - set(columns)
+    if not fee_structure_id and 'fee_structure_id' not in columns:
+        missing.add('fee_structure_id')
+    if missing:
+        raise PaymentImportError(f"Statement is missing columns: {', '.join(sorted(missing))}")
+
+    # Lookups are built once; each statement line is then two dict probes
+    students = dict(db.session.query(StudentProfile.reg_no, StudentProfile.id))
+    fee_structures = {fs_id for (fs_id,) in db.session.query(FeeStructure.id)}
+    if fee_structure_id and fee_structure_id not in fee_structures:
+        raise PaymentImportError(f'Fee structure {fee_structure_id} not found')
+
+    report = ImportReport()
+    seen = set()
+    rows = (
+        (line, {column: (value or '').strip() for column, value in zip(columns, values) if column})
+        for line, values in enumerate(reader, start=2) if any(values)
+    )
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        report.rows += len(chunk)
+
+        candidates = []
+        for line, row in chunk:
+            payment = _match(row, line, students, fee_structures, fee_structure_id, payment_method, report)
+            if payment is None:
+                continue
+            if payment['transaction_ref'] in seen:
+                report.reject('duplicates', line, 'Reference repeated in this file', row)
+                continue
+            seen.add(payment['transaction_ref'])
+            candidates.append((line, row, payment))
+
+        _insert_chunk(candidates, report)
+    return report.to_dict()
+
+
+def _match(row, line, students, fee_structures, default_fee_structure_id, default_method, report):
+    reference = row.get('reference')
+    if not reference:
+        report.reject('invalid', line, 'Missing reference', row)
+        return None
+    try:
+        amount = Decimal(row.get('amount', '').replace(',', ''))
+        payment_date = datetime.fromisoformat(row['date']) if row.get('date') else datetime.utcnow()
+        fs_id = int(row['fee_structure_id']) if row.get('fee_structure_id') else default_fee_structure_id
+    except (ValueError, InvalidOperation):
+        report.reject('invalid', line, 'Unparseable amount, date or fee_structure_id', row)
+        return None
+    # Decimal parses nan and inf, which would slip past the sign check below
+    if not amount.is_finite():
+        report.reject('invalid', line, 'Amount must be a finite number', row)
+        return None
+    if amount > PAYMENT_IMPORT_MAX_AMOUNT:
+        report.reject('invalid', line, f'Amount exceeds {PAYMENT_IMPORT_MAX_AMOUNT}', row)
+        return None
+    amount = amount.quantize(CENTS, rounding=ROUND_HALF_UP)
+    if amount <= 0:
+        report.reject('invalid', line, 'Amount must be positive', row)
+        return None
+
+    student_id = students.get(row.get('reg_no'))
+    if student_id is None:
+        report.reject('unmatched', line, 'Unknown reg_no', row)
+        return None
+    if fs_id not in fee_structures:
+        report.reject('unmatched', line, 'Unknown fee structure', row)
+        return None
+
+    return {
+        'student_id': student_id,
+        'fee_structure_id': fs_id,
+        'amount_paid': float(amount),
+        'payment_date': payment_date,
+        'payment_method': row.get('method') or default_method,
+        'transaction_ref': reference[:100]
+    }
+
+
+def _insert_chunk(candidates, report, attempts=3):
+    for _ in range(attempts):
+        known = existing_values(Payment.transaction_ref, [payment['transaction_ref'] for _, _, payment in candidates])
+        new_rows = []
+        for line, row, payment in candidates:
+            if payment['transaction_ref'] in known:
+                report.reject('duplicates', line, 'Reference already imported', row)
+            else:
+                new_rows.append(payment)
+        if not new_rows:
+            return
+        try:
+            record_payment_changes(
+                (p['student_id'], p['fee_structure_id'], p['amount_paid'], 1) for p in new_rows
+            )
+            db.session.execute(insert(Payment), new_rows)
+            db.session.commit()
+            report.inserted += len(new_rows)
+            return
+        except IntegrityError:
+            # Another import committed some of these references first; re-check and retry
+            db.session.rollback()
+            candidates = [(line, row, payment) for line, row, payment in candidates
+                          if payment['transaction_ref'] not in known]
+    raise PaymentImportError('Could not import a chunk after repeated reference conflicts')
@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models import db, course_prerequisites, Course
+
+# Other gunicorn workers cannot see our invalidations, so a rebuilt graph is
+# also considered stale after this many seconds.
+PREREQUISITE_GRAPH_TTL = 300
+
+
+class PrerequisiteCycleError(ValueError):
+    def __init__(self, course_ids):
+        self.course_ids = sorted(course_ids)
+        super().__init__(f"Prerequisite cycle between courses {self.course_ids}")
+
+
+class PrerequisiteGraph:
+    """Immutable snapshot of course_prerequisites with a precomputed closure.
+
+    Every course gets a bit position; `closure[course_id]` is an int bitset of
+    all direct and indirect prerequisites, so eligibility is a single AND.
+    """
+
+    def __init__(self, edges):
+        prerequisites = defaultdict(set)
+        nodes = set()
+        for course_id, prerequisite_id in edges:
+            if course_id is None or prerequisite_id is None:
+                continue
+            prerequisites[course_id].add(prerequisite_id)
+            nodes.update((course_id, prerequisite_id))
+
+        self.prerequisites = {course_id: frozenset(ids) for course_id, ids in prerequisites.items()}
+        self.bit = {course_id: 1 << position for position, course_id in enumerate(sorted(nodes))}
+        self.topological_order = self._topological_order(nodes)
+        self.closure = self._closure()
+
+    def _topological_order(self, nodes):
+        # Kahn's algorithm: prerequisites come before the courses that need them
+        pending = {course_id: len(self.prerequisites.get(course_id, ())) for course_id in nodes}
+        dependents = defaultdict(list)
+        for course_id, ids in self.prerequisites.items():
+            for prerequisite_id in ids:
+                dependents[prerequisite_id].append(course_id)
+
+        ready = deque(sorted(course_id for course_id, count in pending.items() if count == 0))
+        order = []
+        while ready:
+            course_id = ready.popleft()
+            order.append(course_id)
+            for dependent in dependents[course_id]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(nodes):
+            raise PrerequisiteCycleError(self._cycle_members(pending, dependents))
+        return order
+
+    @staticmethod
+    def _cycle_members(pending, dependents):
+        # Kahn leaves cycles plus everything downstream of them; peel off the
+        # downstream courses (nothing left depends on them) to name only the cycle.
+        remaining = {course_id for course_id, count in pending.items() if count}
+        while True:
+            sinks = {c for c in remaining if not any(d in remaining for d in dependents[c])}
+            if not sinks:
+                return remaining
+            remaining -= sinks
+
+    def _closure(self):
+        closure = {}
+        for course_id in self.topological_order:
+            bits = 0
+            for prerequisite_id in self.prerequisites.get(course_id, ()):
+                bits |= self.bit[prerequisite_id] | closure[prerequisite_id]
+            closure[course_id] = bits
+        return closure
+
+    def bits_for(self, course_ids):
+        bits = 0
+        for course_id in course_ids:
+            bits |= self.bit.get(course_id, 0)
+        return bits
+
+    def ids_for(self, bits):
+        return {course_id for course_id, bit in self.bit.items() if bits & bit}
+
+    def all_prerequisites(self, course_id):
+        return self.ids_for(self.closure.get(course_id, 0))
+
+    def missing_prerequisites(self, course_id, completed_course_ids):
+        """Every transitive prerequisite of `course_id` not in `completed_course_ids`"""
+        required = self.closure.get(course_id, 0)
+        if not required:
+            return set()
+        return self.ids_for(required & ~self.bits_for(completed_course_ids))
+
+    def prerequisites_met(self, course_id, completed_course_ids):
+        required = self.closure.get(course_id, 0)
+        return required & self.bits_for(completed_course_ids) == required
+
+
+_lock = threading.Lock()
+_graph = None
+_built_at = 0.0
+
+
+def get_prerequisite_graph():
+    global _graph, _built_at
+    graph = _graph
+    if graph is not None and time.monotonic() - _built_at < PREREQUISITE_GRAPH_TTL:
+        return graph
+
+    with _lock:
+        if _graph is None or time.monotonic() - _built_at >= PREREQUISITE_GRAPH_TTL:
+            edges = db.session.execute(
+                select(course_prerequisites.c.course_id, course_prerequisites.c.prerequisite_id)
+            ).all()
+            _graph = PrerequisiteGraph(edges)
+            _built_at = time.monotonic()
+        return _graph
+
+
+def invalidate_prerequisite_graph():
+    global _graph
+    # Waits out a rebuild in progress, which may have read the edges before our commit
+    with _lock:
+        _graph = None
+
+
+def _prerequisites_changed(course):
+    state = inspect(course)
+    return any(state.attrs[name].history.has_changes() for name in ('prerequisites', 'dependent_courses'))
+
+
+@event.listens_for(Session, 'after_flush')
+def _check_course_writes(session, flush_context):
+    # Prerequisite edges are only written through Course.prerequisites / dependent_courses,
+    # so any flushed Course change marks the snapshot stale once the transaction commits.
+    courses = [obj for obj in (*session.new, *session.dirty, *session.deleted) if isinstance(obj, Course)]
+    if not courses:
+        return
+    session.info['prerequisite_graph_stale'] = True
+
+    # New edges are visible to this transaction now; building the graph raises
+    # PrerequisiteCycleError and aborts the flush before a cycle can be committed.
+    if any(_prerequisites_changed(course) for course in courses if course not in session.deleted):
+        PrerequisiteGraph(session.execute(
+            select(course_prerequisites.c.course_id, course_prerequisites.c.prerequisite_id)
+        ).all())
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if session.info.pop('prerequisite_graph_stale', False):
+        invalidate_prerequisite_graph()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('prerequisite_graph_stale', None)
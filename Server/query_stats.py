@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCollector:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """Statements issued at least `threshold` times - the usual N+1 signature"""
+        return [
+            {'statement': statement[:200], 'count': count}
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def _active_collectors():
+    collectors = getattr(_local, 'collectors', None)
+    if collectors is None:
+        collectors = _local.collectors = []
+    return collectors
+
+
+# The start time lives on the execution context, which is dropped with the
+# statement; after_cursor_execute never fires for a statement that raises, so
+# anything kept on the (pooled) connection would pile up.
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_stats_started', None)
+    collectors = getattr(_local, 'collectors', None)
+    if collectors and started is not None:
+        duration = time.perf_counter() - started
+        for collector in collectors:
+            collector.record(statement, duration)
+
+
+@contextmanager
+def count_queries():
+    """Collect every statement run on this thread inside the block"""
+    collector = QueryCollector()
+    _active_collectors().append(collector)
+    try:
+        yield collector
+    finally:
+        _active_collectors().remove(collector)
+
+
+@contextmanager
+def query_budget(max_queries):
+    """Fail (e.g. a test) if the block runs more than `max_queries` statements
+
+        with query_budget(2):
+            client.get('/api/users?limit=50')
+    """
+    with count_queries() as collector:
+        yield collector
+    if collector.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{collector.count} queries exceeded the budget of {max_queries}; "
+            f"most repeated: {collector.repeated(2)[:3]}"
+        )
+
+
+class QueryStats:
+    """Per-request SQL instrumentation.
+
+    Adds a Server-Timing header and logs one JSON line per request with the
+    query count, total database time and any statement repeated at least
+    QUERY_REPEAT_THRESHOLD times. With QUERY_BUDGET set, requests above it are
+    logged as warnings, or raise QueryBudgetExceeded when QUERY_BUDGET_STRICT
+    is on (handy under app.testing, where the exception reaches the test).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_STATS_ENABLED', True)
+        app.config.setdefault('QUERY_REPEAT_THRESHOLD', 5)
+        app.config.setdefault('QUERY_BUDGET', None)
+        app.config.setdefault('QUERY_BUDGET_STRICT', False)
+
+        if not app.config['QUERY_STATS_ENABLED']:
+            return
+
+        @app.before_request
+        def _start_collecting():
+            g.query_collector = QueryCollector()
+            _active_collectors().append(g.query_collector)
+
+        @app.after_request
+        def _report(response):
+            collector = g.pop('query_collector', None)
+            if collector is None:
+                return response
+            _active_collectors().remove(collector)
+
+            db_ms = collector.duration * 1000
+            response.headers.add('Server-Timing', f'db;dur={db_ms:.1f};desc="{collector.count} queries"')
+
+            repeated = collector.repeated(app.config['QUERY_REPEAT_THRESHOLD'])
+            budget = app.config['QUERY_BUDGET']
+            over_budget = budget is not None and collector.count > budget
+
+            record = {
+                'event': 'request_queries',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'queries': collector.count,
+                'db_ms': round(db_ms, 2),
+            }
+            if repeated:
+                record['repeated'] = repeated
+            if over_budget:
+                record['budget'] = budget
+
+            if repeated or over_budget:
+                app.logger.warning(json.dumps(record))
+            else:
+                app.logger.info(json.dumps(record))
+
+            if over_budget and app.config['QUERY_BUDGET_STRICT']:
+                raise QueryBudgetExceeded(f"{request.endpoint} ran {collector.count} queries (budget {budget})")
+            return response
+
+        @app.teardown_request
+        def _stop_collecting(exc):
+            # after_request is skipped when the view raised
+            collector = g.pop('query_collector', None)
+            if collector is not None and collector in _active_collectors():
+                _active_collectors().remove(collector)
+
+        app.extensions['query_stats'] = self
+
+
+query_stats = QueryStats()
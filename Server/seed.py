@@ -1,35 +1,43 @@
+import argparse
+import csv
+import io
 import os
 import sys
 import random
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from multiprocessing import get_context
 from werkzeug.security import generate_password_hash
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
-from sqlalchemy import text
+from sqlalchemy import text, insert
 from faker import Faker
+from flask_migrate import stamp
 
 fake = Faker()
 
 
 # Import app and models
 from app import app
-engine= create_engine(app.config['SQLALCHEMY_DATABASE_URI'])
 
 # Add the parent directory to sys.path to import models if needed
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import (
     db, User, StudentProfile, LecturerProfile, Course, Semester, 
     UnitRegistration, Grade, Announcement, AuditLog, DocumentRequest,
-    Hostel, Room, StudentRoomBooking, FeeStructure, Payment, FeeClearance, Assignment
+    Hostel, Room, StudentRoomBooking, FeeStructure, Payment, FeeClearance, Assignment, Registration
 )
+from passwords import password_hasher
+from transcripts import GRADE_POINTS, rebuild_gpa_summaries
+from ledger import verify_fee_balances
 
 # Load environment variables
 load_dotenv()
 
-# Database configuration
-
-# Create engine and db.session
+# The app's engine (and its DB_* pool settings) is used throughout; no second engine
 
 
 def create_users():
@@ -208,14 +216,14 @@ def create_announcements(admin):
             date_posted=datetime.now() - timedelta(days=data["days_ago"])
         )
         db.session.add(announcement)
-        db.session.commit()
+    db.session.commit()
 
     print("Announcements created successfully.")
 
     #Gradings 
     print("Creating grades...")
-    grade_options = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "F"]
-    grade_weights = [5, 10, 15, 15, 15, 10, 10, 8, 5, 3, 2, 2]  # Distribution of grades
+    grade_options = list(GRADE_POINTS)  # the scale the API accepts and GPA summaries count
+    grade_weights = [10, 15, 20, 18, 15, 10, 7, 5]  # Distribution of grades
     
     # Assign each student multiple courses with grades
     for student in students:
@@ -593,16 +601,409 @@ def seed_assignments():
         print(f"❌ Error seeding assignments: {e}")
             
    
-if __name__ == "__main__":
-    if __name__ == "__main__":
-     
 
-     with app.app_context():
-         
+
+# -------------------- Bulk seeding --------------------
+#
+# The functions above build a small demo campus one ORM object at a time.
+# Bulk mode builds a benchmark-sized one: `--scale 100` is 100,000 students
+# with their registrations, grades, bookings, payments and logs.
+#
+# Every id and cross-table reference is a pure function of the scale (see
+# BulkLayout), so each table is generated in independent chunks across worker
+# processes while the parent writes finished chunks (COPY on PostgreSQL,
+# batched executemany elsewhere). Each chunk seeds its own Random and Faker
+# from (--seed, table, chunk), so the same arguments always produce the same
+# database. Passwords are hashed once per role: <role>pass, e.g. studentpass.
+
+BULK_STUDENTS_PER_SCALE = 1000
+BULK_CHUNK_ROWS = 5000
+BULK_BATCH_SIZE = 10000
+BULK_TERM_START = datetime(2025, 1, 15)
+
+BULK_PROGRAMS = ["Computer Science", "Business Administration", "Engineering", "Medicine", "Arts"]
+BULK_DEPARTMENTS = ["Computer Science", "Business", "Engineering", "Medicine", "Arts"]
+BULK_CODE_PREFIXES = ["CS", "BUS", "ENG", "MED", "ART"]
+BULK_SEMESTERS = [
+    (1, "Fall 2024", datetime(2024, 9, 1), datetime(2024, 12, 15), False),
+    (2, "Spring 2025", datetime(2025, 1, 15), datetime(2025, 5, 30), True),
+    (3, "Summer 2025", datetime(2025, 6, 15), datetime(2025, 8, 30), False),
+]
+BULK_PAST_SEMESTER, BULK_ACTIVE_SEMESTER = 1, 2
+BULK_GRADES = list(GRADE_POINTS)  # A, B+, B, C+, C, D+, D, E: the scale the API validates
+BULK_GRADE_WEIGHTS = [10, 15, 20, 18, 15, 10, 7, 5]
+BULK_ROOMS_PER_HOSTEL = 25
+BULK_AUDIT_ACTIONS = ["Login", "Logout", "Viewed grades", "Updated profile", "Requested document",
+                      "Processed payment", "Cleared fee", "Booked room", "Changed password"]
+
+
+class BulkLayout:
+    """Row counts and the id arithmetic every table generator shares"""
+
+    def __init__(self, scale, seed, password_hashes):
+        self.seed = seed
+        self.password_hashes = password_hashes
+        self.students = max(1, int(scale * BULK_STUDENTS_PER_SCALE))
+        self.lecturers = max(5, self.students // 40)
+        self.courses = max(30, self.students // 20)
+        self.hostels = max(10, self.students // 400)
+        self.rooms = self.hostels * BULK_ROOMS_PER_HOSTEL
+
+        # Courses by (program, semester); course j belongs to program (j-1) % 5
+        self.courses_by_program = {}
+        for course_id in range(1, self.courses + 1):
+            key = (self.program_index(course_id), self.course_semester(course_id))
+            self.courses_by_program.setdefault(key, []).append(course_id)
+
+        # One fee structure per active-semester course
+        self.fee_structure_courses = [
+            course_id for course_id in range(1, self.courses + 1)
+            if self.course_semester(course_id) == BULK_ACTIVE_SEMESTER
+        ]
+        self.fee_structures_by_program = {}
+        for fs_id, course_id in enumerate(self.fee_structure_courses, start=1):
+            self.fee_structures_by_program.setdefault(self.program_index(course_id), []).append(fs_id)
+
+        # Beds laid end to end; the first half of them are booked, one student each
+        self.bed_offsets = [0]
+        for room_id in range(1, self.rooms + 1):
+            self.bed_offsets.append(self.bed_offsets[-1] + self.bed_count(room_id))
+        self.booked_beds = min(self.bed_offsets[-1] // 2, self.students)
+
+        names = Faker()
+        names.seed_instance(seed)
+        self.first_names = [names.first_name() for _ in range(500)]
+        self.last_names = [names.last_name() for _ in range(500)]
+
+    @staticmethod
+    def program_index(row_id):
+        return (row_id - 1) % len(BULK_PROGRAMS)
+
+    @staticmethod
+    def course_semester(course_id):
+        return (course_id - 1) // len(BULK_PROGRAMS) % len(BULK_SEMESTERS) + 1
+
+    @staticmethod
+    def bed_count(room_id):
+        return room_id * 2654435761 % 6 + 1
+
+    @staticmethod
+    def fee_amount(fs_id):
+        return float(50000 + fs_id * 7919 % 100000)
+
+    def student_user_id(self, student_id):
+        return student_id + 1  # user 1 is the admin
+
+    def lecturer_user_id(self, lecturer_id):
+        return self.students + 1 + lecturer_id
+
+    def name(self, person_id):
+        return f"{self.first_names[person_id * 7 % 500]} {self.last_names[person_id * 13 // 7 % 500]}"
+
+    def course_lecturer(self, course_id):
+        # A lecturer from the course's own department
+        per_department = self.lecturers // len(BULK_PROGRAMS)
+        return (course_id - 1) // len(BULK_PROGRAMS) % per_department * len(BULK_PROGRAMS) + self.program_index(course_id) + 1
+
+    def room_for_bed(self, bed):
+        return bisect_right(self.bed_offsets, bed)
+
+    def occupants(self, room_id):
+        start = self.bed_offsets[room_id - 1]
+        return max(0, min(self.booked_beds - start, self.bed_count(room_id)))
+
+
+def _bulk_users(layout, rng, fake, start, stop):
+    for user_id in range(start, stop):
+        if user_id == 1:
+            yield (1, "Admin User", "admin@university.edu", layout.password_hashes["admin"], "admin")
+        elif user_id <= layout.students + 1:
+            student_id = user_id - 1
+            yield (user_id, layout.name(student_id), f"student{student_id}@university.edu",
+                   layout.password_hashes["student"], "student")
+        else:
+            lecturer_id = user_id - layout.students - 1
+            yield (user_id, f"Dr. {layout.name(layout.students + lecturer_id)}", f"lecturer{lecturer_id}@university.edu",
+                   layout.password_hashes["lecturer"], "lecturer")
+
+
+def _bulk_student_profiles(layout, rng, fake, start, stop):
+    for student_id in range(start, stop):
+        yield (student_id, layout.name(student_id), layout.student_user_id(student_id), f"STU{student_id:07d}",
+               BULK_PROGRAMS[layout.program_index(student_id)], rng.randint(1, 4), f"+1234{student_id:07d}")
+
+
+def _bulk_lecturer_profiles(layout, rng, fake, start, stop):
+    for lecturer_id in range(start, stop):
+        yield (lecturer_id, layout.lecturer_user_id(lecturer_id), f"LEC{lecturer_id:06d}",
+               BULK_DEPARTMENTS[layout.program_index(lecturer_id)], f"+2345{lecturer_id:07d}")
+
+
+def _bulk_semesters(layout, rng, fake, start, stop):
+    return BULK_SEMESTERS[start - 1:stop - 1]
+
+
+def _bulk_courses(layout, rng, fake, start, stop):
+    for course_id in range(start, stop):
+        program = layout.program_index(course_id)
+        title = fake.catch_phrase()[:100]
+        yield (course_id, f"{BULK_CODE_PREFIXES[program]}{course_id:05d}", title, f"Description for {title}"[:200],
+               layout.course_semester(course_id), BULK_PROGRAMS[program], None, layout.course_lecturer(course_id))
+
+
+def _bulk_unit_registrations(layout, rng, fake, start, stop):
+    for student_id in range(start, stop):
+        courses = layout.courses_by_program[(layout.program_index(student_id), BULK_ACTIVE_SEMESTER)]
+        for course_id in rng.sample(courses, min(4, len(courses))):
+            yield (student_id, course_id, BULK_ACTIVE_SEMESTER, BULK_TERM_START - timedelta(days=rng.randint(1, 30)))
+
+
+def _bulk_grades(layout, rng, fake, start, stop):
+    semester_start = BULK_SEMESTERS[BULK_PAST_SEMESTER - 1][2]
+    for student_id in range(start, stop):
+        courses = layout.courses_by_program[(layout.program_index(student_id), BULK_PAST_SEMESTER)]
+        grades = rng.choices(BULK_GRADES, weights=BULK_GRADE_WEIGHTS, k=min(6, len(courses)))
+        for course_id, grade in zip(rng.sample(courses, len(grades)), grades):
+            yield (layout.student_user_id(student_id), course_id, grade, BULK_PAST_SEMESTER,
+                   semester_start + timedelta(days=rng.randint(10, 90), minutes=rng.randint(0, 1439)))
+
+
+def _bulk_announcements(layout, rng, fake, start, stop):
+    for _ in range(start, stop):
+        yield (fake.sentence(nb_words=5)[:255], fake.paragraph(), BULK_TERM_START - timedelta(days=rng.randint(1, 60)), 1)
+
+
+def _bulk_document_requests(layout, rng, fake, start, stop):
+    document_types = ['Transcript', 'Enrollment Letter', 'Graduation Certificate', 'Recommendation Letter']
+    for request_id in range(start, stop):
+        student_user = layout.student_user_id(rng.randint(1, layout.students))
+        document_type = rng.choice(document_types)
+        status = rng.choice(['Pending', 'Approved', 'Rejected'])
+        requested_on = BULK_TERM_START + timedelta(days=rng.randint(0, 30), minutes=rng.randint(0, 1439))
+        processed_on = requested_on + timedelta(days=rng.randint(1, 5)) if status != 'Pending' else None
+        file_name = f"{document_type.lower().replace(' ', '_')}_{student_user}.pdf" if status == 'Approved' else None
+        yield (student_user, document_type, status, requested_on, processed_on, file_name,
+               f"/files/{file_name}" if file_name else None)
+
+
+def _bulk_hostels(layout, rng, fake, start, stop):
+    for hostel_id in range(start, stop):
+        yield (hostel_id, f"{fake.company()} Hostel"[:100], fake.address().replace("\n", ", ")[:255],
+               sum(layout.bed_count(room_id) for room_id in range((hostel_id - 1) * BULK_ROOMS_PER_HOSTEL + 1,
+                                                                  hostel_id * BULK_ROOMS_PER_HOSTEL + 1)),
+               BULK_TERM_START - timedelta(days=365))
+
+
+def _bulk_rooms(layout, rng, fake, start, stop):
+    for room_id in range(start, stop):
+        hostel_id = (room_id - 1) // BULK_ROOMS_PER_HOSTEL + 1
+        beds, occupants = layout.bed_count(room_id), layout.occupants(room_id)
+        yield (room_id, hostel_id, f"{hostel_id}-{(room_id - 1) % BULK_ROOMS_PER_HOSTEL + 1:03d}", beds, beds,
+               round(rng.uniform(50, 200), 2), occupants, 'Occupied' if occupants >= beds else 'Available',
+               BULK_TERM_START - timedelta(days=365))
+
+
+def _bulk_room_bookings(layout, rng, fake, start, stop):
+    for bed in range(start - 1, stop - 1):
+        student_id = bed + 1
+        yield (student_id, layout.room_for_bed(bed), BULK_TERM_START - timedelta(days=rng.randint(1, 7)),
+               BULK_TERM_START, BULK_TERM_START + timedelta(days=120), 'confirmed')
+
+
+def _bulk_fee_structures(layout, rng, fake, start, stop):
+    for fs_id in range(start, stop):
+        yield (fs_id, layout.fee_structure_courses[fs_id - 1], (fs_id - 1) % layout.hostels + 1,
+               BULK_ACTIVE_SEMESTER, layout.fee_amount(fs_id))
+
+
+def _bulk_payments(layout, rng, fake, start, stop):
+    methods = ['Cash', 'M-Pesa', 'Bank Transfer', 'Credit Card']
+    for student_id in range(start, stop):
+        fee_structures = layout.fee_structures_by_program[layout.program_index(student_id)]
+        for n in range(2):
+            fs_id = rng.choice(fee_structures)
+            yield (student_id, fs_id, round(layout.fee_amount(fs_id) * rng.uniform(0.2, 0.5), 2),
+                   BULK_TERM_START + timedelta(days=rng.randint(0, 60), minutes=rng.randint(0, 1439)),
+                   rng.choice(methods), f"SEED{student_id * 2 + n:010d}")
+
+
+def _bulk_fee_clearances(layout, rng, fake, start, stop):
+    for student_id in range(start, stop):
+        status = rng.choice(['Pending', 'Cleared', 'Rejected'])
+        yield (layout.name(student_id), 0.0 if status == 'Cleared' else round(rng.uniform(0, 50000), 2),
+               BULK_PROGRAMS[layout.program_index(student_id)], student_id,
+               BULK_TERM_START + timedelta(days=rng.randint(0, 90)), status)
+
+
+def _bulk_audit_logs(layout, rng, fake, start, stop):
+    for n in range(start, stop):
+        user_id = (n - 1) // 2 + 1
+        yield (rng.choice(BULK_AUDIT_ACTIONS), BULK_TERM_START + timedelta(minutes=rng.randint(0, 200000)),
+               fake.sentence(nb_words=10), user_id)
+
+
+def _bulk_registrations(layout, rng, fake, start, stop):
+    for n in range(start, stop):
+        status = 'pending' if n % 5 == 0 else rng.choice(['approved', 'rejected'])
+        yield (fake.name(), f"applicant{n}@example.com", f"APP{n:07d}", rng.choice(BULK_PROGRAMS),
+               rng.choice(BULK_DEPARTMENTS), str(rng.choice([2024, 2025])),
+               BULK_TERM_START - timedelta(days=rng.randint(0, 90)), status,
+               "Incomplete documents" if status == 'rejected' else None)
+
+
+def bulk_tables(layout):
+    """(model, columns, generator, rows) in foreign-key order"""
+    users = 1 + layout.students + layout.lecturers
+    return [
+        (User, ('id', 'name', 'email', 'password_hash', 'role'), _bulk_users, users),
+        (StudentProfile, ('id', 'name', 'user_id', 'reg_no', 'program', 'year_of_study', 'phone'),
+         _bulk_student_profiles, layout.students),
+        (LecturerProfile, ('id', 'user_id', 'staff_no', 'department', 'phone'), _bulk_lecturer_profiles, layout.lecturers),
+        (Semester, ('id', 'name', 'start_date', 'end_date', 'active'), _bulk_semesters, len(BULK_SEMESTERS)),
+        (Course, ('id', 'code', 'title', 'description', 'semester_id', 'program', 'capacity', 'lecturer_id'),
+         _bulk_courses, layout.courses),
+        (UnitRegistration, ('student_id', 'course_id', 'semester_id', 'registered_on'),
+         _bulk_unit_registrations, layout.students),
+        (Grade, ('student_id', 'course_id', 'grade', 'semester_id', 'date_posted'), _bulk_grades, layout.students),
+        (Announcement, ('title', 'content', 'date_posted', 'posted_by_id'), _bulk_announcements,
+         max(3, layout.students // 1000)),
+        (DocumentRequest, ('student_id', 'document_type', 'status', 'requested_on', 'processed_on', 'file_name',
+                           'file_path'), _bulk_document_requests, layout.students // 5),
+        (Hostel, ('id', 'name', 'location', 'capacity', 'created_at'), _bulk_hostels, layout.hostels),
+        (Room, ('id', 'hostel_id', 'room_number', 'bed_count', 'capacity', 'price_per_bed', 'current_occupants',
+                'status', 'created_at'), _bulk_rooms, layout.rooms),
+        (StudentRoomBooking, ('student_id', 'room_id', 'booked_on', 'start_date', 'end_date', 'status'),
+         _bulk_room_bookings, layout.booked_beds),
+        (FeeStructure, ('id', 'course_id', 'hostel_id', 'semester_id', 'amount'), _bulk_fee_structures,
+         len(layout.fee_structure_courses)),
+        (Payment, ('student_id', 'fee_structure_id', 'amount_paid', 'payment_date', 'payment_method',
+                   'transaction_ref'), _bulk_payments, layout.students),
+        (FeeClearance, ('student_name', 'amount_due', 'program', 'student_id', 'cleared_on', 'status'),
+         _bulk_fee_clearances, layout.students),
+        (AuditLog, ('action', 'timestamp', 'details', 'user_id'), _bulk_audit_logs, 2 * users),
+        (Registration, ('student_name', 'student_email', 'student_id', 'program_name', 'department', 'batch_year',
+                        'submitted_at', 'status', 'rejection_reason'), _bulk_registrations, layout.students // 10),
+    ]
+
+
+_worker_layout = None
+
+
+def _init_bulk_worker(layout):
+    global _worker_layout
+    _worker_layout = layout
+
+
+def _generate_chunk(generator, start, stop):
+    """Rows for ids [start, stop) of one table; deterministic for a given layout seed"""
+    chunk_seed = f"{_worker_layout.seed}:{generator.__name__}:{start}"
+    chunk_fake = Faker()
+    chunk_fake.seed_instance(chunk_seed)
+    return list(generator(_worker_layout, random.Random(chunk_seed), chunk_fake, start, stop))
+
+
+def _write_rows(model, columns, rows):
+    table = model.__table__
+    if db.engine.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = db.session.connection().connection.cursor()
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+    for offset in range(0, len(rows), BULK_BATCH_SIZE):
+        db.session.execute(insert(table), [dict(zip(columns, row)) for row in rows[offset:offset + BULK_BATCH_SIZE]])
+
+
+def seed_bulk(scale=1, workers=None, seed=0):
+    """Generate and write a campus of scale * 1000 students; returns the BulkLayout"""
+    started = time.perf_counter()
+    hashes = {role: password_hasher.hash(f"{role}pass") for role in ("admin", "student", "lecturer")}
+    layout = BulkLayout(scale, seed, hashes)
+    tables = bulk_tables(layout)
+    workers = workers or os.cpu_count() or 1
+    print(f"Bulk seeding {layout.students:,} students with {workers} generator processes...")
+
+    tasks = [(index, generator, start, min(start + BULK_CHUNK_ROWS, rows + 1))
+             for index, (_, _, generator, rows) in enumerate(tables)
+             for start in range(1, rows + 1, BULK_CHUNK_ROWS)]
+    written = [0] * len(tables)
+
+    # Chunks are generated ahead (bounded) while earlier ones are written, in table order
+    with ProcessPoolExecutor(workers, mp_context=get_context('spawn'),
+                             initializer=_init_bulk_worker, initargs=(layout,)) as pool:
+        pending = deque()
+        task_iter = iter(tasks)
+        for task in task_iter:
+            pending.append((task[0], pool.submit(_generate_chunk, *task[1:])))
+            if len(pending) >= workers * 4:
+                break
+        current = 0
+        while pending:
+            index, future = pending.popleft()
+            next_task = next(task_iter, None)
+            if next_task:
+                pending.append((next_task[0], pool.submit(_generate_chunk, *next_task[1:])))
+            if index != current:
+                db.session.commit()
+                model, _, _, rows = tables[current]
+                print(f"  {model.__tablename__:<24} {written[current]:>10,} rows  {time.perf_counter() - started:7.1f}s")
+                current = index
+            model, columns, _, _ = tables[index]
+            chunk = future.result()
+            _write_rows(model, columns, chunk)
+            written[index] += len(chunk)
+        db.session.commit()
+        print(f"  {tables[current][0].__tablename__:<24} {written[current]:>10,} rows  {time.perf_counter() - started:7.1f}s")
+
+    if db.engine.dialect.name == 'postgresql':
+        # Explicit ids were written, so move each serial past them
+        for model, columns, _, _ in tables:
+            if 'id' in columns:
+                name = model.__tablename__
+                db.session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE(MAX(id), 1)) FROM {name}"
+                ))
+
+    # Derived tables the app maintains incrementally
+    rebuild_gpa_summaries()
+    verify_fee_balances(repair=True)
+    db.session.commit()
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as conn:
+            conn.execution_options(isolation_level='AUTOCOMMIT').execute(text('ANALYZE'))
+    print(f"✅ Bulk seeding complete: {sum(written):,} rows in {time.perf_counter() - started:.1f}s")
+    return layout
+
+
+def reset_schema():
+    """Drop and recreate every table, then mark the database as at the latest migration"""
+    if db.engine.dialect.name == 'postgresql':
         db.session.execute(text('DROP TABLE IF EXISTS fee_structures CASCADE'))
-        db.session.commit(),
-        db.metadata.drop_all(engine)
-        db.metadata.create_all(engine)
+        db.session.commit()
+    db.metadata.drop_all(db.engine)
+    db.metadata.create_all(db.engine)
+    with db.engine.begin() as conn:
+        conn.execute(text('DROP TABLE IF EXISTS alembic_version'))
+    stamp(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the portal database (drops every table first)")
+    parser.add_argument('--bulk', action='store_true', help='generate a large dataset instead of the demo campus')
+    parser.add_argument('--scale', type=float, default=1, help='bulk mode: thousands of students')
+    parser.add_argument('--workers', type=int, default=None, help='bulk mode: generator processes (default: CPUs)')
+    parser.add_argument('--seed', type=int, default=0, help='random / Faker seed, for repeatable datasets')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+    with app.app_context():
+        reset_schema()
+        if args.bulk:
+            seed_bulk(args.scale, args.workers, args.seed)
+            return
+
         admin, students, lecturers = create_users()
         create_profiles(students, lecturers)
         semesters = create_semesters()
@@ -617,4 +1018,8 @@ if __name__ == "__main__":
         seed_payments()
         seed_fee_clearances()
         seed_audit_logs()
-        print("✅ Database seeding complete!")
\ No newline at end of file
+        print("✅ Database seeding complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import keyword
+import os
+from functools import lru_cache
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import inspect
+from sqlalchemy.types import Date, DateTime
+
+try:
+    import orjson
+except ImportError:  # optional: plain json is used without it
+    orjson = None
+
+# -------------------- Compiled serializers --------------------
+#
+# to_dict used to loop over serialize_rules with getattr and test every value
+# for datetimes on every call. Instead, each (model, fields) pair is compiled
+# once into a function with a literal dict body, e.g.
+#
+#     def serialize(obj):
+#         d = obj.__dict__
+#         try:
+#             v2 = d['start_date']
+#             return {'id': d['id'], 'name': d['name'], 'start_date': v2.isoformat() if v2 is not None else None}
+#         except KeyError:
+#             return _by_attribute(obj)
+#
+# Loaded column values are read straight from the instance dict; expired or
+# deferred ones fall back to normal attribute access, which loads them.
+# positional=True compiles a variant for Rows from a column projection in the
+# same field order, which unpacks the tuple instead.
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(model, fields, positional=False):
+    """Return a function mapping a `model` instance (or a projected Row) to a dict of `fields`"""
+    mapper = inspect(model)
+    columns = mapper.columns
+    relationships = mapper.relationships
+    namespace = {'_nested': _nested, '_nested_list': _nested_list}
+
+    def body(read):
+        lines, items = [], []
+        for position, field in enumerate(fields):
+            value = read(position, field)
+            if field in relationships:
+                if positional:
+                    raise ValueError(f'{model.__name__}.{field} is a relationship; it cannot come from a row')
+                value = f"{'_nested_list' if relationships[field].uselist else '_nested'}({value})"
+            elif field in columns and isinstance(columns[field].type, (DateTime, Date)):
+                lines.append(f'v{position} = {value}')
+                value = f'v{position}.isoformat() if v{position} is not None else None'
+            items.append(f'{field!r}: {value}')
+        return lines + ['return {' + ', '.join(items) + '}']
+
+    def by_attribute(position, field):
+        if field.isidentifier() and not keyword.iskeyword(field):
+            return f'obj.{field}'
+        namespace[f'f{position}'] = field
+        return f'getattr(obj, f{position})'
+
+    if positional:
+        unpack = ', '.join(f'r{position}' for position in range(len(fields)))
+        source = ['def serialize(obj):', f'    ({unpack},) = obj']
+        source += ['    ' + line for line in body(lambda position, field: f'r{position}')]
+    else:
+        source = ['def _by_attribute(obj):'] + ['    ' + line for line in body(by_attribute)]
+        source += ['def serialize(obj):', '    d = obj.__dict__', '    try:']
+        source += ['        ' + line for line in body(
+            lambda position, field: f'd[{field!r}]' if field in columns else by_attribute(position, field)
+        )]
+        source += ['    except KeyError:', '        return _by_attribute(obj)']
+
+    exec('\n'.join(source), namespace)
+    serialize = namespace['serialize']
+    serialize.__qualname__ = f'serialize_{model.__name__}'
+    return serialize
+
+
+def _nested(obj):
+    return obj.to_dict() if obj is not None else None
+
+
+def _nested_list(objs):
+    return [obj.to_dict() for obj in objs]
+
+
+def serialize(obj, fields=()):
+    """Serialize one instance with its model's serialize_rules (or the given fields)"""
+    model = type(obj)
+    return compile_serializer(model, tuple(fields or model.serialize_rules))(obj)
+
+
+def serialize_rows(rows, model, fields):
+    """Serialize Rows from a projection of `fields` (in that order) on `model`"""
+    convert = compile_serializer(model, tuple(fields), positional=True)
+    return [convert(row) for row in rows]
+
+
+# -------------------- JSON provider --------------------
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, producing JSON equivalent to the default.
+
+    Dates still go through Flask's default handler (HTTP date strings) and
+    keys are sorted as with the stdlib provider; the only visible difference
+    is raw UTF-8 instead of \\u escapes. Pretty-printed output (debug mode)
+    falls back to the stdlib encoder.
+    """
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.options).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.options), mimetype=self.mimetype
+        )
+
+
+def init_json(app):
+    """Use OrjsonProvider when orjson is installed, unless FAST_JSON is turned off"""
+    enabled = app.config.setdefault('FAST_JSON', os.environ.get('FAST_JSON', '1') != '0')
+    if enabled and orjson is not None:
+        app.json_provider_class = OrjsonProvider
+        app.json = OrjsonProvider(app)
+    return app.json
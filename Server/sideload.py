@@ -0,0 +1,74 @@
+from flask import request
+
+from models import db, Course, FeeStructure, Hostel, Semester
+from bulk import chunked
+
+# include name -> (model, foreign key on the flat row, key in the `included` lookup)
+RELATIONS = {
+    'course': (Course, 'course_id', 'courses'),
+    'hostel': (Hostel, 'hostel_id', 'hostels'),
+    'semester': (Semester, 'semester_id', 'semesters'),
+    'fee_structure': (FeeStructure, 'fee_structure_id', 'fee_structures'),
+}
+
+
+def requested_includes(allowed):
+    """Relations to side-load for ?shape=flat / ?include=a,b, or None for the nested shape"""
+    include = request.args.get('include')
+    if include is None:
+        return list(allowed) if request.args.get('shape') == 'flat' else None
+    names = [name.strip() for name in include.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return names
+
+
+def flat_fee_structure(row):
+    return {
+        'id': row.id,
+        'course_id': row.course_id,
+        'hostel_id': row.hostel_id,
+        'semester_id': row.semester_id,
+        'amount': row.amount
+    }
+
+
+def flat_fee_structures(ids=None):
+    """Fee structures as id-only dicts, from a column projection (no relationship loads)"""
+    query = db.session.query(
+        FeeStructure.id, FeeStructure.course_id, FeeStructure.hostel_id, FeeStructure.semester_id, FeeStructure.amount
+    )
+    if ids is None:
+        return [flat_fee_structure(row) for row in query.order_by(FeeStructure.id)]
+    rows = []
+    for chunk in chunked(ids):
+        rows.extend(flat_fee_structure(row) for row in query.filter(FeeStructure.id.in_(chunk)))
+    return rows
+
+
+def side_load(rows, names):
+    """{'courses': {id: {...}}, ...} for every related id referenced by `rows`, one IN query per relation.
+
+    Fee structures are expanded first, so a payment listing can also side-load
+    the courses, hostels and semesters its fee structures point at.
+    """
+    included = {}
+    sources = list(rows)
+    if 'fee_structure' in names:
+        fee_structures = flat_fee_structures({row['fee_structure_id'] for row in rows})
+        included['fee_structures'] = {fs['id']: fs for fs in fee_structures}
+        sources = fee_structures
+    elif rows and 'fee_structure_id' in rows[0] and set(names) - {'fee_structure'}:
+        sources = flat_fee_structures({row['fee_structure_id'] for row in rows})
+
+    for name in names:
+        if name == 'fee_structure':
+            continue
+        model, foreign_key, key = RELATIONS[name]
+        ids = {row[foreign_key] for row in sources if row.get(foreign_key) is not None}
+        objects = {}
+        for chunk in chunked(ids):
+            objects.update((obj.id, obj.to_dict()) for obj in model.query.filter(model.id.in_(chunk)))
+        included[key] = objects
+    return included
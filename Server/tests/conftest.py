@@ -0,0 +1,140 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, insert
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before app is imported: the engine and extensions read them at import time
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'tests.db')
+os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+from app import app as flask_app
+from availability import invalidate_availability_index
+from catalogue import bump_catalogue_generation
+from clearance_stats import invalidate_clearance_stats
+from identity import _identities
+from prerequisites import invalidate_prerequisite_graph
+from models import db, User, StudentProfile, LecturerProfile, Course, Semester, Hostel, Room, FeeStructure
+
+STUDENT_PASSWORD = 'studentpass'
+ADMIN_PASSWORD = 'adminpass'
+
+
+def _reset_caches():
+    # Per-worker caches outlive the tables dropped between tests
+    bump_catalogue_generation()
+    invalidate_prerequisite_graph()
+    invalidate_availability_index()
+    invalidate_clearance_stats()
+    _identities.clear()
+
+
+@pytest.fixture
+def app():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.create_all()
+        _reset_caches()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        _reset_caches()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    """Bearer headers for a user, from a token issued by /api/login"""
+    def headers(email, password):
+        response = client.post('/api/login', json={'email': email, 'password': password})
+        assert response.status_code == 200
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return headers
+
+
+@pytest.fixture
+def admin(app):
+    user = User(name='Admin User', email='admin@university.edu', role='admin')
+    user.set_password(ADMIN_PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def admin_headers(admin, login):
+    return login(admin.email, ADMIN_PASSWORD)
+
+
+@pytest.fixture
+def campus(app):
+    """A small campus: one program, two semesters, four courses, three students and a hostel"""
+    semesters = [
+        Semester(name='Semester 1', start_date=datetime(2025, 1, 15), end_date=datetime(2025, 5, 15), active=True),
+        Semester(name='Semester 2', start_date=datetime(2025, 9, 1), end_date=datetime(2025, 12, 20)),
+    ]
+    lecturer = User(name='Lecturer One', email='lecturer1@university.edu', role='lecturer')
+    lecturer.set_password('lecturerpass')
+    lecturer.lecturer_profile = LecturerProfile(staff_no='STF001', department='Computing')
+
+    students = []
+    for i in range(1, 4):
+        user = User(name=f'Student {i}', email=f'student{i}@university.edu', role='student')
+        user.set_password(STUDENT_PASSWORD)
+        user.student_profile = StudentProfile(name=f'Student {i}', reg_no=f'REG{i:03d}', program='BSC-CS',
+                                              year_of_study=1)
+        students.append(user)
+
+    db.session.add_all([*semesters, lecturer, *students])
+    db.session.flush()
+
+    courses = [Course(code=f'CS10{i}', title=f'Course {i}', semester_id=semesters[0].id, program='BSC-CS',
+                      lecturer_id=lecturer.lecturer_profile.id) for i in range(1, 5)]
+    hostel = Hostel(name='North Hall', location='Campus', capacity=10)
+    db.session.add_all([*courses, hostel])
+    db.session.flush()
+
+    rooms = [Room(hostel_id=hostel.id, room_number=f'N{i}', bed_count=2, capacity=2, price_per_bed=100.0,
+                  status='available') for i in range(1, 3)]
+    fee_structure = FeeStructure(course_id=courses[0].id, hostel_id=hostel.id, semester_id=semesters[0].id,
+                                 amount=1000.0)
+    db.session.add_all([*rooms, fee_structure])
+    db.session.commit()
+
+    return SimpleNamespace(semesters=semesters, lecturer=lecturer, students=students, courses=courses,
+                           hostel=hostel, rooms=rooms, fee_structure=fee_structure)
+
+
+@pytest.fixture
+def racing_insert(app):
+    """Context manager that commits a row on another connection just before our own INSERT into the
+    same table, the way a concurrent request that passed the same checks would"""
+    @contextmanager
+    def racing(model, **values):
+        pending = [values]
+
+        def insert_first(conn, clauseelement, multiparams, params, execution_options):
+            table = getattr(clauseelement, 'table', None)
+            if pending and getattr(clauseelement, 'is_insert', False) and table is not None \
+                    and table.name == model.__tablename__:
+                with db.engine.begin() as other:
+                    other.execute(insert(model).values(**pending.pop()))
+
+        event.listen(db.engine, 'before_execute', insert_first)
+        try:
+            yield
+        finally:
+            event.remove(db.engine, 'before_execute', insert_first)
+    return racing
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from db_pool import pool_monitor
+
+STATS_ENDPOINTS = ['/api/admin/cache-stats', '/api/admin/password-hashing-stats', '/api/admin/pool-stats']
+
+
+@pytest.mark.parametrize('url', STATS_ENDPOINTS)
+def test_stats_endpoints_need_an_admin_token(client, admin_headers, url):
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers=admin_headers).status_code == 200
+
+
+def test_queue_pool_stats_never_report_negative_overflow(client, admin_headers):
+    stats = client.get('/api/admin/pool-stats', headers=admin_headers).get_json()
+
+    assert stats['pool'] == 'QueuePool'
+    assert stats['overflow'] == 0
+    assert stats['in_use'] >= 0 and stats['idle'] >= 0
+
+
+@pytest.mark.parametrize('poolclass', [NullPool, StaticPool])
+def test_other_pools_report_only_their_class(poolclass):
+    engine = create_engine('sqlite://', poolclass=poolclass)
+    with engine.connect():
+        assert pool_monitor.stats(engine) == {'pool': poolclass.__name__}
@@ -0,0 +1,36 @@
+import numpy as np
+
+from analytics import GRADE_CODE, UNKNOWN_PROGRAM, GradeColumns, crosstab, summarize
+from models import db, Grade
+
+
+def columns(rows, course_programs):
+    letters, course_ids, semester_ids = zip(*rows)
+    return GradeColumns(np.array([GRADE_CODE.get(letter, -1) for letter in letters], dtype=np.int8),
+                        np.array(course_ids, dtype=np.int32), np.array(semester_ids, dtype=np.int32),
+                        course_programs)
+
+
+def test_grades_for_unknown_courses_are_not_credited_to_another_program():
+    data = columns([('A', 1, 1), ('C', 2, 1), ('E', 7, 1), ('B', 40, 2)], {1: 'BSC-CS', 2: 'BSC-IT'})
+
+    groups = {g['program']: g['count'] for g in summarize(data, 'program')}
+
+    assert groups == {'BSC-CS': 1, 'BSC-IT': 1, UNKNOWN_PROGRAM: 2}
+    table = crosstab(data, 'program', 'semester')
+    assert table['rows'] == [UNKNOWN_PROGRAM, 'BSC-CS', 'BSC-IT']
+    assert table['counts'] == [[1, 1], [1, 0], [1, 0]]
+
+
+def test_analytics_endpoint_groups_orphaned_grades_as_unknown(client, campus, admin_headers):
+    student, semester = campus.students[0], campus.semesters[0]
+    db.session.add_all([Grade(student_id=student.id, course_id=campus.courses[0].id, semester_id=semester.id,
+                              grade='A'),
+                        Grade(student_id=student.id, course_id=999, semester_id=semester.id, grade='C')])
+    db.session.commit()
+
+    response = client.get('/api/admin/analytics/grades?group_by=program', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert {g['program']: g['mean_points'] for g in response.get_json()['groups']} == {
+        'BSC-CS': 4.0, UNKNOWN_PROGRAM: 2.0}
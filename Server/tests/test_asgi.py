@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+from asgi import application
+
+
+def asgi_get(path, query_string=b''):
+    """Run one GET through the ASGI app; returns (status, headers, body)"""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query_string,
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    asyncio.run(application(scope, receive, send))
+
+    start = next(message for message in messages if message['type'] == 'http.response.start')
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return start['status'], dict(start['headers']), body
+
+
+def test_asgi_app_serves_a_request(client, campus):
+    status, headers, body = asgi_get('/api/courses', b'program=BSC-CS')
+
+    assert status == 200
+    assert headers[b'content-type'] == b'application/json'
+    assert body == client.get('/api/courses?program=BSC-CS').get_data()
+    assert [course['code'] for course in json.loads(body)] == ['CS101', 'CS102', 'CS103', 'CS104']
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import availability
+from availability import get_availability_index
+from models import db, Room
+
+TERM = {'start_date': '2025-01-15', 'end_date': '2025-05-15'}
+NEXT_TERM = {'start_date': '2025-05-15', 'end_date': '2025-09-12'}
+
+
+@pytest.fixture
+def index(app, campus):
+    """The warmed index; tests assert it is updated in place rather than rebuilt"""
+    return get_availability_index()
+
+
+def free_beds(client, room, **params):
+    rooms = client.get('/api/rooms/availability', query_string=params).get_json()['rooms']
+    return next((entry['free_beds'] for entry in rooms if entry['room_id'] == room.id), 0)
+
+
+def book(client, student, room, dates):
+    response = client.post('/api/bookings', json={'student_id': student.student_profile.id, 'room_id': room.id,
+                                                  **dates})
+    assert response.status_code == 201
+    return response.get_json()['booking']['id']
+
+
+def test_booking_and_cancelling_update_the_index_in_place(client, campus, index):
+    room = campus.rooms[0]
+    assert free_beds(client, room, **TERM) == 2
+
+    booking_id = book(client, campus.students[0], room, TERM)
+    assert free_beds(client, room, **TERM) == 1
+    assert free_beds(client, room, **NEXT_TERM) == 2
+
+    assert client.delete(f'/api/bookings/{booking_id}').status_code == 200
+    assert free_beds(client, room, **TERM) == 2
+    assert get_availability_index() is index
+
+
+def test_full_room_is_still_offered_for_other_dates(client, campus, index):
+    room = campus.rooms[0]
+    book(client, campus.students[0], room, TERM)
+    book(client, campus.students[1], room, TERM)
+
+    assert free_beds(client, room, **TERM) == 0
+    assert free_beds(client, room, **NEXT_TERM) == 2
+
+
+def test_bookings_covering_today_change_the_undated_count(client, campus, index):
+    room = campus.rooms[0]
+    today = datetime.utcnow().date()
+    current = {'start_date': f'{today - timedelta(days=5):%Y-%m-%d}',
+               'end_date': f'{today + timedelta(days=5):%Y-%m-%d}'}
+
+    book(client, campus.students[0], room, TERM)  # in the past: holds no bed today
+    assert free_beds(client, room) == 2
+
+    booking_id = book(client, campus.students[1], room, current)
+    assert free_beds(client, room) == 1
+
+    client.delete(f'/api/bookings/{booking_id}')
+    assert free_beds(client, room) == 2
+
+
+def test_rejected_booking_leaves_the_index_alone(client, campus, index):
+    room = campus.rooms[0]
+    book(client, campus.students[0], room, TERM)
+
+    response = client.post('/api/bookings', json={'student_id': campus.students[0].student_profile.id,
+                                                  'room_id': campus.rooms[1].id, **TERM})
+    assert response.status_code == 409
+    assert free_beds(client, campus.rooms[1], **TERM) == 2
+
+
+def test_room_edits_rebuild_the_index(client, campus, index):
+    room = db.session.get(Room, campus.rooms[0].id)
+    room.price_per_bed = 500.0
+    db.session.commit()
+
+    assert availability._index is None
+    assert free_beds(client, room, max_price=200) == 0
+    assert free_beds(client, room) == 2
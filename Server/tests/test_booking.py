@@ -0,0 +1,99 @@
+import threading
+from datetime import datetime, timedelta
+
+from models import db, Room, StudentRoomBooking
+
+
+def _single_bed_room(campus):
+    room = Room(hostel_id=campus.hostel.id, room_number='SINGLE', bed_count=1, capacity=1, price_per_bed=150.0,
+                status='available')
+    db.session.add(room)
+    db.session.commit()
+    return room
+
+
+def _book(client, student, room, start_date, end_date):
+    return client.post('/api/bookings', json={'student_id': student.student_profile.id, 'room_id': room.id,
+                                              'start_date': start_date, 'end_date': end_date})
+
+
+def test_concurrent_bookings_by_one_student_for_different_rooms(app, campus):
+    rooms = [Room(hostel_id=campus.hostel.id, room_number=f'S{i}', bed_count=2, capacity=2, price_per_bed=100.0,
+                  status='available') for i in range(8)]
+    db.session.add_all(rooms)
+    db.session.commit()
+    room_ids = [room.id for room in rooms]
+    student_id = campus.students[0].student_profile.id
+
+    barrier = threading.Barrier(len(room_ids))
+    statuses = []
+
+    def book(room_id):
+        client = app.test_client()
+        barrier.wait()
+        response = client.post('/api/bookings', json={'student_id': student_id, 'room_id': room_id,
+                                                      'start_date': '2025-01-15', 'end_date': '2025-05-15'})
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=book, args=(room_id,)) for room_id in room_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [201] + [409] * (len(room_ids) - 1)
+    assert StudentRoomBooking.query.filter_by(student_id=student_id).count() == 1
+    booked = StudentRoomBooking.query.filter(StudentRoomBooking.room_id.in_(room_ids)).count()
+    assert booked == 1
+
+
+def test_booking_for_unknown_student_is_not_found(client, campus):
+    response = client.post('/api/bookings', json={'student_id': 999, 'room_id': campus.rooms[0].id,
+                                                  'start_date': '2025-01-15', 'end_date': '2025-05-15'})
+
+    assert response.status_code == 404
+
+
+def test_one_bed_room_takes_bookings_in_disjoint_terms(client, campus):
+    room = _single_bed_room(campus)
+
+    first = _book(client, campus.students[0], room, '2025-01-15', '2025-05-15')
+    second = _book(client, campus.students[1], room, '2025-05-15', '2025-09-12')
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+
+
+def test_one_bed_room_refuses_an_overlapping_booking(client, campus):
+    room = _single_bed_room(campus)
+
+    first = _book(client, campus.students[0], room, '2025-01-15', '2025-05-15')
+    second = _book(client, campus.students[1], room, '2025-05-01', '2025-09-12')
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.get_json()['error'] == 'Room is not available'
+
+
+def test_current_occupants_follow_bookings_covering_today(client, campus):
+    room = _single_bed_room(campus)
+    today = datetime.utcnow().date()
+    current = (f'{today - timedelta(days=10):%Y-%m-%d}', f'{today + timedelta(days=10):%Y-%m-%d}')
+    later = (f'{today + timedelta(days=30):%Y-%m-%d}', f'{today + timedelta(days=60):%Y-%m-%d}')
+
+    past = _book(client, campus.students[0], room, '2020-01-15', '2020-05-15')
+    db.session.refresh(room)
+    assert past.status_code == 201
+    assert (room.current_occupants, room.status) == (0, 'available')
+
+    now = _book(client, campus.students[1], room, *current)
+    db.session.refresh(room)
+    assert now.status_code == 201
+    assert (room.current_occupants, room.status) == (1, 'occupied')
+
+    # Full today, but free next month
+    assert _book(client, campus.students[2], room, *later).status_code == 201
+
+    assert client.delete(f"/api/bookings/{now.get_json()['booking']['id']}").status_code == 200
+    db.session.refresh(room)
+    assert (room.current_occupants, room.status) == (0, 'available')
@@ -0,0 +1,20 @@
+import catalogue
+from catalogue import CATALOGUE_MAX_ENTRIES, get_catalogue
+
+
+def test_arbitrary_program_values_do_not_grow_the_cache(client, campus):
+    for i in range(CATALOGUE_MAX_ENTRIES + 50):
+        assert client.get(f'/api/courses?program=junk-{i}').get_json() == []
+
+    assert len(catalogue._entries) == CATALOGUE_MAX_ENTRIES
+
+
+def test_catalogue_slice_is_rebuilt_after_a_course_write(client, campus):
+    body, etag = get_catalogue(program='BSC-CS')
+
+    response = client.put(f'/api/courses/{campus.courses[0].id}', json={'title': 'Renamed'})
+
+    assert response.status_code == 200
+    new_body, new_etag = get_catalogue(program='BSC-CS')
+    assert new_etag != etag and 'Renamed' in new_body
+    assert client.get('/api/courses?program=BSC-CS', headers={'If-None-Match': new_etag}).status_code == 304
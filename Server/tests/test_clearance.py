@@ -0,0 +1,55 @@
+from models import db, FeeClearance
+
+
+def add_clearances(campus, statuses):
+    for student, (status, amount_due) in zip(campus.students, statuses):
+        db.session.add(FeeClearance(student_id=student.student_profile.id, student_name=student.name,
+                                    program='BSC-CS', status=status, amount_due=amount_due))
+    db.session.commit()
+
+
+def test_clearance_listing_includes_grouped_stats(client, campus):
+    add_clearances(campus, [('cleared', 0.0), ('Pending', 1500.0), ('flagged', 250.0)])
+
+    response = client.get('/api/admin/clearance')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [c['student_name'] for c in body['clearances']] == ['Student 1', 'Student 2', 'Student 3']
+    assert body['stats'] == {'total': 3, 'cleared': 1, 'pending': 1, 'flagged': 1, 'total_amount_due': 1750.0}
+
+
+def test_clearance_listing_filters_and_aggregates_with_the_same_criteria(client, campus):
+    add_clearances(campus, [('cleared', 0.0), ('Pending', 1500.0), ('pending', 500.0)])
+
+    body = client.get('/api/admin/clearance?status=pending').get_json()
+
+    assert [c['student_name'] for c in body['clearances']] == ['Student 2', 'Student 3']
+    assert body['stats'] == {'total': 2, 'cleared': 0, 'pending': 2, 'flagged': 0, 'total_amount_due': 2000.0}
+
+    body = client.get('/api/admin/clearance?search=Student 1').get_json()
+    assert [c['student_name'] for c in body['clearances']] == ['Student 1']
+    assert body['stats']['total'] == 1
+
+
+def test_clearance_stats_endpoint_is_registered(client, campus, admin_headers):
+    add_clearances(campus, [('cleared', 0.0), ('pending', 1500.0)])
+
+    response = client.get('/api/admin/clearance/stats?by=program', headers=admin_headers)
+
+    assert response.status_code == 200
+    stats = response.get_json()['stats']
+    assert stats['total'] == 2 and stats['cleared'] == 1 and stats['pending'] == 1
+    assert stats['programs'] == [{'program': 'BSC-CS', 'total': 2, 'cleared': 1, 'pending': 1, 'flagged': 0,
+                                  'total_amount_due': 1500.0}]
+
+
+def test_clearance_stats_refresh_after_a_committed_status_change(client, campus, admin_headers):
+    add_clearances(campus, [('pending', 1500.0)])
+    assert client.get('/api/admin/clearance/stats', headers=admin_headers).get_json()['stats']['pending'] == 1
+
+    response = client.put(f'/admin/clearance/{campus.students[0].student_profile.id}', json={'status': 'cleared'})
+
+    assert response.status_code == 200
+    stats = client.get('/api/admin/clearance/stats', headers=admin_headers).get_json()['stats']
+    assert stats['pending'] == 0 and stats['cleared'] == 1
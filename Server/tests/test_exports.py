@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from models import db, AuditLog, DocumentRequest, Grade, Payment, StudentRoomBooking
+
+# Every listing with a streaming export
+EXPORTS = ['/api/payments', '/api/grades/', '/api/bookings', '/api/audit_logs', '/api/document_requests']
+
+
+@pytest.fixture
+def exported(campus):
+    """One row behind each export"""
+    student, user = campus.students[0].student_profile, campus.students[0]
+    db.session.add_all([
+        Payment(student_id=student.id, fee_structure_id=campus.fee_structure.id, amount_paid=250.0,
+                payment_date=datetime(2025, 2, 1), payment_method='bank'),
+        Grade(student_id=user.id, course_id=campus.courses[0].id, semester_id=campus.semesters[0].id, grade='A',
+              date_posted=datetime(2025, 5, 20)),
+        StudentRoomBooking(student_id=student.id, room_id=campus.rooms[0].id, start_date=datetime(2025, 1, 15),
+                           end_date=datetime(2025, 5, 15), status='confirmed'),
+        AuditLog(action='Login', user_id=user.id, details='from the tests'),
+        DocumentRequest(student_id=user.id, document_type='Transcript'),
+    ])
+    db.session.commit()
+
+
+def export(client, url, fmt):
+    response = client.get(f'{url}?format={fmt}&stream=1')
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize('url', EXPORTS)
+def test_csv_header_matches_the_ndjson_keys(client, exported, url):
+    ndjson = export(client, url, 'ndjson')
+    rows = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    csv_rows = list(csv.reader(io.StringIO(export(client, url, 'csv').get_data(as_text=True))))
+
+    assert ndjson.mimetype == 'application/x-ndjson'
+    assert len(rows) == 1
+    assert csv_rows[0] == list(rows[0])
+    assert len(csv_rows) == 2
+
+
+@pytest.mark.parametrize('url', EXPORTS)
+def test_empty_csv_export_still_has_its_header(client, campus, url):
+    body = export(client, url, 'csv').get_data(as_text=True)
+
+    assert len(body.splitlines()) == 1
+    assert body.split(',')[0] in ('id', 'action')
+
+
+def test_empty_ndjson_export_is_empty(client, campus):
+    assert export(client, '/api/payments', 'ndjson').get_data(as_text=True) == ''
+
+
+def test_csv_export_is_an_attachment_with_one_line_per_row(client, campus):
+    student = campus.students[0].student_profile
+    db.session.add_all(Payment(student_id=student.id, fee_structure_id=campus.fee_structure.id, amount_paid=10.0 * i,
+                               payment_date=datetime(2025, 2, i), payment_method='bank') for i in range(1, 6))
+    db.session.commit()
+
+    response = export(client, '/api/payments', 'csv')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=payments.csv'
+    assert [float(row['amount']) for row in rows] == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+
+def test_streaming_needs_both_format_and_stream(client, campus):
+    response = client.get('/api/payments?format=csv')
+
+    assert response.mimetype == 'application/json'
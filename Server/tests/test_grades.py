@@ -0,0 +1,102 @@
+import io
+
+from models import db, Grade
+
+
+def grade_row(student, course, semester, grade):
+    return {'student_id': student.id, 'course_id': course.id, 'semester_id': semester.id, 'grade': grade}
+
+
+def test_batch_reports_every_invalid_row_and_inserts_the_rest(client, campus):
+    s1, s2, _ = campus.students
+    c1, c2, c3, _ = campus.courses
+    semester = campus.semesters[0]
+    db.session.add(Grade(student_id=s2.id, course_id=c1.id, semester_id=semester.id, grade='B'))
+    db.session.commit()
+
+    rows = [
+        grade_row(s1, c1, semester, 'a'),                                      # ok, normalised to A
+        {'student_id': s1.id, 'course_id': c2.id, 'semester_id': semester.id},  # missing grade
+        {**grade_row(s1, c2, semester, 'B'), 'course_id': 'two'},              # not an integer
+        grade_row(s1, c2, semester, 'Z'),                                      # not on the scale
+        {**grade_row(s1, c2, semester, 'B'), 'student_id': 999},               # unknown student
+        {**grade_row(s1, c2, semester, 'B'), 'course_id': 999},                # unknown course
+        {**grade_row(s1, c2, semester, 'B'), 'semester_id': 999},              # unknown semester
+        grade_row(s2, c1, semester, 'A'),                                      # already graded
+        grade_row(s1, c1, semester, 'C'),                                      # repeats row 0
+        grade_row(s1, c3, semester, 'b+'),                                     # ok
+        'not a row',
+    ]
+
+    response = client.post('/api/grades/batch', json={'grades': rows})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['inserted'] == 2
+    assert [(e['row'], e['error']) for e in body['errors']] == [
+        (1, 'Missing required fields'),
+        (2, 'student_id, course_id and semester_id must be integers'),
+        (3, 'Invalid grade. Valid grades are: A, B+, B, C+, C, D+, D, E'),
+        (4, 'Student not found'),
+        (5, 'Course not found'),
+        (6, 'Semester not found'),
+        (7, 'Grade already exists for this student, course, and semester'),
+        (8, 'Grade already exists for this student, course, and semester'),
+        (10, 'Missing required fields'),
+    ]
+    assert sorted((g.course_id, g.grade) for g in Grade.query.filter_by(student_id=s1.id)) == [
+        (c1.id, 'A'), (c3.id, 'B+')]
+
+
+def test_batch_with_no_valid_rows_writes_nothing(client, campus):
+    student, course, semester = campus.students[0], campus.courses[0], campus.semesters[0]
+
+    response = client.post('/api/grades/batch', json=[grade_row(student, course, semester, 'Q')])
+
+    assert response.status_code == 400
+    assert response.get_json()['inserted'] == 0
+    assert Grade.query.count() == 0
+
+
+def test_batch_accepts_a_csv_upload(client, campus):
+    student, semester = campus.students[0], campus.semesters[0]
+    csv_body = 'student_id,course_id,semester_id,grade\n' + ''.join(
+        f'{student.id},{course.id},{semester.id},{letter}\n' for course, letter in zip(campus.courses, 'ABCD'))
+
+    response = client.post('/api/grades/batch', data={'file': (io.BytesIO(csv_body.encode()), 'grades.csv')},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 201
+    assert response.get_json() == {'message': 'Grades submitted successfully', 'inserted': 4, 'errors': []}
+
+
+def test_batch_rejects_an_empty_or_oversized_payload(client, campus, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, 'GRADE_BATCH_MAX_ROWS', 2)
+    row = grade_row(campus.students[0], campus.courses[0], campus.semesters[0], 'A')
+
+    assert client.post('/api/grades/batch', json={'grades': []}).status_code == 400
+    assert client.post('/api/grades/batch', json={'grades': [row] * 3}).status_code == 400
+    assert Grade.query.count() == 0
+
+
+def test_racing_duplicate_grade_is_a_conflict(client, campus, racing_insert):
+    student, course, semester = campus.students[0], campus.courses[0], campus.semesters[0]
+    row = grade_row(student, course, semester, 'A')
+
+    with racing_insert(Grade, **{**row, 'grade': 'B'}):
+        response = client.post('/api/grades/', json=row)
+
+    assert response.status_code == 409
+    assert [g.grade for g in Grade.query.all()] == ['B']
+
+
+def test_racing_duplicate_in_a_batch_writes_nothing(client, campus, racing_insert):
+    student, semester = campus.students[0], campus.semesters[0]
+    rows = [grade_row(student, course, semester, 'A') for course in campus.courses]
+
+    with racing_insert(Grade, **{**rows[2], 'grade': 'B'}):
+        response = client.post('/api/grades/batch', json=rows)
+
+    assert response.status_code == 409
+    assert [g.grade for g in Grade.query.all()] == ['B']
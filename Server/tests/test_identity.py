@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from sqlalchemy import text
+
+from conftest import STUDENT_PASSWORD
+from identity import IDENTITY_CACHE_TTL
+from models import db
+
+ADMIN_ENDPOINT = '/api/admin/clearance/stats'
+
+
+@pytest.fixture
+def after_ttl(monkeypatch):
+    """Move the cache clock past the identity TTL"""
+    def expire():
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now + IDENTITY_CACHE_TTL + 1)
+    return expire
+
+
+def elsewhere(statement, **params):
+    # A write by another worker: its own connection, none of this session's events
+    with db.engine.begin() as conn:
+        conn.execute(text(statement), params)
+
+
+def test_admin_endpoints_need_an_admin_token(client, campus, admin_headers, login):
+    student = login(campus.students[0].email, STUDENT_PASSWORD)
+
+    assert client.get(ADMIN_ENDPOINT).status_code == 401
+    assert client.get(ADMIN_ENDPOINT, headers=student).status_code == 403
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200
+
+
+def test_role_change_applies_on_the_next_request(client, admin, admin_headers):
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200
+
+    demoted = client.put(f'/api/users/{admin.id}', json={'role': 'lecturer', 'staff_no': 'STF900',
+                                                         'department': 'Computing'})
+    assert demoted.status_code == 200
+
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 403
+
+
+def test_role_change_by_another_worker_applies_after_the_ttl(client, admin, admin_headers, after_ttl):
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200
+
+    elsewhere("UPDATE users SET role = 'student' WHERE id = :id", id=admin.id)
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200  # still cached
+
+    after_ttl()
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 403
+
+
+def test_deleted_user_is_not_honoured(client, admin, admin_headers):
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200
+
+    assert client.delete(f'/api/users/{admin.id}').status_code == 200
+
+    response = client.get(ADMIN_ENDPOINT, headers=admin_headers)
+    assert response.status_code == 404
+    assert response.get_json()['error'] == 'User not found'
+
+
+def test_user_deleted_by_another_worker_expires_with_the_ttl(client, admin, admin_headers, after_ttl):
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 200
+
+    elsewhere('DELETE FROM users WHERE id = :id', id=admin.id)
+    after_ttl()
+
+    assert client.get(ADMIN_ENDPOINT, headers=admin_headers).status_code == 404
@@ -0,0 +1,128 @@
+import io
+
+import pytest
+
+from ledger import record_payment_changes, verify_fee_balances
+from models import db, FeeBalance, FeeStructure, Payment
+
+
+@pytest.fixture
+def fees(campus):
+    """Two fee structures in the first semester, one in the second"""
+    first, second = campus.semesters
+    structures = [campus.fee_structure,
+                  FeeStructure(course_id=campus.courses[1].id, hostel_id=campus.hostel.id, semester_id=first.id,
+                               amount=400.0),
+                  FeeStructure(course_id=campus.courses[2].id, hostel_id=campus.hostel.id, semester_id=second.id,
+                               amount=800.0)]
+    db.session.add_all(structures[1:])
+    db.session.commit()
+    return structures
+
+
+def balances():
+    return {(row.student_id, row.semester_id): (pytest.approx(row.amount_billed), pytest.approx(row.amount_paid))
+            for row in FeeBalance.query if row.amount_billed or row.amount_paid}
+
+
+def assert_no_drift():
+    report = verify_fee_balances()
+    assert report['drifted'] == 0, report['sample']
+
+
+def pay(client, student, fee_structure, amount):
+    response = client.post('/api/payments', json={'student_id': student.student_profile.id,
+                                                  'fee_structure_id': fee_structure.id,
+                                                  'amount_paid': amount, 'payment_method': 'bank'})
+    assert response.status_code == 201
+    return response.get_json()['payment']['id']
+
+
+def test_payments_bill_each_fee_structure_once(client, campus, fees):
+    student = campus.students[0].student_profile
+    first, second = campus.semesters
+
+    pay(client, campus.students[0], fees[0], 300.0)
+    pay(client, campus.students[0], fees[0], 200.0)
+    pay(client, campus.students[0], fees[1], 400.0)
+    pay(client, campus.students[0], fees[2], 100.0)
+
+    assert balances() == {(student.id, first.id): (1400.0, 900.0), (student.id, second.id): (800.0, 100.0)}
+    assert_no_drift()
+    assert client.get(f'/api/payments/balance/{student.id}').get_json()['balance'] == 1200.0
+
+
+def test_deleting_the_last_payment_unbills_the_fee_structure(client, campus, fees):
+    student = campus.students[0].student_profile
+    first = campus.semesters[0]
+    payment_ids = [pay(client, campus.students[0], fees[0], amount) for amount in (300.0, 200.0)]
+
+    assert client.delete(f'/api/payments/{payment_ids[0]}').status_code == 200
+    assert balances() == {(student.id, first.id): (1000.0, 200.0)}
+    assert_no_drift()
+
+    assert client.delete(f'/api/payments/{payment_ids[1]}').status_code == 200
+    assert balances() == {}
+    assert_no_drift()
+
+
+def test_fee_structure_changes_rebill_paying_students(client, campus, fees):
+    s1, s2 = (s.student_profile for s in campus.students[:2])
+    first, second = campus.semesters
+    pay(client, campus.students[0], fees[0], 250.0)
+    pay(client, campus.students[1], fees[0], 1000.0)
+
+    assert client.put(f'/api/fee-structures/{fees[0].id}', json={'amount': 1200.0}).status_code == 200
+    assert balances() == {(s1.id, first.id): (1200.0, 250.0), (s2.id, first.id): (1200.0, 1000.0)}
+    assert_no_drift()
+
+    assert client.put(f'/api/fee-structures/{fees[0].id}', json={'semester_id': second.id}).status_code == 200
+    assert balances() == {(s1.id, second.id): (1200.0, 250.0), (s2.id, second.id): (1200.0, 1000.0)}
+    assert_no_drift()
+
+
+def test_statement_import_keeps_balances_in_step(client, campus, fees):
+    student = campus.students[0].student_profile
+    statement = ('reference,reg_no,amount,fee_structure_id\n'
+                 f'TX1,{student.reg_no},300,{fees[0].id}\n'
+                 f'TX2,{student.reg_no},150,{fees[0].id}\n'
+                 f'TX2,{student.reg_no},150,{fees[0].id}\n'
+                 f'TX3,UNKNOWN,99,{fees[0].id}\n')
+
+    for _ in range(2):  # re-importing the same statement skips every reference
+        response = client.post('/api/payments/import',
+                               data={'file': (io.BytesIO(statement.encode()), 'statement.csv')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 200
+
+    assert Payment.query.count() == 2
+    assert balances() == {(student.id, campus.semesters[0].id): (1000.0, 450.0)}
+    assert_no_drift()
+
+
+def test_rolled_back_payment_leaves_balances_untouched(client, campus, fees):
+    student = campus.students[0].student_profile
+    pay(client, campus.students[0], fees[0], 300.0)
+    before = balances()
+
+    record_payment_changes([(student.id, fees[1].id, 400.0, 1)])
+    db.session.add(Payment(student_id=student.id, fee_structure_id=fees[1].id, amount_paid=400.0,
+                           payment_method='bank'))
+    db.session.flush()
+    assert balances() != before
+    db.session.rollback()
+
+    assert balances() == before
+    assert_no_drift()
+
+
+def test_verify_detects_and_repairs_drift(client, campus, fees):
+    pay(client, campus.students[0], fees[0], 300.0)
+    db.session.execute(FeeBalance.__table__.update().values(amount_paid=0.0))
+    db.session.commit()
+
+    report = verify_fee_balances(repair=True)
+    db.session.commit()
+
+    assert report['drifted'] == 1 and report['repaired'] == 1
+    assert_no_drift()
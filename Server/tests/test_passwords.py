@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from flask import Flask
+
+from passwords import PasswordHasher, PasswordHashingBusy
+
+
+def make_hasher(**config):
+    app = Flask(__name__)
+    app.config.update({'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000', **config})
+    return PasswordHasher(app)
+
+
+def wait_until_idle(hasher, timeout=10):
+    deadline = time.monotonic() + timeout
+    while hasher.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return hasher.stats()
+
+
+def test_inline_hashing_releases_its_slot():
+    hasher = make_hasher(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_MAX_PENDING=1)
+
+    for _ in range(3):
+        assert hasher.verify(hasher.hash('secret'), 'secret')
+
+    stats = hasher.stats()
+    assert stats['pending'] == 0 and stats['completed'] == 6 and stats['rejected'] == 0
+
+
+def test_timed_out_jobs_keep_their_slot_until_they_finish():
+    hasher = make_hasher(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=2, PASSWORD_HASH_TIMEOUT=0.2)
+    try:
+        for _ in range(2):
+            with pytest.raises(PasswordHashingBusy):
+                hasher._run(time.sleep, 0.5)
+
+        # Both sleeps are still running or queued in the pool, so there is no room for a third
+        with pytest.raises(PasswordHashingBusy):
+            hasher.hash('secret')
+        stats = hasher.stats()
+        assert stats['timeouts'] == 2 and stats['rejected'] == 1
+        assert stats['pending'] == 2 and stats['completed'] == 0
+
+        stats = wait_until_idle(hasher)
+        assert stats['pending'] == 0 and stats['completed'] == 2
+        assert stats['avg_ms'] >= 500
+        assert hasher.verify(hasher.hash('secret'), 'secret')
+    finally:
+        hasher._executor.shutdown()
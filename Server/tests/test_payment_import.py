@@ -0,0 +1,48 @@
+import io
+
+import pytest
+
+from ledger import verify_fee_balances
+from models import FeeBalance, Payment
+
+
+def import_statement(client, statement):
+    response = client.post('/api/payments/import',
+                           data={'file': (io.BytesIO(statement.encode()), 'statement.csv')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.mark.parametrize('amount, reason', [
+    ('nan', 'Amount must be a finite number'),
+    ('NaN', 'Amount must be a finite number'),
+    ('inf', 'Amount must be a finite number'),
+    ('-Infinity', 'Amount must be a finite number'),
+    ('1e308', 'Amount exceeds 99999999.99'),
+    ('100000000', 'Amount exceeds 99999999.99'),
+    ('0', 'Amount must be positive'),
+    ('0.001', 'Amount must be positive'),
+    ('-50', 'Amount must be positive'),
+    ('fifty', 'Unparseable amount, date or fee_structure_id'),
+])
+def test_bad_amounts_are_rejected(client, campus, amount, reason):
+    student = campus.students[0].student_profile
+    report = import_statement(client, 'reference,reg_no,amount,fee_structure_id\n'
+                                      f'TX1,{student.reg_no},{amount},{campus.fee_structure.id}\n')
+
+    assert (report['inserted'], report['invalid']) == (0, 1)
+    assert report['issues'][0]['reason'] == reason
+    assert Payment.query.count() == 0
+    assert all(not row.amount_paid for row in FeeBalance.query)
+
+
+def test_amounts_are_rounded_to_cents(client, campus):
+    student = campus.students[0].student_profile
+    report = import_statement(client, 'reference,reg_no,amount,fee_structure_id\n'
+                                      f'TX1,{student.reg_no},"1,250.555",{campus.fee_structure.id}\n'
+                                      f'TX2,{student.reg_no},99999999.99,{campus.fee_structure.id}\n')
+
+    assert report['inserted'] == 2
+    assert sorted(payment.amount_paid for payment in Payment.query) == [1250.56, 99999999.99]
+    assert verify_fee_balances()['drifted'] == 0
@@ -0,0 +1,69 @@
+from prerequisites import get_prerequisite_graph
+from models import db, course_prerequisites
+
+
+def test_course_save_rejects_a_prerequisite_cycle(client, campus):
+    first, second, third = (c.id for c in campus.courses[:3])
+    assert client.put(f'/api/courses/{second}', json={'prerequisite_ids': [first]}).status_code == 200
+    assert client.put(f'/api/courses/{third}', json={'prerequisite_ids': [second]}).status_code == 200
+
+    response = client.put(f'/api/courses/{first}', json={'prerequisite_ids': [third]})
+
+    assert response.status_code == 409
+    assert response.get_json()['course_ids'] == [first, second, third]
+    assert get_prerequisite_graph().all_prerequisites(third) == {first, second}
+    assert get_prerequisite_graph().all_prerequisites(first) == set()
+
+
+def test_course_cannot_be_its_own_prerequisite(client, campus):
+    course_id = campus.courses[0].id
+
+    response = client.put(f'/api/courses/{course_id}', json={'prerequisite_ids': [course_id]})
+
+    assert response.status_code == 409
+
+
+def test_new_course_with_unknown_prerequisites_is_rejected(client, campus):
+    response = client.post('/api/courses', json={'code': 'CS201', 'title': 'Course 201', 'program': 'BSC-CS',
+                                                 'semester_id': campus.semesters[0].id, 'prerequisite_ids': [999]})
+
+    assert response.status_code == 400
+
+
+def test_graph_is_invalidated_on_commit_not_flush(app, campus):
+    first, second = campus.courses[:2]
+    before = get_prerequisite_graph()
+
+    second.prerequisites.append(first)
+    db.session.flush()
+    # Another request rebuilding now would still read the committed edges; keep the snapshot
+    assert get_prerequisite_graph() is before
+
+    db.session.commit()
+    assert get_prerequisite_graph().all_prerequisites(second.id) == {first.id}
+
+
+def test_rolled_back_prerequisite_write_keeps_the_snapshot(app, campus):
+    first, second = campus.courses[:2]
+    before = get_prerequisite_graph()
+
+    second.prerequisites.append(first)
+    db.session.flush()
+    db.session.rollback()
+
+    assert get_prerequisite_graph() is before
+    assert before.all_prerequisites(second.id) == set()
+
+
+def test_bulk_registration_reports_an_existing_cycle_as_conflict(client, campus):
+    # Written behind the ORM's back, as a legacy import might have
+    first, second = (c.id for c in campus.courses[:2])
+    db.session.execute(course_prerequisites.insert(), [{'course_id': first, 'prerequisite_id': second},
+                                                       {'course_id': second, 'prerequisite_id': first}])
+    db.session.commit()
+
+    response = client.post('/api/registration/bulk', json={'course_codes': ['CS101'],
+                                                           'semester_id': campus.semesters[0].id})
+
+    assert response.status_code == 409
+    assert response.get_json()['course_ids'] == [first, second]
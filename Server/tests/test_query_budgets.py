@@ -0,0 +1,82 @@
+"""Query budgets for the hot read endpoints.
+
+Each budget is independent of the number of rows returned, so a relationship
+that starts lazy-loading per row (an N+1) fails here before it reaches
+production.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from query_stats import QueryBudgetExceeded, count_queries, query_budget
+from transcripts import rebuild_gpa_summaries
+from models import db, Grade, UnitRegistration
+
+
+def register_all(campus, student):
+    for course in campus.courses:
+        db.session.add(UnitRegistration(student_id=student.student_profile.id, course_id=course.id,
+                                        semester_id=campus.semesters[0].id))
+    db.session.commit()
+
+
+def test_query_budget_fails_when_exceeded(client, campus):
+    register_all(campus, campus.students[0])
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(2):
+            for registration in UnitRegistration.query.all():
+                registration.course.code
+
+
+def test_transcript_is_one_query(client, campus):
+    student = campus.students[0]
+    for course, letter in zip(campus.courses, 'ABCD'):
+        db.session.add(Grade(student_id=student.id, course_id=course.id, semester_id=campus.semesters[0].id,
+                             grade=letter))
+    db.session.commit()
+    rebuild_gpa_summaries()
+    db.session.commit()
+
+    url = f'/api/grades/transcript/{student.id}'
+
+    with query_budget(1):
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.get_json()['total_courses'] == 4
+
+
+def test_registration_listing_does_not_load_courses_per_row(client, campus):
+    register_all(campus, campus.students[0])
+
+    with query_budget(2):
+        response = client.get('/api/registration')
+
+    assert response.status_code == 200
+    assert sorted(r['course_code'] for r in response.get_json()) == [c.code for c in campus.courses]
+
+
+def test_catalogue_is_one_query_then_cached(client, campus):
+    url = f'/api/courses?semester_id={campus.semesters[0].id}'
+
+    with query_budget(1):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 4
+
+    with query_budget(0):
+        assert client.get(url).status_code == 200
+
+
+def test_failed_statements_leave_nothing_on_the_connection(app):
+    connection = db.session.connection()
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            connection.execute(text('SELECT * FROM no_such_table'))
+
+    with count_queries() as collector:
+        connection.execute(text('SELECT 1'))
+
+    assert collector.count == 1
+    assert 'query_stats_started' not in connection.info
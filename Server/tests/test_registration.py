@@ -0,0 +1,30 @@
+from models import UnitRegistration
+
+
+def test_racing_duplicate_registration_is_a_conflict(client, campus, racing_insert):
+    student_id = campus.students[0].student_profile.id
+    course_id, semester_id = campus.courses[0].id, campus.semesters[0].id
+    with racing_insert(UnitRegistration, student_id=student_id, course_id=course_id, semester_id=semester_id):
+        response = client.post('/api/registration', json={'course_code': 'CS101', 'semester_id': semester_id})
+
+    assert response.status_code == 409
+    assert UnitRegistration.query.filter_by(student_id=student_id, course_id=course_id).count() == 1
+
+
+def test_racing_duplicate_bulk_registration_is_a_conflict(client, campus, racing_insert):
+    student_id = campus.students[0].student_profile.id
+    course_id, semester_id = campus.courses[1].id, campus.semesters[0].id
+    with racing_insert(UnitRegistration, student_id=student_id, course_id=course_id, semester_id=semester_id):
+        response = client.post('/api/registration/bulk', json={'course_codes': ['CS101', 'CS102'],
+                                                           'semester_id': semester_id})
+
+    assert response.status_code == 409
+    assert UnitRegistration.query.filter_by(student_id=student_id).count() == 1
+
+
+def test_bulk_registration_rejects_non_string_codes(client, campus):
+    response = client.post('/api/registration/bulk', json={'course_codes': [['CS101'], {'code': 'CS102'}],
+                                                           'semester_id': campus.semesters[0].id})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'course_codes must be a list of strings'
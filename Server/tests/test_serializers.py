@@ -0,0 +1,85 @@
+import pytest
+
+from models import db, User, StudentProfile, LecturerProfile, Course, GpaSummary, Hostel, Room, FeeBalance
+from serializers import serialize_rows
+
+
+# The to_dict bodies the compiled serializers replaced, as they were
+
+def old_to_dict(obj, rules=()):
+    rules = rules or obj.serialize_rules
+    return {field: getattr(obj, field) for field in rules}
+
+
+def old_course_to_dict(course, rules=()):
+    rules = rules or course.serialize_rules
+    course_dict = {field: getattr(course, field) for field in rules}
+    if 'lecturer' in rules and course.lecturer:
+        course_dict['lecturer'] = course.lecturer.to_dict()
+    return course_dict
+
+
+def old_user_to_dict(user, rules=()):
+    exclude_fields = {rule[1:] for rule in rules if rule.startswith('-')}
+    include_fields = {rule for rule in rules if not rule.startswith('-')}
+    user_dict = {}
+    for field in user.__table__.columns.keys():
+        if field not in exclude_fields:
+            user_dict[field] = getattr(user, field)
+    if 'student_profile' in include_fields and hasattr(user, 'student_profile'):
+        user_dict['student_profile'] = user.student_profile.to_dict() if user.student_profile else None
+    if 'lecturer_profile' in include_fields and hasattr(user, 'lecturer_profile'):
+        user_dict['lecturer_profile'] = user.lecturer_profile.to_dict() if user.lecturer_profile else None
+    return user_dict
+
+
+@pytest.fixture
+def summaries(campus):
+    student, semester = campus.students[0], campus.semesters[0]
+    db.session.add_all([
+        GpaSummary(student_id=student.id, semester_id=semester.id, course_count=3, total_points=10.0),
+        GpaSummary(student_id=campus.students[1].id, semester_id=semester.id, course_count=0, total_points=0.0),
+        FeeBalance(student_id=student.student_profile.id, semester_id=semester.id, amount_billed=1000.0,
+                   amount_paid=333.33),
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('model', [StudentProfile, LecturerProfile, Course, GpaSummary, Hostel, Room, FeeBalance])
+def test_rule_driven_models_match_the_old_to_dict(summaries, model):
+    objs = model.query.all()
+    assert objs
+
+    for obj in objs:
+        assert obj.to_dict() == old_to_dict(obj)
+        rules = model.serialize_rules[::-1][:2]
+        assert obj.to_dict(rules=rules) == old_to_dict(obj, rules)
+
+
+@pytest.mark.parametrize('rules', [('id', 'code', 'lecturer'), ('code', 'lecturer_id')])
+def test_course_with_and_without_lecturer_matches_the_old_to_dict(campus, rules):
+    campus.courses[1].lecturer_id = None
+    db.session.commit()
+
+    for course in Course.query.all():
+        assert course.to_dict(rules=rules) == old_course_to_dict(course, rules)
+
+
+@pytest.mark.parametrize('rules', [(), ('-password_hash',), ('-password_hash', 'student_profile', 'lecturer_profile'),
+                                   ('-password_hash', '-email', 'student_profile')])
+def test_user_matches_the_old_to_dict(campus, rules):
+    for user in User.query.all():
+        assert user.to_dict(rules=rules) == old_user_to_dict(user, rules)
+
+
+def test_expired_instances_are_loaded_by_attribute(campus):
+    room = campus.rooms[0]
+    db.session.expire(room)
+
+    assert room.to_dict() == old_to_dict(room)
+
+
+def test_projected_rows_match_the_instances(campus):
+    rows = db.session.execute(db.select(*(getattr(Room, field) for field in Room.serialize_rules))).all()
+
+    assert serialize_rows(rows, Room, Room.serialize_rules) == [old_to_dict(room) for room in Room.query.all()]
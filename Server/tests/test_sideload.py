@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from models import db, Payment
+from query_stats import query_budget
+
+FLAT_KEYS = {'id', 'course_id', 'hostel_id', 'semester_id', 'amount'}
+
+
+def test_default_shape_stays_nested(client, campus):
+    body = client.get('/api/fee-structures/').get_json()
+
+    assert isinstance(body, list)
+    assert body[0]['course']['code'] == campus.courses[0].code
+    assert body[0]['hostel']['id'] == campus.hostel.id
+
+
+def test_flat_shape_side_loads_every_relation_once(client, campus):
+    fs = campus.fee_structure
+    with query_budget(4):  # fee structures + one IN query per relation
+        body = client.get('/api/fee-structures/?shape=flat').get_json()
+
+    assert set(body) == {'fee_structures', 'included'}
+    assert body['fee_structures'] == [{'id': fs.id, 'course_id': fs.course_id, 'hostel_id': fs.hostel_id,
+                                       'semester_id': fs.semester_id, 'amount': 1000.0}]
+    included = body['included']
+    assert set(included) == {'courses', 'hostels', 'semesters'}
+    assert included['courses'][str(fs.course_id)]['code'] == campus.courses[0].code
+    assert list(included['hostels']) == [str(fs.hostel_id)]
+    assert list(included['semesters']) == [str(fs.semester_id)]
+
+
+def test_include_picks_the_relations(client, campus):
+    body = client.get('/api/fee-structures/?include=hostel').get_json()
+
+    assert set(body['fee_structures'][0]) == FLAT_KEYS
+    assert set(body['included']) == {'hostels'}
+
+
+def test_unknown_include_is_rejected(client, campus):
+    response = client.get('/api/fee-structures/?include=course,lecturer')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unknown include: lecturer. Allowed: course, hostel, semester'
+
+
+def test_single_fee_structure_flat_shape(client, campus):
+    fs = campus.fee_structure
+    body = client.get(f'/api/fee-structures/{fs.id}?include=course,semester').get_json()
+
+    assert body['fee_structure']['id'] == fs.id
+    assert set(body['included']) == {'courses', 'semesters'}
+    assert client.get('/api/fee-structures/999?shape=flat').status_code == 404
+
+
+@pytest.mark.parametrize('include, keys', [
+    ('fee_structure', {'fee_structures'}),
+    ('fee_structure,course', {'fee_structures', 'courses'}),
+    ('course', {'courses'}),  # reached through the payments' fee structures
+])
+def test_payments_side_load_through_their_fee_structures(client, campus, include, keys):
+    student = campus.students[0].student_profile
+    db.session.add(Payment(student_id=student.id, fee_structure_id=campus.fee_structure.id, amount_paid=100.0,
+                           payment_date=datetime(2025, 2, 1), payment_method='bank'))
+    db.session.commit()
+
+    body = client.get(f'/api/payments?include={include}').get_json()
+
+    assert body['payments'][0]['fee_structure_id'] == campus.fee_structure.id
+    assert set(body['included']) == keys
+    if 'courses' in keys:
+        assert list(body['included']['courses']) == [str(campus.fee_structure.course_id)]
@@ -0,0 +1,102 @@
+import pytest
+
+from transcripts import record_grade_changes, rebuild_gpa_summaries
+from models import db, Grade, GpaSummary
+
+
+def summaries():
+    return {(row.student_id, row.semester_id): (row.course_count, pytest.approx(row.total_points))
+            for row in GpaSummary.query if row.course_count}
+
+
+def assert_matches_rebuild():
+    """The incrementally maintained summaries equal a full recompute from the grade table"""
+    incremental = summaries()
+    rebuild_gpa_summaries()
+    db.session.commit()
+    assert summaries() == incremental
+    return incremental
+
+
+def post_grade(client, student, course, semester, letter):
+    return client.post('/api/grades/', json={'student_id': student.id, 'course_id': course.id,
+                                             'semester_id': semester.id, 'grade': letter})
+
+
+def test_inserts_through_both_grade_routes(client, campus):
+    s1, s2, _ = campus.students
+    first, second = campus.semesters
+    c1, c2, c3, _ = campus.courses
+
+    assert post_grade(client, s1, c1, first, 'A').status_code == 201
+    assert post_grade(client, s1, c2, second, 'C').status_code == 201
+    response = client.post('/api/grades/batch', json=[
+        {'student_id': s1.id, 'course_id': c3.id, 'semester_id': first.id, 'grade': 'B+'},
+        {'student_id': s2.id, 'course_id': c1.id, 'semester_id': first.id, 'grade': 'E'},
+        {'student_id': s2.id, 'course_id': c2.id, 'semester_id': first.id, 'grade': 'bogus'},
+    ])
+    assert response.status_code == 201
+
+    assert assert_matches_rebuild() == {
+        (s1.id, first.id): (2, 7.5),
+        (s1.id, second.id): (1, 2.0),
+        (s2.id, first.id): (1, 0.0),
+    }
+    transcript = client.get(f'/api/grades/transcript/{s1.id}').get_json()
+    assert [s['gpa'] for s in transcript['semesters']] == [3.75, 2.0]
+    assert transcript['cumulative_gpa'] == 3.17
+
+
+def test_deletes_remove_the_grade_from_the_summary(client, campus):
+    student, semester = campus.students[0], campus.semesters[0]
+    for course, letter in zip(campus.courses, 'ABCD'):
+        assert post_grade(client, student, course, semester, letter).status_code == 201
+    grade_ids = [g.id for g in Grade.query.order_by(Grade.id)]
+
+    assert client.delete(f'/api/grades/{grade_ids[0]}').status_code == 200
+    assert assert_matches_rebuild() == {(student.id, semester.id): (3, 6.0)}
+
+    for grade_id in grade_ids[1:]:
+        assert client.delete(f'/api/grades/{grade_id}').status_code == 200
+    assert assert_matches_rebuild() == {}
+    assert client.get(f'/api/grades/transcript/{student.id}').get_json()['cumulative_gpa'] is None
+
+
+def test_grade_change_is_a_delete_plus_an_insert(client, campus):
+    student, course, semester = campus.students[0], campus.courses[0], campus.semesters[0]
+    assert post_grade(client, student, course, semester, 'C').status_code == 201
+
+    grade = Grade.query.one()
+    record_grade_changes([(grade.student_id, grade.semester_id, grade.grade, -1),
+                          (grade.student_id, grade.semester_id, 'A', 1)])
+    grade.grade = 'A'
+    db.session.commit()
+
+    assert assert_matches_rebuild() == {(student.id, semester.id): (1, 4.0)}
+
+
+def test_rolled_back_changes_leave_the_summary_untouched(client, campus):
+    student, semester = campus.students[0], campus.semesters[0]
+    assert post_grade(client, student, campus.courses[0], semester, 'B').status_code == 201
+    before = summaries()
+
+    grade = Grade(student_id=student.id, course_id=campus.courses[1].id, semester_id=semester.id, grade='A')
+    db.session.add(grade)
+    record_grade_changes([(student.id, semester.id, 'A', 1)])
+    db.session.flush()
+    assert summaries() != before
+    db.session.rollback()
+
+    assert summaries() == before
+    assert assert_matches_rebuild() == before
+
+
+def test_failed_request_does_not_touch_the_summary(client, campus):
+    student, course, semester = campus.students[0], campus.courses[0], campus.semesters[0]
+    assert post_grade(client, student, course, semester, 'B').status_code == 201
+
+    # Duplicate and off-scale submissions are rejected before anything is recorded
+    assert post_grade(client, student, course, semester, 'A').status_code == 409
+    assert post_grade(client, student, campus.courses[1], semester, 'A-').status_code == 400
+
+    assert assert_matches_rebuild() == {(student.id, semester.id): (1, 3.0)}
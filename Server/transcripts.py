@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from sqlalchemy import and_, bindparam, case, func, insert, update
+
+from models import db, Grade, GpaSummary, Semester
+from bulk import ensure_rows
+
+# Points for the grade scale accepted by is_valid_grade. Letters outside the
+# scale (legacy seeds use A-, F, ...) are left out of GPA altogether.
+GRADE_POINTS = {
+    'A': 4.0,
+    'B+': 3.5,
+    'B': 3.0,
+    'C+': 2.5,
+    'C': 2.0,
+    'D+': 1.5,
+    'D': 1.0,
+    'E': 0.0,
+}
+
+grade_points = case(
+    *((Grade.grade == letter, points) for letter, points in GRADE_POINTS.items()),
+    else_=None
+)
+
+
+def record_grade_changes(changes):
+    """Fold grade inserts (+1) / deletes (-1) into gpa_summaries, in the caller's transaction.
+
+    `changes` is an iterable of (student_id, semester_id, letter, sign). Deltas
+    are aggregated per (student, semester) first, then applied with one
+    executemany UPDATE, so concurrent writers simply add to the same row.
+    """
+    deltas = defaultdict(lambda: [0, 0.0])
+    for student_id, semester_id, letter, sign in changes:
+        points = GRADE_POINTS.get((letter or '').upper())
+        if points is None:
+            continue
+        delta = deltas[(student_id, semester_id)]
+        delta[0] += sign
+        delta[1] += sign * points
+    if not deltas:
+        return
+
+    ensure_rows(GpaSummary, ('student_id', 'semester_id'), deltas.keys(),
+                {'course_count': 0, 'total_points': 0.0})
+
+    db.session.execute(
+        update(GpaSummary.__table__)
+        .where(and_(
+            GpaSummary.__table__.c.student_id == bindparam('b_student_id'),
+            GpaSummary.__table__.c.semester_id == bindparam('b_semester_id')
+        ))
+        .values(
+            course_count=GpaSummary.__table__.c.course_count + bindparam('b_count'),
+            total_points=GpaSummary.__table__.c.total_points + bindparam('b_points')
+        ),
+        [
+            {'b_student_id': s, 'b_semester_id': m, 'b_count': count, 'b_points': points}
+            for (s, m), (count, points) in deltas.items()
+        ]
+    )
+
+
+def rebuild_gpa_summaries():
+    """Recompute every summary from the grade table with one grouped query"""
+    db.session.execute(GpaSummary.__table__.delete())
+    rows = db.session.query(
+        Grade.student_id, Grade.semester_id,
+        func.count(grade_points), func.coalesce(func.sum(grade_points), 0.0)
+    ).group_by(Grade.student_id, Grade.semester_id).all()
+    if rows:
+        db.session.execute(insert(GpaSummary), [
+            {'student_id': s, 'semester_id': m, 'course_count': count, 'total_points': points}
+            for s, m, count, points in rows
+        ])
+    return len(rows)
+
+
+def get_transcript(student_id):
+    """Per-semester and cumulative GPA from the summary table in one indexed lookup"""
+    rows = db.session.query(
+        GpaSummary.semester_id, Semester.name, Semester.start_date,
+        GpaSummary.course_count, GpaSummary.total_points
+    ).join(Semester, GpaSummary.semester_id == Semester.id) \
+     .filter(GpaSummary.student_id == student_id, GpaSummary.course_count > 0) \
+     .order_by(Semester.start_date).all()
+
+    total_courses = sum(row.course_count for row in rows)
+    total_points = sum(row.total_points for row in rows)
+    return {
+        'student_id': student_id,
+        'semesters': [{
+            'semester_id': row.semester_id,
+            'semester_name': row.name,
+            'courses': row.course_count,
+            'gpa': round(row.total_points / row.course_count, 2)
+        } for row in rows],
+        'total_courses': total_courses,
+        'cumulative_gpa': round(total_points / total_courses, 2) if total_courses else None
+    }